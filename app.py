@@ -6,6 +6,9 @@ from __future__ import annotations
 – Construit l’URI PostgreSQL en échappant correctement le mot de passe.
 – Rend Stripe et Mongo optionnels en dev.
 – Ajoute la config Mail (Mailpit en dev).
+– Démarrage à froid court : Mongo, Mail, Stripe et Flask-Migrate ne sont
+  importés que s'ils sont configurés / utilisés (profil :
+  ``python -X importtime -c "import app"``, banc : ``scripts/bench_startup.py``).
 """
 
 from pathlib import Path
@@ -13,12 +16,10 @@ import os
 import sys
 from urllib.parse import quote_plus
 
+import click
 from dotenv import load_dotenv
 from flask import Flask, render_template, request, session
 from flask_login import LoginManager
-from flask_migrate import Migrate
-from flask_mail import Mail
-import stripe
 
 # ----------------------------------------------------------------------------
 #  Environnement & variables
@@ -31,9 +32,6 @@ if str(BASE_DIR) not in sys.path:
 
 load_dotenv(BASE_DIR / ".env", override=True)  # charge .env (UTF-8 conseillé)
 
-print(f"⇢ Python interpreter : {sys.executable}")
-print(f"⇢ .env loaded from  : {BASE_DIR / '.env'}")
-
 # -- Construction sûre de l'URI Postgres
 DB_USER: str = os.getenv("DB_USER", "postgres")
 DB_PASSWORD: str = quote_plus(os.getenv("DB_PASSWORD", ""))
@@ -57,8 +55,6 @@ DATABASE_URI = (
 from models import db  # noqa: E402
 from models.book_model import Book  # noqa: E402
 from models.user_model import User  # noqa: E402
-from models.category_model import Category  # noqa: E402
-from models.cart_items_model import CartItem  # noqa: E402
 
 from controllers.register_controller import register_bp  # noqa: E402
 from controllers.auth_controller import login_bp  # noqa: E402
@@ -66,15 +62,58 @@ from controllers.admin_controller import admin_bp  # noqa: E402
 from controllers.cart_controller import cart_bp  # noqa: E402
 from controllers.payement_controller import payement_bp  # noqa: E402
 from controllers.account_controller import account_bp  # noqa: E402
+from controllers.api_controller import api_bp  # noqa: E402
+
+from extensions import init_cache, init_stripe  # noqa: E402
+from extensions.database import engine_options, init_db_metrics  # noqa: E402
+from extensions.assets import init_assets, assets_cli  # noqa: E402
+from services.cart_snapshot import get_cart_snapshot  # noqa: E402
+from services.catalogue import browse_books, list_categories, parse_price, DEFAULT_SORT, PRICE_SLIDER  # noqa: E402
+from services.page_cache import cached_page, init_page_cache  # noqa: E402
+from services.conditional import conditional, book_validators  # noqa: E402
+from services.sales import sales_cli  # noqa: E402
+from services.webhooks import init_webhooks, start_webhook_worker, webhooks_cli  # noqa: E402
+from services.covers import init_covers, covers_cli, DEFAULT_WIDTHS as DEFAULT_COVER_WIDTHS  # noqa: E402
+from services.payments import init_payments  # noqa: E402
+from services.rate_limit import init_rate_limits  # noqa: E402
+from services.passwords import init_passwords, DEFAULT_METHOD as DEFAULT_PASSWORD_METHOD  # noqa: E402
+
+
+# ----------------------------------------------------------------------------
+#  Extensions optionnelles
+# ----------------------------------------------------------------------------
+def init_mail(app: Flask) -> None:
+    from flask_mail import Mail
+
+    app.config.update(
+        MAIL_SERVER=os.getenv("MAIL_SERVER"),
+        MAIL_PORT=int(os.getenv("MAIL_PORT", "25")),
+        MAIL_USE_TLS=os.getenv("MAIL_USE_TLS", "false").lower() == "true",
+        MAIL_USE_SSL=os.getenv("MAIL_USE_SSL", "false").lower() == "true",
+        MAIL_USERNAME=os.getenv("MAIL_USERNAME"),
+        MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
+        MAIL_DEFAULT_SENDER=os.getenv("MAIL_DEFAULT_SENDER", "no-reply@example.com"),
+    )
+    Mail(app)
+
 
-from extensions import init_mongo  # noqa: E402
+def reset_after_fork(app: Flask) -> None:
+    """Hook post-fork (gunicorn.conf.py, ``preload_app``).
+
+    Les connexions ouvertes par le maître ne doivent jamais être partagées :
+    le pool SQLAlchemy est abandonné sans fermer les sockets du parent et le
+    client Mongo est recréé au premier accès. Stripe et le hacheur se
+    reconstruisent d'eux-mêmes (contrôle du PID) ; le worker de webhooks est
+    démarré tout de suite dans le processus fils.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    mongo_logger = app.extensions.get("mongo_logger")
+    if mongo_logger is not None:
+        mongo_logger.reset_after_fork()
+    start_webhook_worker(app)
 
-# Stripe : optionnel (ne pas faire planter si clé absente en dev)
-stripe_key = os.getenv("STRIPE_SECRET_KEY")
-if stripe_key:
-    stripe.api_key = stripe_key
-else:
-    print("⚠️  STRIPE_SECRET_KEY manquant → Stripe désactivé dans cet environnement.")
 
 # ----------------------------------------------------------------------------
 #  Flask factory
@@ -88,38 +127,95 @@ def create_app() -> Flask:
         SQLALCHEMY_DATABASE_URI=DATABASE_URI,
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
         SECRET_KEY=os.getenv("SECRET_KEY"),
+        # Pool SQLAlchemy (Postgres) : cf. extensions.database, scripts/stress_db.py
+        DB_POOL_SIZE=int(os.getenv("DB_POOL_SIZE", "5")),
+        DB_MAX_OVERFLOW=int(os.getenv("DB_MAX_OVERFLOW", "5")),
+        DB_POOL_TIMEOUT=int(os.getenv("DB_POOL_TIMEOUT", "5")),  # entier : arrondi par engine_from_config
+        DB_POOL_RECYCLE=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        DB_POOL_PRE_PING=os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        DB_CONNECT_TIMEOUT=int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+        DB_STATEMENT_TIMEOUT_MS=int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0")),  # 0 = aucun
+        DB_PGBOUNCER=os.getenv("DB_PGBOUNCER", "false").lower() == "true",
+        DB_POOL_ALERT_RATIO=float(os.getenv("DB_POOL_ALERT_RATIO", "0.9")),
+        DB_SLOW_REQUEST_MS=float(os.getenv("DB_SLOW_REQUEST_MS", "500")),
+        DB_MAX_QUERIES_PER_REQUEST=int(os.getenv("DB_MAX_QUERIES_PER_REQUEST", "50")),
+        DB_SERVER_TIMING=os.getenv("DB_SERVER_TIMING", "false").lower() == "true",
+        # Cache partagé : memory:// (par processus) ou redis://… (multi-workers)
+        CACHE_URL=os.getenv("CACHE_URL", "memory://"),
+        CART_CACHE_TTL=int(os.getenv("CART_CACHE_TTL", "300")),
+        CATALOGUE_CACHE_TTL=int(os.getenv("CATALOGUE_CACHE_TTL", "300")),
+        # Pages publiques (accueil, /books, fiche) : magasin (défaut CACHE_URL), durée (0 = off)
+        PAGE_CACHE_URL=os.getenv("PAGE_CACHE_URL"),
+        PAGE_CACHE_TTL=int(os.getenv("PAGE_CACHE_TTL", "300")),
+        PAGE_CACHE_MAXSIZE=int(os.getenv("PAGE_CACHE_MAXSIZE", "512")),
+        SEARCH_MAX_RESULTS=int(os.getenv("SEARCH_MAX_RESULTS", "1000")),
+        # Mots de passe : méthode werkzeug + pool de vérification (0 = inline)
+        PASSWORD_HASH_METHOD=os.getenv("PASSWORD_HASH_METHOD", DEFAULT_PASSWORD_METHOD),
+        PASSWORD_VERIFY_WORKERS=int(os.getenv("PASSWORD_VERIFY_WORKERS", "2")),
+        PASSWORD_VERIFY_QUEUE=int(os.getenv("PASSWORD_VERIFY_QUEUE", "16")),
+        # Limitation des connexions (échecs par IP / par email sur LOGIN_WINDOW s)
+        RATE_LIMIT_URL=os.getenv("RATE_LIMIT_URL"),  # défaut : CACHE_URL
+        LOGIN_IP_LIMIT=int(os.getenv("LOGIN_IP_LIMIT", "20")),
+        LOGIN_EMAIL_LIMIT=int(os.getenv("LOGIN_EMAIL_LIMIT", "5")),
+        LOGIN_WINDOW=int(os.getenv("LOGIN_WINDOW", "300")),
+        # Stripe : une passerelle unique (extensions.stripe_gateway), client créé au 1er appel
+        STRIPE_SECRET_KEY=os.getenv("STRIPE_SECRET_KEY"),
+        STRIPE_CONNECT_TIMEOUT=float(os.getenv("STRIPE_CONNECT_TIMEOUT", "3")),
+        STRIPE_READ_TIMEOUT=float(os.getenv("STRIPE_READ_TIMEOUT", "10")),
+        STRIPE_MAX_RETRIES=int(os.getenv("STRIPE_MAX_RETRIES", "2")),
+        STRIPE_POOL_SIZE=int(os.getenv("STRIPE_POOL_SIZE", "10")),
+        # Webhooks Stripe : file processed_events + worker local (thread | off)
+        STRIPE_WEBHOOK_SECRET=os.getenv("STRIPE_WEBHOOK_SECRET"),
+        STRIPE_WEBHOOK_WORKER=os.getenv("STRIPE_WEBHOOK_WORKER", "thread"),
+        STRIPE_WEBHOOK_BATCH_SIZE=int(os.getenv("STRIPE_WEBHOOK_BATCH_SIZE", "100")),
+        STRIPE_WEBHOOK_POLL_INTERVAL=float(os.getenv("STRIPE_WEBHOOK_POLL_INTERVAL", "30")),
+        # Couvertures : largeurs générées (WebP + JPEG) et worker (thread | inline | off)
+        COVER_WIDTHS=[int(w) for w in os.getenv("COVER_WIDTHS", ",".join(map(str, DEFAULT_COVER_WIDTHS))).split(",")],
+        COVER_WORKER=os.getenv("COVER_WORKER", "thread"),
+        # Fichiers statiques à empreinte (flask assets build) servis en immuable
+        ASSETS_FINGERPRINT=os.getenv("ASSETS_FINGERPRINT", "true").lower() == "true",
+        # Durée de vie d'une session Checkout (Stripe : 30 min à 24 h)
+        STRIPE_CHECKOUT_TTL=int(os.getenv("STRIPE_CHECKOUT_TTL", "3600")),
     )
 
     if not app.config["SECRET_KEY"]:
         raise RuntimeError("SECRET_KEY is missing from environment")
 
-    print("⇢ SQLAlchemy URI :", app.config["SQLALCHEMY_DATABASE_URI"])
+    app.logger.debug("Python %s, .env : %s", sys.executable, BASE_DIR / ".env")
 
     # ---- Extensions
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
     db.init_app(app)
-    Migrate(app, db)
-
-    # Mongo optionnel (ne pas casser si non configuré)
+    init_db_metrics(app, db)
+    # Flask-Migrate (alembic, ~0,5 s d'import) ne sert qu'aux commandes ``flask db …``
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
+    init_cache(app)
+    init_page_cache(app)
+    init_stripe(app)
+    init_passwords(app)
+    init_rate_limits(app)
+    init_webhooks(app)
+    init_covers(app)
+    init_assets(app)
+    init_payments(app)
+
+    # Mongo optionnel (ne pas casser si non configuré) ; pymongo importé seulement ici
     try:
         if os.getenv("MONGODB_URI"):
+            from extensions.mongo import init_mongo
+
             init_mongo(app)
         else:
             app.logger.info("Mongo désactivé (MONGODB_URI manquant).")
     except Exception as e:
         app.logger.warning(f"Mongo désactivé: {e}")
 
-    # Mail (Mailpit en dev, SMTP en prod)
-    mail = Mail()
-    app.config.update(
-        MAIL_SERVER=os.getenv("MAIL_SERVER", "localhost"),
-        MAIL_PORT=int(os.getenv("MAIL_PORT", "25")),
-        MAIL_USE_TLS=os.getenv("MAIL_USE_TLS", "false").lower() == "true",
-        MAIL_USE_SSL=os.getenv("MAIL_USE_SSL", "false").lower() == "true",
-        MAIL_USERNAME=os.getenv("MAIL_USERNAME"),
-        MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
-        MAIL_DEFAULT_SENDER=os.getenv("MAIL_DEFAULT_SENDER", "no-reply@example.com"),
-    )
-    mail.init_app(app)
+    # Mail (Mailpit en dev, SMTP en prod) : seulement si MAIL_SERVER est défini
+    if os.getenv("MAIL_SERVER"):
+        init_mail(app)
 
     # ---- Authentication
     login_mgr = LoginManager(app)
@@ -137,6 +233,7 @@ def create_app() -> Flask:
     app.register_blueprint(cart_bp, url_prefix="/cart")
     app.register_blueprint(payement_bp, url_prefix="/payement")
     app.register_blueprint(account_bp, url_prefix="/account")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
 
     # (Optionnel) Webhook Stripe si présent
     try:
@@ -145,44 +242,61 @@ def create_app() -> Flask:
     except Exception as e:
         app.logger.info(f"Stripe webhook non chargé: {e}")
 
+    # ---- Commandes CLI (flask sales backfill, flask webhooks process, flask covers convert, flask assets build, …)
+    app.cli.add_command(sales_cli)
+    app.cli.add_command(webhooks_cli)
+    app.cli.add_command(covers_cli)
+    app.cli.add_command(assets_cli)
+
     # ---- Template context processors
     @app.context_processor
     def inject_cart_data():
-        if "user_id" in session:
-            cart_items = CartItem.query.filter_by(user_id=session["user_id"]).all()
-            total_price = sum(item.book.book_price for item in cart_items)
-            return dict(
-                cart_items=cart_items,
-                total_price=total_price,
-                cart_count=len(cart_items),
-            )
-        return dict(cart_items=[], total_price=0, cart_count=0)
+        # Snapshot mémoïsé sur g + cache par utilisateur (cf. services.cart_snapshot)
+        return get_cart_snapshot(session.get("user_id")).as_context()
 
     # ---- Routes
     @app.route("/")
+    @cached_page
     def home():
         return render_template("home.html")
 
     @app.route("/books")
+    @conditional()
+    @cached_page
     def gallery():
         selected_category_id = request.args.get("category", type=int)
-        page = request.args.get("page", 1, type=int)
-        per_page = 9
-
-        query = Book.query
-        if selected_category_id:
-            query = query.filter_by(category_id=selected_category_id)
-
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        sort = request.args.get("sort", DEFAULT_SORT)
+        search_query = request.args.get("q", "").strip()
+        try:
+            max_price = parse_price(request.args.get("max_price"), *PRICE_SLIDER)
+        except ValueError:
+            max_price = None
+        if max_price == PRICE_SLIDER[1]:
+            max_price = None
+
+        # Pagination par clé : ?after=<curseur> / ?before=<curseur>
+        pagination = browse_books(
+            category_id=selected_category_id,
+            sort=sort,
+            after=request.args.get("after"),
+            before=request.args.get("before"),
+            search=search_query or None,
+            max_price=max_price,
+        )
         return render_template(
             "gallery.html",
             books=pagination.items,
             pagination=pagination,
-            categories=Category.query.all(),
+            categories=list_categories(),
             selected_category_id=selected_category_id,
+            selected_sort=sort,
+            search_query=search_query,
+            max_price=max_price,
         )
 
     @app.route("/books/<int:book_id>")
+    @conditional(book_validators)
+    @cached_page
     def book_detail(book_id: int):
         book = Book.query.get_or_404(book_id)
         return render_template("book_detail.html", book=book)
@@ -1,11 +1,7 @@
 import os
-from dotenv import load_dotenv
 
-# Charger les variables depuis le fichier .env
-load_dotenv()
+# Le .env est chargé une seule fois, par app.py
 
-STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY', 'ta_clé_secrète')
-STRIPE_PUBLIC_KEY = os.getenv('STRIPE_PUBLIC_KEY', 'ta_clé_publique')
 MAIL_SERVER = 'smtp.gmail.com'
 MAIL_PORT = 587
 MAIL_USE_TLS = True
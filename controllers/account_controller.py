@@ -1,10 +1,9 @@
-from flask import Blueprint, render_template, session, redirect, url_for, flash
+from flask import Blueprint, render_template, request, session, redirect, url_for, flash
 from controllers.access_management import admin_required, user_required, guest_required
 
 from models import db
 from models.user_model import User
-from models.order_model import Order
-from models.order_details_model import OrderDetail
+from services.orders import order_history, get_user_order
 
 # Déclaration du Blueprint
 account_bp = Blueprint('account_bp', __name__)
@@ -18,10 +17,14 @@ def user_dashboard():
         flash("Veuillez vous connecter pour accéder à votre espace personnel.", "warning")
         return redirect(url_for('login_bp.login'))
 
-    user = User.query.get(user_id)
-    user_orders = Order.query.filter_by(user_id=user_id, payment_status="paid").order_by(Order.order_date.desc()).all()
+    user = db.session.get(User, user_id)
+    page = order_history(
+        user_id,
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+    )
 
-    return render_template('account.html', user=user, orders=user_orders)
+    return render_template('account.html', user=user, orders=page.items, page=page)
 
 
 @account_bp.route('/account/order/<int:order_id>')
@@ -33,8 +36,8 @@ def order_details(order_id):
         flash("Veuillez vous connecter pour voir vos commandes.", "warning")
         return redirect(url_for('login_bp.login'))
 
-    order = Order.query.get(order_id)
-    if not order or order.user_id != user_id:
+    order = get_user_order(user_id, order_id)
+    if not order:
         flash("Commande introuvable ou accès interdit.", "danger")
         return redirect(url_for('account_bp.user_dashboard'))
 
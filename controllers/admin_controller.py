@@ -1,12 +1,21 @@
-import os
-from flask import Blueprint, request, render_template, redirect, url_for, current_app
+import json
+from flask import Blueprint, request, render_template, redirect, url_for, current_app, jsonify, Response, stream_with_context, abort, make_response
 from controllers.access_management import admin_required, user_required, guest_required
 
-from werkzeug.utils import secure_filename
 from models.book_model import Book
 from models.author_model import Author
 from models.category_model import Category
 from models import db
+from services.catalogue import invalidate_catalogue
+from services.search import index_book, refresh_index, unindex_book, reindex_author
+from services.sales import top_sellers, revenue_by_category
+from services.log_analytics import get_log_analytics
+from extensions.database import pool_stats
+from services.covers import save_upload, enqueue_cover
+from services.admin_listing import (
+    admin_books, admin_authors, admin_categories, lookup_authors, lookup_categories,
+    index_author, index_category,
+)
 
 admin_bp = Blueprint('admin_bp', __name__)
 
@@ -14,7 +23,63 @@ admin_bp = Blueprint('admin_bp', __name__)
 @admin_bp.route('/admin_dashboard', methods=['GET'])
 @admin_required
 def admin_dashboard():
-    return render_template('admin_dashboard.html')
+    # Lectures O(1) par livre / catégorie sur les agrégats matérialisés
+    return render_template(
+        'admin_dashboard.html',
+        top_books=top_sellers(10),
+        category_revenue=revenue_by_category(30),
+    )
+
+# Compteurs du pipeline de logs Mongo (queued / flushed / dropped / …)
+@admin_bp.route('/logging/stats', methods=['GET'])
+@admin_required
+def logging_stats():
+    mongo_logger = current_app.extensions.get("mongo_logger")
+    if mongo_logger is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **mongo_logger.stats()})
+
+# Latence des appels Stripe (passerelle extensions.stripe_gateway)
+@admin_bp.route('/payments/stats', methods=['GET'])
+@admin_required
+def payments_stats():
+    return jsonify(current_app.extensions["stripe_gateway"].stats())
+
+# État du pool SQLAlchemy (connexions en cours, pic, alertes, attentes dépassées)
+@admin_bp.route('/db/stats', methods=['GET'])
+@admin_required
+def db_stats():
+    return jsonify(pool_stats())
+
+# Analytique des logs : NDJSON, une ligne par bucket, écrite au fil du curseur
+def _ndjson(rows):
+    def generate():
+        for row in rows:
+            yield json.dumps(row, default=str) + "\n"
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+def _analytics():
+    analytics = get_log_analytics()
+    if analytics is None:
+        abort(make_response(jsonify({"error": "Journalisation Mongo désactivée"}), 503))
+    return analytics
+
+@admin_bp.route('/analytics/logins', methods=['GET'])
+@admin_required
+def analytics_logins():
+    return _ndjson(_analytics().daily_logins(request.args.get('days', 30, type=int)))
+
+@admin_bp.route('/analytics/actions', methods=['GET'])
+@admin_required
+def analytics_actions():
+    return _ndjson(_analytics().daily_actions(request.args.get('days', 30, type=int)))
+
+@admin_bp.route('/analytics/failing-ips', methods=['GET'])
+@admin_required
+def analytics_failing_ips():
+    hours = request.args.get('hours', 24, type=int)
+    limit = request.args.get('limit', 20, type=int)
+    return _ndjson(_analytics().top_failing_ips(hours, limit))
 
 # CRUD Books
 
@@ -22,8 +87,16 @@ def admin_dashboard():
 @admin_bp.route('/books', methods=['GET'])
 @admin_required
 def list_books():
-    books = Book.query.all()
-    return render_template('list_books.html', books=books)
+    # Paginé / trié / filtré en base ; auteur et catégorie chargés avec la page
+    page = admin_books(
+        sort=request.args.get('sort'),
+        q=request.args.get('q'),
+        category_id=request.args.get('category_id', type=int),
+        author_id=request.args.get('author_id', type=int),
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+    )
+    return render_template('list_books.html', books=page.items, page=page)
 
 # CREATE
 @admin_bp.route('/add_book', methods=['GET', 'POST'])
@@ -38,14 +111,9 @@ def add_book():
             author_id = int(request.form['author_id'])
             category_id = int(request.form['category_id'])
 
-            # Vérifiez si une image est fournie
+            # Original conservé tel quel ; variantes WebP / JPEG générées en tâche de fond
             image_file = request.files['book_image']
-            book_image_url = None
-            if image_file:
-                filename = secure_filename(image_file.filename)
-                image_path = os.path.join(current_app.root_path, 'static/images', filename)
-                image_file.save(image_path)
-                book_image_url = f'/static/images/{filename}'
+            book_image_url = save_upload(image_file) if image_file else None
 
             # Création d'un nouvel objet livre
             new_book = Book(
@@ -57,15 +125,20 @@ def add_book():
                 book_image_url=book_image_url
             )
             db.session.add(new_book)
+            index_book(new_book)
             db.session.commit()
+            refresh_index(new_book)
+            invalidate_catalogue()
+            if book_image_url:
+                enqueue_cover(new_book.book_id)
             return redirect(url_for('admin_bp.list_books'))
         except Exception as e:
+            db.session.rollback()
             print("Erreur lors de l'ajout du livre :", e)
             return "Erreur lors de l'ajout du livre", 400
 
-    authors = Author.query.all()
-    categories = Category.query.all()
-    return render_template('add_book.html', authors=authors, categories=categories)
+    # Auteur / catégorie : autocomplétion (lookup_authors / lookup_categories)
+    return render_template('add_book.html')
 
 # UPDATE
 @admin_bp.route('/edit_book/<int:book_id>', methods=['GET', 'POST'])
@@ -81,12 +154,13 @@ def edit_book(book_id):
         book.book_price = float(request.form['price'])
         book.author_id = int(request.form['author_id'])
         book.category_id = int(request.form['category_id'])
+        index_book(book)
         db.session.commit()
+        refresh_index(book)
+        invalidate_catalogue()
         return redirect(url_for('admin_bp.list_books'))
 
-    authors = Author.query.all()
-    categories = Category.query.all()
-    return render_template('edit_book.html', book=book, authors=authors, categories=categories)
+    return render_template('edit_book.html', book=book)
 
 # DELETE
 @admin_bp.route('/delete_book/<int:book_id>', methods=['POST'])
@@ -98,6 +172,8 @@ def delete_book(book_id):
 
     db.session.delete(book)
     db.session.commit()
+    unindex_book(book_id)
+    invalidate_catalogue()
     return redirect(url_for('admin_bp.list_books'))
 
 
@@ -105,8 +181,19 @@ def delete_book(book_id):
 @admin_bp.route('/authors', methods=['GET'])
 @admin_required
 def list_authors():
-    authors = Author.query.all()
-    return render_template('list_authors.html', authors=authors)
+    page = admin_authors(
+        sort=request.args.get('sort'),
+        q=request.args.get('q'),
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+    )
+    return render_template('list_authors.html', authors=page.items, page=page)
+
+# Autocomplétion du formulaire livre : ?q=<début du nom>
+@admin_bp.route('/authors/lookup', methods=['GET'])
+@admin_required
+def author_lookup():
+    return jsonify(lookup_authors(request.args.get('q')))
 
 @admin_bp.route('/add_author', methods=['GET', 'POST'])
 @admin_required
@@ -122,8 +209,10 @@ def add_author():
                 author_lastname=author_lastname,
                 author_birthday=author_birthday
             )
+            index_author(new_author)
             db.session.add(new_author)
             db.session.commit()
+            invalidate_catalogue()
             return redirect(url_for('admin_bp.list_authors'))
         except Exception as e:
             print("Erreur lors de l'ajout de l'auteur :", e)
@@ -142,7 +231,11 @@ def edit_author(author_id):
         author.author_firstname = request.form['author_firstname']
         author.author_lastname = request.form['author_lastname']
         author.author_birthday = request.form['author_birthday']
+        index_author(author)
+        books = reindex_author(author)
         db.session.commit()
+        refresh_index(*books)
+        invalidate_catalogue()
         return redirect(url_for('admin_bp.list_authors'))
 
     return render_template('edit_author.html', author=author)
@@ -156,6 +249,7 @@ def delete_author(author_id):
 
     db.session.delete(author)
     db.session.commit()
+    invalidate_catalogue()
     return redirect(url_for('admin_bp.list_authors'))
 
 
@@ -163,8 +257,18 @@ def delete_author(author_id):
 @admin_bp.route('/categories', methods=['GET'])
 @admin_required
 def list_categories():
-    categories = Category.query.all()
-    return render_template('list_categories.html', categories=categories)
+    page = admin_categories(
+        sort=request.args.get('sort'),
+        q=request.args.get('q'),
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+    )
+    return render_template('list_categories.html', categories=page.items, page=page)
+
+@admin_bp.route('/categories/lookup', methods=['GET'])
+@admin_required
+def category_lookup():
+    return jsonify(lookup_categories(request.args.get('q')))
 
 @admin_bp.route('/add_category', methods=['GET', 'POST'])
 @admin_required
@@ -173,8 +277,10 @@ def add_category():
         try:
             category_name = request.form['category_name']
             new_category = Category(category_name=category_name)
+            index_category(new_category)
             db.session.add(new_category)
             db.session.commit()
+            invalidate_catalogue()
             return redirect(url_for('admin_bp.list_categories'))
         except Exception as e:
             print("Erreur lors de l'ajout de la catégorie :", e)
@@ -192,7 +298,9 @@ def edit_category(category_id):
 
     if request.method == 'POST':
         category.category_name = request.form['category_name']
+        index_category(category)
         db.session.commit()
+        invalidate_catalogue()
         return redirect(url_for('admin_bp.list_categories'))
 
     return render_template('edit_category.html', category=category)
@@ -206,4 +314,5 @@ def delete_category(category_id):
 
     db.session.delete(category)
     db.session.commit()
+    invalidate_catalogue()
     return redirect(url_for('admin_bp.list_categories'))
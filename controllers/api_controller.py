@@ -0,0 +1,135 @@
+"""
+API JSON du catalogue (v1), pour les partenaires et le front mobile.
+
+    GET /api/v1/books?fields=id,title,price&sort=price-asc&limit=50&after=<curseur>
+    GET /api/v1/books/<id>?fields=…
+    GET /api/v1/books/export?fields=…        (NDJSON, tout le catalogue)
+
+    • ``fields`` : seules ces colonnes sont lues en base (jointures auteur /
+      catégorie seulement si demandées) ; cf. ``services.catalogue.API_FIELDS`` ;
+    • pagination par clé (``after`` / ``before``), liens ``next`` / ``prev`` ;
+    • ETag + 304 (``services.conditional``) avant toute requête de données ;
+    • export : curseur serveur (``yield_per``) écrit ligne à ligne, mémoire
+      constante quelle que soit la taille du catalogue.
+"""
+
+from datetime import date, datetime
+import json
+
+from flask import Blueprint, Response, abort, jsonify, request, stream_with_context, url_for
+from werkzeug.exceptions import HTTPException
+
+from models.book_model import Book
+from services.catalogue import (
+    DEFAULT_SORT, SORT_KEYS, book_rows, count_books, parse_fields, parse_price,
+)
+from services.conditional import book_validators, conditional
+from services.pagination import keyset_paginate
+
+api_bp = Blueprint('api_bp', __name__)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+EXPORT_BATCH = 1000  # lignes lues par aller-retour sur le curseur serveur
+
+
+@api_bp.errorhandler(HTTPException)
+def api_error(error):
+    return jsonify({"error": error.description}), error.code
+
+
+# ---------------------------------------------------------------------- #
+#  Paramètres et sérialisation
+# ---------------------------------------------------------------------- #
+def _fields() -> list:
+    try:
+        return parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        abort(400, description=str(e))
+
+
+def _filters() -> dict:
+    try:
+        return dict(
+            category_id=request.args.get("category", type=int),
+            min_price=parse_price(request.args.get("min_price")),
+            max_price=parse_price(request.args.get("max_price")),
+        )
+    except ValueError as e:
+        abort(400, description=str(e))
+
+
+def _serialize(row, fields) -> dict:
+    out = {}
+    for name in fields:
+        value = getattr(row, name)
+        out[name] = value.isoformat() if isinstance(value, (date, datetime)) else value
+    return out
+
+
+def _page_link(cursor_name: str, cursor: str) -> str:
+    args = request.args.to_dict()
+    args.pop("after", None)
+    args.pop("before", None)
+    args[cursor_name] = cursor
+    return url_for("api_bp.list_books", _external=True, **args)
+
+
+# ---------------------------------------------------------------------- #
+#  Routes
+# ---------------------------------------------------------------------- #
+@api_bp.route('/books', methods=['GET'])
+@conditional(per_user=False)
+def list_books():
+    fields = _fields()
+    filters = _filters()
+    sort = request.args.get("sort", DEFAULT_SORT)
+    if sort not in SORT_KEYS:
+        abort(400, description=f"Tri inconnu : {sort}")
+    limit = min(max(request.args.get("limit", DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    column, descending = SORT_KEYS[sort]
+
+    page = keyset_paginate(
+        book_rows(fields, sort=sort, **filters),
+        [column, Book.book_id],
+        per_page=limit,
+        after=request.args.get("after"),
+        before=request.args.get("before"),
+        descending=descending,
+        total=count_books(**filters),
+    )
+    return jsonify(
+        data=[_serialize(row, fields) for row in page.items],
+        links={
+            "next": _page_link("after", page.next_cursor) if page.has_next else None,
+            "prev": _page_link("before", page.prev_cursor) if page.has_prev else None,
+        },
+        meta={"total": page.total, "count": len(page.items), "fields": fields},
+    )
+
+
+@api_bp.route('/books/<int:book_id>', methods=['GET'])
+@conditional(book_validators, per_user=False)
+def get_book(book_id):
+    fields = _fields()
+    row = book_rows(fields).filter(Book.book_id == book_id).first()
+    if row is None:
+        abort(404, description="Livre introuvable")
+    return jsonify(data=_serialize(row, fields))
+
+
+@api_bp.route('/books/export', methods=['GET'])
+@conditional(per_user=False)
+def export_books():
+    fields = _fields()
+    query = book_rows(fields, **_filters()).order_by(Book.book_id).yield_per(EXPORT_BATCH)
+
+    def generate():
+        for row in query:
+            yield json.dumps(_serialize(row, fields), ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Content-Disposition": "inline; filename=books.ndjson"},
+    )
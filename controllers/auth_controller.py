@@ -1,6 +1,5 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash, session
 from flask_login import login_user, logout_user, current_user, login_required
-from werkzeug.security import check_password_hash, generate_password_hash
 from itsdangerous import URLSafeTimedSerializer
 from datetime import datetime
 import time
@@ -9,15 +8,13 @@ import os
 from models import db
 from models.user_model import User
 from controllers.access_management import guest_required
+from services.passwords import HasherBusy, get_hasher, hash_password
+from services.rate_limit import get_login_limiter
 # controllers/auth_controller.py
-from extensions.mongo import log_login, log_action, get_mongo
+from extensions import log_login, log_action  # no-op si Mongo n'est pas configuré
 
 login_bp = Blueprint('login_bp', __name__)
 
-# Configuration sécurité
-MAX_LOGIN_ATTEMPTS = 5
-LOCKOUT_TIME = 300  # 5 minutes
-
 @login_bp.route('/login', methods=['GET', 'POST'])
 @guest_required
 def login():
@@ -26,20 +23,30 @@ def login():
         password = request.form.get('user_password', '')
         ip_addr = request.remote_addr  # IP du client
 
-        # Gestion des tentatives
-        session['login_attempts'] = session.get('login_attempts', 0) + 1
-        if session['login_attempts'] > MAX_LOGIN_ATTEMPTS:
+        # Limitation côté serveur (IP + email), avant toute requête SQL ou hachage
+        limiter = get_login_limiter()
+        retry_after = limiter.blocked_for(ip_addr, email)
+        if retry_after:
             flash('Trop de tentatives. Veuillez réessayer plus tard.', 'danger')
             try:
                 log_login(None, email, None, "locked", ip_addr)
             except Exception as e:
                 print(f"⚠️ log_login failed (locked): {e}")
-            return redirect(url_for('login_bp.login'))
+            return render_template('login.html'), 429, {'Retry-After': str(retry_after)}
 
         user = User.query.filter_by(user_email=email).first()
 
-        if user and check_password_hash(user.user_password, password):
-            session['login_attempts'] = 0
+        # Vérification dans le pool de processus ; re-hachage si la méthode a changé
+        try:
+            authenticated = bool(user) and get_hasher().verify_and_update(user, password)
+        except HasherBusy:
+            flash('Service momentanément surchargé, veuillez réessayer.', 'warning')
+            return render_template('login.html'), 503
+
+        if authenticated:
+            if db.session.is_modified(user):
+                db.session.commit()
+            limiter.success(email)
             login_user(user)
             session['user_id'] = user.user_id
             session['user_firstname'] = user.user_firstname
@@ -55,6 +62,7 @@ def login():
                 'admin_bp.admin_dashboard' if user.user_role == 'admin' else 'home'
             ))
         else:
+            limiter.failure(ip_addr, email)
             try:
                 log_login(
                     user.user_id if user else None,
@@ -127,7 +135,11 @@ def reset_password(token):
 
         user = User.query.filter_by(user_email=email).first()
         if user:
-            user.user_password = generate_password_hash(password)
+            try:
+                user.user_password = hash_password(password)
+            except HasherBusy:
+                flash('Service momentanément surchargé, veuillez réessayer.', 'warning')
+                return render_template('reset_password.html', token=token), 503
             db.session.commit()
             flash('Votre mot de passe a été mis à jour. Vous pouvez maintenant vous connecter.', 'success')
             return redirect(url_for('login_bp.login'))
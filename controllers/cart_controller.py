@@ -1,12 +1,10 @@
 from flask import Blueprint, request, redirect, url_for, flash, session, render_template, jsonify
 from controllers.access_management import user_required
-from datetime import datetime
 from models.user_model import User
 from models import db
-from models.order_model import Order
-from models.order_details_model import OrderDetail
 from models.cart_items_model import CartItem
-from models.book_model import Book
+from services.cart_snapshot import get_cart_snapshot, invalidate_cart
+from services.checkout import checkout_cart
 
 # Déclaration du Blueprint
 cart_bp = Blueprint('cart_bp', __name__)
@@ -34,6 +32,7 @@ def add_to_cart(book_id):
         cart_item = CartItem(user_id=user_id, book_id=book_id)
         db.session.add(cart_item)
         db.session.commit()
+        invalidate_cart(user_id)
         flash("Livre ajouté au panier.", "success")
 
     return redirect(url_for('gallery'))
@@ -46,10 +45,8 @@ def view_cart():
         flash("Veuillez vous connecter pour voir votre panier.", "warning")
         return redirect(url_for('login_bp.login'))
 
-    cart_items = CartItem.query.filter_by(user_id=user_id).all()
-    total_price = sum(item.book.book_price for item in cart_items) if cart_items else 0
-
-    return render_template('cart.html', cart_items=cart_items, total_price=total_price)
+    cart = get_cart_snapshot(user_id)
+    return render_template('cart.html', cart_items=cart.items, total_price=cart.total_price)
 
 
 @cart_bp.route('/remove_from_cart/<int:cart_item_id>', methods=['POST'])
@@ -63,6 +60,7 @@ def remove_from_cart(cart_item_id):
     if cart_item and cart_item.user_id == user_id:
         db.session.delete(cart_item)
         db.session.commit()
+        invalidate_cart(user_id)
         flash("Article retiré du panier.", "success")
     else:
         flash("Impossible de supprimer cet article.", "danger")
@@ -79,36 +77,19 @@ def checkout_summary():
         return redirect(url_for('login_bp.login'))
 
     user = User.query.get(user_id)
-    cart_items = CartItem.query.filter_by(user_id=user_id).all()
-    total_price = sum(item.book.book_price for item in cart_items)
-    tva = round(total_price * 0.2, 2)
 
     if request.method == 'POST':
         email = request.form.get('email') or user.user_email
         session['delivery_email'] = email
 
-        # Création de la commande
-        order = Order(user_id=user_id, order_date=datetime.utcnow(), total_price=0, payment_status="pending")
-        db.session.add(order)
-        db.session.flush()
-
-        total_price = 0
-        for item in cart_items:
-            order_detail = OrderDetail(
-                order_id=order.order_id,
-                book_id=item.book_id,
-                quantity=1,
-                unit_price=item.book.book_price
-            )
-            db.session.add(order_detail)
-            total_price += item.book.book_price
-
-        order.total_price = total_price
-        db.session.commit()
-
-        CartItem.query.filter_by(user_id=user_id).delete()
-        db.session.commit()
+        order_id = checkout_cart(user_id)
+        if order_id is None:
+            flash("Votre panier est vide.", "info")
+            return redirect(url_for('cart_bp.view_cart'))
 
-        return redirect(url_for('payement_bp.create_checkout_session', order_id=order.order_id))
+        return redirect(url_for('payement_bp.create_checkout_session', order_id=order_id))
 
+    cart = get_cart_snapshot(user_id)
+    cart_items, total_price = cart.items, cart.total_price
+    tva = round(total_price * 0.2, 2)
     return render_template('checkout_summary.html', cart_items=cart_items, user=user, total_price=total_price, tva=tva)
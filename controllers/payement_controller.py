@@ -1,11 +1,9 @@
-import stripe
-from flask import Blueprint, request, jsonify, url_for, flash, redirect, render_template  # Ajout de render_template
+from flask import Blueprint, request, jsonify, url_for, flash, redirect, render_template, current_app  # Ajout de render_template
 from controllers.access_management import admin_required, user_required, guest_required
 
-from config import STRIPE_SECRET_KEY  # Récupération de la clé Stripe
 from models import db, Order  # Import des modèles nécessaires
-
-stripe.api_key = STRIPE_SECRET_KEY
+from services.payments import checkout_session_url
+from services.sales import mark_order_paid
 
 payement_bp = Blueprint('payement_bp', __name__)
 
@@ -20,33 +18,22 @@ def create_checkout_session(order_id):
         flash("Cette commande a déjà été payée.", "info")
         return redirect(url_for('home'))
 
-    line_items = [{
-        'price_data': {
-            'currency': 'eur',
-            'product_data': {
-                'name': f'Commande {order.order_id}',
-            },
-            'unit_amount': int(order.total_price * 100),
-        },
-        'quantity': 1,
-    }]
-
     try:
-        session_stripe = stripe.checkout.Session.create(
-            payment_method_types=['card'],
-            line_items=line_items,
-            mode='payment',
+        checkout_url = checkout_session_url(
+            order,
             success_url=url_for('payement_bp.payment_success', order_id=order_id, _external=True),
             cancel_url=url_for('payement_bp.payment_failed', order_id=order_id, _external=True),
         )
+        db.session.commit()
 
         # ✅ Si l’appel vient du navigateur (pas Ajax), on redirige directement
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-            return jsonify({'url': session_stripe.url})
+            return jsonify({'url': checkout_url})
         else:
-            return redirect(session_stripe.url)
+            return redirect(checkout_url)
 
     except Exception as e:
+        db.session.rollback()
         flash("Erreur lors de la création de la session de paiement.", "danger")
         return redirect(url_for('cart_bp.view_cart'))
 
@@ -59,12 +46,16 @@ def payment_success(order_id):
         flash("Commande introuvable.", "danger")
         return redirect(url_for('home'))
 
-    # ✅ Mettre à jour le statut de paiement
-    order.payment_status = "paid"
-    db.session.commit()
+    # ✅ Avec webhook, c'est Stripe qui confirme le paiement (services.webhooks) ;
+    #    sans secret configuré (dev), on garde la validation au retour navigateur
+    if not current_app.config.get("STRIPE_WEBHOOK_SECRET") and mark_order_paid(order):
+        db.session.commit()
 
     # ✅ Stocker le numéro de commande pour affichage
-    flash(f"🎉 Paiement validé ! Votre commande n°{order.order_id} a été confirmée.", "success")
+    if order.payment_status == "paid":
+        flash(f"🎉 Paiement validé ! Votre commande n°{order.order_id} a été confirmée.", "success")
+    else:
+        flash(f"⏳ Paiement reçu, la commande n°{order.order_id} sera confirmée d'ici quelques instants.", "info")
 
     # ✅ Proposer une redirection après paiement
     return render_template("payment_success.html", order=order)
@@ -77,8 +68,10 @@ def payment_failed(order_id):
         flash("Commande introuvable.", "danger")
         return redirect(url_for('home'))
 
-    order.payment_status = "failed"
-    db.session.commit()
+    # Ne jamais rétrograder une commande déjà confirmée par le webhook
+    if order.payment_status == "pending":
+        order.payment_status = "failed"
+        db.session.commit()
     flash("Le paiement a échoué. Veuillez réessayer.", "danger")
 
     return redirect(url_for('cart_bp.view_cart'))
@@ -5,56 +5,35 @@ from models.user_model import User
 from models import db
 from datetime import datetime
 import re
-import zxcvbn  # Module pour l'analyse de force des mots de passe
+from services.password_strength import analyze, analyze_many
 
 register_bp = Blueprint('register_bp', __name__)
 
 def validate_password_strength(password):
     """Valide la force du mot de passe selon plusieurs critères"""
-    errors = []
-    requirements = {
-        'length': len(password) >= 12,
-        'uppercase': re.search(r'[A-Z]', password) is not None,
-        'lowercase': re.search(r'[a-z]', password) is not None,
-        'digit': re.search(r'\d', password) is not None,
-        'special': re.search(r'[^A-Za-z0-9]', password) is not None,
-        'common': not zxcvbn.zxcvbn(password)['score'] < 3  # Score minimum de 3/4
-    }
-    
-    if not all(requirements.values()):
-        if not requirements['length']:
-            errors.append("Le mot de passe doit contenir au moins 12 caractères")
-        if not requirements['uppercase']:
-            errors.append("Le mot de passe doit contenir au moins une majuscule")
-        if not requirements['lowercase']:
-            errors.append("Le mot de passe doit contenir au moins une minuscule")
-        if not requirements['digit']:
-            errors.append("Le mot de passe doit contenir au moins un chiffre")
-        if not requirements['special']:
-            errors.append("Le mot de passe doit contenir au moins un caractère spécial")
-        if not requirements['common']:
-            errors.append("Le mot de passe est trop commun ou facile à deviner")
-    
-    return len(errors) == 0, errors
+    analysis = analyze(password)
+    return analysis['valid'], analysis['errors']
 
 @register_bp.route('/check_password', methods=['POST'])
 def check_password():
-    """Endpoint pour la validation en temps réel du mot de passe"""
-    password = request.form.get('password', '')
-    is_valid, errors = validate_password_strength(password)
-    
-    # Analyse détaillée avec zxcvbn
-    password_analysis = zxcvbn.zxcvbn(password)
-    score = password_analysis['score']  # 0-4 (faible à fort)
-    feedback = password_analysis['feedback']['suggestions']
-    
-    return jsonify({
-        'valid': is_valid,
-        'errors': errors,
-        'score': score,
-        'feedback': feedback,
-        'crack_time': password_analysis['crack_times_display']['offline_slow_hashing_1e4_per_second']
-    })
+    """
+    Endpoint pour la validation en temps réel du mot de passe.
+
+    ``seq`` (numéro de séquence client) est renvoyé tel quel pour que le
+    navigateur ignore les réponses arrivées dans le désordre ; ``passwords``
+    (JSON) évalue un lot en un seul appel.
+    """
+    data = request.get_json(silent=True) or request.form
+    seq = data.get('seq')
+    user_inputs = [data.get('user_email', ''), data.get('user_firstname', ''), data.get('user_lastname', '')]
+
+    passwords = data.get('passwords') if request.is_json else None
+    if isinstance(passwords, list):
+        results = analyze_many([p for p in passwords if isinstance(p, str)], user_inputs)
+        return jsonify({'seq': seq, 'results': results})
+
+    password = data.get('password', '')
+    return jsonify({'seq': seq, **analyze(password if isinstance(password, str) else '', user_inputs)})
 
 @register_bp.route('/register', methods=['GET', 'POST'])
 def register():
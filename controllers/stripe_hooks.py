@@ -1,23 +1,27 @@
-import os, stripe
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
+
+from services.webhooks import enqueue_event, notify_worker, verify_event
 
 bp = Blueprint("stripe_hooks", __name__)
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
-WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 
 @bp.post("/webhook/stripe")
 def stripe_webhook():
     # En dev: autoriser l'endpoint même sans secret (no-op)
-    if not WEBHOOK_SECRET:
+    secret = current_app.config.get("STRIPE_WEBHOOK_SECRET")
+    if not secret:
         return "Webhook off (secret missing)", 200
+
+    import stripe  # import différé : chargé seulement quand le webhook sert
+
     try:
         payload = request.get_data()
         sig = request.headers.get("Stripe-Signature", "")
-        event = stripe.Webhook.construct_event(payload, sig, WEBHOOK_SECRET)
-    except Exception:
+        event = verify_event(payload, sig, secret)
+    except (ValueError, stripe.error.SignatureVerificationError):
         return "Bad signature", 400
 
-    if event["type"] == "checkout.session.completed":
-        session = event["data"]["object"]
-        # TODO: marquer la commande comme payée
+    # Enregistrement idempotent puis réponse immédiate : le worker applique
+    # les transitions de commande hors du chemin de la requête
+    enqueue_event(event)
+    notify_worker()
     return "", 200
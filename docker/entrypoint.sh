@@ -27,4 +27,5 @@ PY
 fi
 
 # Launch Gunicorn with the factory pattern
-exec gunicorn -b 0.0.0.0:8000 "app:create_app()"
+# Workers, threads, préchargement, délais : cf. gunicorn.conf.py (GUNICORN_*)
+exec gunicorn -c gunicorn.conf.py "app:create_app()"
@@ -1,16 +1,52 @@
 """
-Point d'entrée unique pour Mongo helpers :
+Point d'entrée unique pour Mongo helpers et cache :
 
     from extensions import log_login, log_action, get_mongo, init_mongo
+    from extensions import init_cache, get_cache
+    from extensions import init_stripe, get_stripe
+
+Mongo (pymongo, APScheduler) n'est importé qu'à la première utilisation :
+une application sans ``MONGODB_URI`` ne le charge jamais.
 """
 
-from .mongo import (
-    get_mongo,
-    log_login,
-    log_action,
-    close_mongo,
-    init_mongo,      # ⭐️ on l’importe ET on l’exporte
-)
+from importlib import import_module
+from typing import Optional
+
+from flask import current_app
+
+from .cache import init_cache, get_cache
+from .stripe_gateway import init_stripe, get_stripe
+
+_LAZY = {
+    "get_mongo": ".mongo",
+    "close_mongo": ".mongo",
+    "init_mongo": ".mongo",   # ⭐️ on l’exporte (import différé)
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
+
+
+def log_login(user_id: Optional[int], email: str, role: Optional[str], status: str, ip_addr: str) -> bool:
+    """``False`` sans rien importer tant que Mongo n'est pas configuré."""
+    if "mongo_logger" not in current_app.extensions:
+        return False
+    from .mongo import log_login as _log_login
+
+    return _log_login(user_id, email, role, status, ip_addr)
+
+
+def log_action(user_id: int, email: str, role: str, action_type: str, **extra) -> bool:
+    if "mongo_logger" not in current_app.extensions:
+        return False
+    from .mongo import log_action as _log_action
+
+    return _log_action(user_id, email, role, action_type, **extra)
+
 
 __all__ = [
     "get_mongo",
@@ -18,4 +54,8 @@ __all__ = [
     "log_action",
     "close_mongo",
     "init_mongo",    # ⭐️ ajouté
+    "init_cache",
+    "get_cache",
+    "init_stripe",
+    "get_stripe",
 ]
@@ -0,0 +1,193 @@
+"""
+Empreinte des fichiers statiques et cache navigateur longue durée.
+
+    flask assets build
+        static/css/home.css ─▶ static/dist/css/home.<sha256[:10]>.css (+ .gz, + .br)
+        static/dist/manifest.json : {"css/home.css": "dist/css/home.….css", …}
+
+    url_for('static', filename='css/home.css')  ─▶ /static/dist/css/home.….css
+
+    • le manifeste est lu au démarrage ; ``url_for('static', …)`` le consulte
+      (``url_defaults``) : aucun template à modifier ;
+    • une URL à empreinte ne change jamais de contenu : réponse
+      ``Cache-Control: public, max-age=31536000, immutable``, version
+      précompressée (``.br`` puis ``.gz``) choisie selon ``Accept-Encoding`` ;
+      une visite suivante ne redemande aucun de ces fichiers ;
+    • les ``url(…)`` relatives des CSS sont réécrites vers les fichiers à
+      empreinte (ou l'original) : la copie dans ``dist/`` reste valide ;
+    • les anciennes empreintes sont conservées : les pages encore en cache
+      chez les clients pendant un déploiement restent servies.
+
+Sans manifeste (dev, ``ASSETS_FINGERPRINT=false`` ou mode debug), tout est
+servi comme avant. Brotli (paquet ``brotli``) est optionnel.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+
+import click
+from flask import current_app, request, send_from_directory
+from flask.cli import AppGroup
+from werkzeug.security import safe_join
+
+ASSET_DIRS = ("css", "js", "icons")
+DIST_DIR = "dist"
+MANIFEST_FILE = "dist/manifest.json"
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".map", ".txt"}
+# Nommés par leur contenu par services.covers : immuables eux aussi
+IMMUTABLE_PREFIXES = ("images/covers/",)
+ONE_YEAR = 365 * 24 * 3600
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+# ---------------------------------------------------------------------- #
+#  Construction
+# ---------------------------------------------------------------------- #
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _compress(path: str, data: bytes) -> None:
+    packed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(packed) < len(data):
+        _write_atomic(path + ".gz", packed)
+    try:
+        import brotli
+    except ImportError:
+        return
+    packed = brotli.compress(data, quality=11)
+    if len(packed) < len(data):
+        _write_atomic(path + ".br", packed)
+
+
+def _rewrite_css(data: bytes, logical: str, manifest: Dict[str, str], url_prefix: str) -> bytes:
+    base = posixpath.dirname(logical)
+
+    def replace(match) -> str:
+        target = match.group(2).strip()
+        if target.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+        path = re.split(r"[?#]", target, maxsplit=1)[0]
+        suffix = target[len(path):]  # ?v=… / #id conservés
+        resolved = posixpath.normpath(posixpath.join(base, path))
+        return f'url("{url_prefix}/{manifest.get(resolved, resolved)}{suffix}")'
+
+    return _CSS_URL.sub(replace, data.decode("utf-8")).encode("utf-8")
+
+
+def build_manifest(static_folder: str, url_prefix: str = "/static", dirs: Iterable[str] = ASSET_DIRS) -> Dict[str, str]:
+    """Copie à empreinte de chaque fichier de *dirs*, versions compressées, manifeste."""
+    sources = []
+    for directory in dirs:
+        for root, _, files in os.walk(os.path.join(static_folder, directory)):
+            for name in files:
+                sources.append(os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, "/"))
+    # CSS en dernier : leurs url(…) pointent vers les empreintes déjà calculées
+    sources.sort(key=lambda rel: (rel.endswith(".css"), rel))
+
+    manifest: Dict[str, str] = {}
+    for logical in sources:
+        with open(os.path.join(static_folder, logical), "rb") as fh:
+            data = fh.read()
+        if logical.endswith(".css"):
+            data = _rewrite_css(data, logical, manifest, url_prefix)
+        stem, extension = posixpath.splitext(logical)
+        target = f"{DIST_DIR}/{stem}.{hashlib.sha256(data).hexdigest()[:10]}{extension}"
+        path = os.path.join(static_folder, target)
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+            if extension in COMPRESSIBLE:
+                _compress(path, data)
+        manifest[logical] = target
+
+    _write_atomic(os.path.join(static_folder, MANIFEST_FILE), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+# ---------------------------------------------------------------------- #
+#  Exécution
+# ---------------------------------------------------------------------- #
+class AssetManifest:
+    def __init__(self, files: Optional[Dict[str, str]] = None):
+        self.files = files or {}
+        self._targets = set(self.files.values())
+
+    @classmethod
+    def load(cls, static_folder: str) -> "AssetManifest":
+        path = os.path.join(static_folder, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def resolve(self, filename: str) -> str:
+        return self.files.get(filename, filename)
+
+    def is_immutable(self, filename: str) -> bool:
+        return filename in self._targets or filename.startswith(IMMUTABLE_PREFIXES)
+
+
+def _fingerprint(endpoint: str, values: dict) -> None:
+    if endpoint == "static" and "filename" in values:
+        values["filename"] = current_app.extensions["asset_manifest"].resolve(values["filename"])
+
+
+def send_static(filename: str):
+    """Remplace la vue ``static`` : immuable + précompressé pour les empreintes."""
+    app = current_app
+    if not app.extensions["asset_manifest"].is_immutable(filename):
+        return app.send_static_file(filename)
+
+    served, encoding = filename, None
+    for name, suffix in (("br", ".br"), ("gzip", ".gz")):
+        candidate = safe_join(app.static_folder, filename + suffix)
+        if name in request.accept_encodings and candidate and os.path.isfile(candidate):
+            served, encoding = filename + suffix, name
+            break
+
+    response = send_from_directory(
+        app.static_folder,
+        served,
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        max_age=ONE_YEAR,
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_assets(app) -> None:
+    enabled = app.config.get("ASSETS_FINGERPRINT", True) and not app.debug
+    app.extensions["asset_manifest"] = AssetManifest.load(app.static_folder) if enabled else AssetManifest()
+    if app.has_static_folder:
+        app.url_defaults(_fingerprint)
+        app.view_functions["static"] = send_static
+
+
+# ---------------------------------------------------------------------- #
+#  CLI : flask assets build
+# ---------------------------------------------------------------------- #
+assets_cli = AppGroup("assets", help="Fichiers statiques à empreinte.")
+
+
+@assets_cli.command("build")
+def build_command():
+    """Génère static/dist/ et son manifeste (à lancer à chaque déploiement)."""
+    manifest = build_manifest(current_app.static_folder, current_app.static_url_path)
+    click.echo(f"✅ {len(manifest)} fichiers, manifeste : {MANIFEST_FILE}")
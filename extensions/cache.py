@@ -0,0 +1,324 @@
+"""
+Backends de cache interchangeables :
+
+    • ``LRUCache``   : en mémoire du processus (LRU + TTL), par défaut ;
+    • ``RedisCache`` : tout client parlant le protocole Redis (redis-py,
+      fakeredis, ou un faux client local pour les tests) ;
+    • ``FileSystemCache`` : un fichier par clé dans un dossier local, partagé
+      par tous les workers Gunicorn d'une même machine, sans serveur.
+
+Tous exposent la même API : ``get`` / ``set`` / ``delete`` / ``incr`` /
+``clear``. Les valeurs doivent rester sérialisables en JSON.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock, get_ident
+from typing import Any, Iterator, Optional
+import hashlib
+import json
+import os
+import re
+import time
+
+try:
+    import fcntl  # verrou inter-processus (POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from flask import current_app
+
+
+class LRUCache:
+    """Cache en mémoire borné (LRU) avec expiration par clé."""
+
+    def __init__(self, maxsize: int = 1024, default_ttl: Optional[int] = 300):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    # ------------------------------------------------------------------ #
+    # API
+    # ------------------------------------------------------------------ #
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                value = amount
+                self._store(key, value, ttl)
+            else:
+                value = int(entry[1]) + amount
+                self._data[key] = (entry[0], value)
+                self._data.move_to_end(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    # ------------------------------------------------------------------ #
+    # Helpers internes
+    # ------------------------------------------------------------------ #
+    def _store(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    Adaptateur au-dessus d'un client Redis.
+
+    Seules les commandes ``get``, ``set(ex=…)``, ``delete``, ``incrby``,
+    ``expire`` et ``scan_iter`` sont utilisées : un faux client en mémoire
+    suffit pour tester sans serveur.
+    """
+
+    def __init__(self, client, prefix: str = "plume:", default_ttl: Optional[int] = 300):
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl or None)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + k for k in keys))
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        value = int(self.client.incrby(self.prefix + key, amount))
+        if ttl and value == amount:
+            # Première écriture de la fenêtre → on pose l'expiration
+            self.client.expire(self.prefix + key, ttl)
+        return value
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class FileSystemCache:
+    """
+    Cache sur disque : ``<sha1(clé)>.json`` = ``[expiration, valeur]``.
+
+    Écritures atomiques (fichier temporaire + ``os.replace``) : un lecteur ne
+    voit jamais d'entrée à moitié écrite. ``incr`` est protégé par un verrou
+    ``flock`` commun aux processus. Les entrées expirées, puis les plus
+    anciennes au-delà de *maxsize*, sont purgées toutes les ``maxsize // 8``
+    écritures ; les entrées sans expiration (``catalogue:version``…) ne
+    partent qu'en dernier.
+
+    *prefix* joue le rôle de celui de ``RedisCache`` : un sous-dossier, donc
+    un espace de clés et un *maxsize* propres (cache de pages à côté du
+    cache applicatif).
+    """
+
+    def __init__(self, directory: str, maxsize: int = 1024, default_ttl: Optional[int] = 300, prefix: str = ""):
+        namespace = re.sub(r"[^A-Za-z0-9_.-]+", "-", prefix).strip("-.")
+        self.directory = os.path.join(directory, namespace) if namespace else directory
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._lock = Lock()  # incr (avec flock)
+        self._count_lock = Lock()  # compteur d'écritures
+        self._writes = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    # ------------------------------------------------------------------ #
+    # API
+    # ------------------------------------------------------------------ #
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+        entry = self._read(path)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(path)
+            return None
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._store(self._path(key), value, ttl)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._remove(self._path(key))
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        path = self._path(key)
+        with self._locked():
+            entry = self._read(path)
+            if entry is None or (entry[0] is not None and entry[0] <= time.time()):
+                value = amount
+                self._store(path, value, ttl)
+            else:
+                value = int(entry[1]) + amount
+                self._write(path, entry[0], value)
+            return value
+
+    def clear(self) -> None:
+        for name in self._entries():
+            self._remove(os.path.join(self.directory, name))
+
+    # ------------------------------------------------------------------ #
+    # Helpers internes
+    # ------------------------------------------------------------------ #
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _entries(self) -> list:
+        try:
+            return [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _read(path: str) -> Optional[list]:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self, path: str, expires_at: Optional[float], value: Any) -> None:
+        tmp = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump([expires_at, value], fh)
+        os.replace(tmp, path)
+
+    def _store(self, path: str, value: Any, ttl: Optional[int]) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self._write(path, time.time() + ttl if ttl else None, value)
+        with self._count_lock:
+            self._writes += 1
+            due = self._writes % max(1, self.maxsize // 8) == 0
+        if due:
+            self._prune()
+
+    def _prune(self) -> None:
+        now, alive = time.time(), []
+        for name in self._entries():
+            path = os.path.join(self.directory, name)
+            entry = self._read(path)
+            if entry is None or (entry[0] is not None and entry[0] <= now):
+                self._remove(path)
+                continue
+            try:
+                alive.append((entry[0] is None, os.path.getmtime(path), path))
+            except OSError:
+                continue
+        alive.sort()
+        for _, _, path in alive[: max(0, len(alive) - self.maxsize)]:
+            self._remove(path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.directory, ".lock"), "a") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+
+# ---------------------------------------------------------------------- #
+#  Fabrique & intégration Flask
+# ---------------------------------------------------------------------- #
+def build_cache(url: Optional[str] = None, **options):
+    """
+    Construit un backend à partir d'une URL :
+
+        memory://            → LRUCache (défaut)
+        redis://host:6379/0  → RedisCache (nécessite le paquet ``redis``)
+        file:///var/cache/x  → FileSystemCache (dossier créé au besoin)
+    """
+    if not url or url.startswith("memory://"):
+        return LRUCache(
+            maxsize=options.get("maxsize", 1024),
+            default_ttl=options.get("default_ttl", 300),
+        )
+
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis  # dépendance optionnelle
+
+        return RedisCache(
+            redis.Redis.from_url(url),
+            prefix=options.get("prefix", "plume:"),
+            default_ttl=options.get("default_ttl", 300),
+        )
+
+    if url.startswith("file://") and len(url) > len("file://"):
+        return FileSystemCache(
+            url[len("file://"):],
+            maxsize=options.get("maxsize", 1024),
+            default_ttl=options.get("default_ttl", 300),
+            prefix=options.get("prefix", ""),
+        )
+
+    raise ValueError(f"Backend de cache inconnu : {url}")
+
+
+def init_cache(app) -> None:
+    """Attache le cache partagé à *app* (``app.extensions['cache']``)."""
+    app.extensions["cache"] = build_cache(
+        app.config.get("CACHE_URL"),
+        maxsize=app.config.get("CACHE_MAXSIZE", 1024),
+        default_ttl=app.config.get("CACHE_DEFAULT_TTL", 300),
+    )
+
+
+def get_cache():
+    return current_app.extensions["cache"]
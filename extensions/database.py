@@ -0,0 +1,192 @@
+"""
+Réglages du moteur SQLAlchemy et instrumentation des accès base.
+
+    • ``engine_options(config)`` : ``SQLALCHEMY_ENGINE_OPTIONS`` construits
+      depuis les variables ``DB_*`` (taille du pool, débordement, attente,
+      recyclage, ``pool_pre_ping``, délais de connexion / de requête) ;
+      mode ``DB_PGBOUNCER`` pour un PgBouncer en pooling transactionnel ;
+    • par requête : nombre de requêtes SQL et temps passé en base (``g``),
+      journal des requêtes HTTP trop lentes / trop bavardes, en-tête
+      ``Server-Timing`` optionnel ;
+    • alerte quand le pool approche de l'épuisement, 503 quand il l'est.
+
+Après un redémarrage de Postgres, ``pool_pre_ping`` écarte les connexions
+mortes une à une et ``pool_use_lifo`` laisse expirer les connexions en trop :
+plus de vague de reconnexions simultanées.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+from typing import Any, Dict, Optional
+import logging
+import time
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------- #
+#  Options du moteur
+# ---------------------------------------------------------------------- #
+def engine_options(config) -> Dict[str, Any]:
+    """Options de ``create_engine`` ; SQLite en mémoire garde les défauts de Flask-SQLAlchemy."""
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    backend = url.get_backend_name()
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+
+    options: Dict[str, Any] = dict(
+        pool_size=config["DB_POOL_SIZE"],
+        max_overflow=config["DB_MAX_OVERFLOW"],
+        pool_timeout=config["DB_POOL_TIMEOUT"],
+        pool_recycle=config["DB_POOL_RECYCLE"],
+        pool_pre_ping=config["DB_POOL_PRE_PING"],
+        pool_use_lifo=True,
+    )
+    if backend != "postgresql":
+        return options
+
+    connect_args: Dict[str, Any] = {"connect_timeout": config["DB_CONNECT_TIMEOUT"]}
+
+    if config["DB_PGBOUNCER"]:
+        # Pooling transactionnel : pas d'instructions préparées côté serveur
+        # (psycopg 3) ni de paramètres de démarrage que PgBouncer refuse.
+        if url.get_driver_name() == "psycopg":
+            connect_args["prepare_threshold"] = None
+    elif config["DB_STATEMENT_TIMEOUT_MS"]:
+        connect_args["options"] = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+
+    options["connect_args"] = connect_args
+    return options
+
+
+# ---------------------------------------------------------------------- #
+#  Instrumentation
+# ---------------------------------------------------------------------- #
+class PoolMonitor:
+    """Alerte (au plus une fois par ``interval``) quand le pool est presque plein ou épuisé."""
+
+    def __init__(self, ratio: float = 0.9, interval: float = 60.0):
+        self.ratio = ratio
+        self.interval = interval
+        self.alerts = 0
+        self.timeouts = 0
+        self.peak = 0
+        self._last_alert = 0.0
+        self._last_timeout_log = 0.0
+        self._lock = Lock()
+
+    def on_checkout(self, pool) -> None:
+        capacity = _capacity(pool)
+        if capacity is None:
+            return
+        in_use = pool.checkedout()
+        with self._lock:
+            self.peak = max(self.peak, in_use)
+            if in_use < capacity * self.ratio:
+                return
+            now = time.monotonic()
+            if now - self._last_alert < self.interval:
+                return
+            self._last_alert = now
+            self.alerts += 1
+        logger.warning(f"[DB] Pool presque épuisé : {in_use}/{capacity} connexions ({pool.status()})")
+
+    def on_timeout(self, pool) -> None:
+        with self._lock:
+            self.timeouts += 1
+            now = time.monotonic()
+            if now - self._last_timeout_log < self.interval:
+                return
+            self._last_timeout_log = now
+        logger.error(f"[DB] Pool épuisé, attente dépassée ({self.timeouts} au total) : {pool.status()}")
+
+    def stats(self, pool) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                status=pool.status(),
+                in_use=pool.checkedout() if hasattr(pool, "checkedout") else None,
+                capacity=_capacity(pool),
+                peak=self.peak,
+                alerts=self.alerts,
+                timeouts=self.timeouts,
+            )
+
+
+def _capacity(pool) -> Optional[int]:
+    # QueuePool uniquement : NullPool / StaticPool n'ont pas de plafond
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "_max_overflow"):
+        return None
+    overflow = pool._max_overflow
+    return None if overflow < 0 else pool.size() + overflow
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(conn)
+
+
+def _handle_error(context):
+    # Requête en échec : pas d'after_cursor_execute, on dépile quand même
+    if context.connection is not None:
+        _record(context.connection)
+
+
+def _record(conn):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_app_context():
+        g.db_queries = g.get("db_queries", 0) + 1
+        g.db_time = g.get("db_time", 0.0) + elapsed
+
+
+def _after_request(response):
+    queries = g.get("db_queries", 0)
+    if not queries:
+        return response
+    db_ms = g.get("db_time", 0.0) * 1000
+    config = current_app.config
+    if db_ms >= config["DB_SLOW_REQUEST_MS"] or queries > config["DB_MAX_QUERIES_PER_REQUEST"]:
+        logger.warning(f"[DB] {request.method} {request.path} : {queries} requêtes, {db_ms:.1f} ms en base")
+    if config["DB_SERVER_TIMING"]:
+        response.headers.add("Server-Timing", f'db;dur={db_ms:.1f};desc="{queries} queries"')
+    return response
+
+
+def init_db_metrics(app, db) -> None:
+    monitor = PoolMonitor(ratio=app.config["DB_POOL_ALERT_RATIO"])
+    app.extensions["db_pool_monitor"] = monitor
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+        event.listen(engine, "handle_error", _handle_error)
+        # engine.pool et non le pool courant : dispose() (post-fork) en crée un nouveau
+        event.listen(engine.pool, "checkout", lambda *_, engine=engine: monitor.on_checkout(engine.pool))
+
+    app.after_request(_after_request)
+
+    @app.errorhandler(PoolTimeout)
+    def pool_exhausted(error):
+        monitor.on_timeout(db.engine.pool)
+        if request.accept_mimetypes.best == "application/json":
+            return {"error": "database busy"}, 503, {"Retry-After": "5"}
+        return "Service momentanément indisponible, réessayez dans un instant.", 503, {"Retry-After": "5"}
+
+
+def pool_stats() -> Dict[str, Any]:
+    from models import db
+
+    return current_app.extensions["db_pool_monitor"].stats(db.engine.pool)
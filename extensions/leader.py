@@ -0,0 +1,97 @@
+"""
+Élection d'un leader entre processus (workers Gunicorn, conteneurs…) pour
+qu'une tâche planifiée ne tourne qu'une fois par déploiement.
+
+    • ``FileLeaderLock``  : ``flock`` non bloquant, tenu à vie par le processus
+      (tous les workers sur le même hôte / volume) ;
+    • ``MongoLeaderLease``: bail dans une collection Mongo, renouvelé
+      périodiquement et repris par un autre processus s'il expire
+      (plusieurs hôtes).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Optional
+import os
+import socket
+import uuid
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+
+def _owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class FileLeaderLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+
+    def acquire(self) -> bool:
+        import fcntl  # POSIX uniquement
+
+        if self._fh is not None:
+            return True
+        fh = open(self.path, "a+")
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        self._fh = fh
+        return True
+
+    def renew(self) -> bool:
+        return self._fh is not None
+
+    def release(self) -> None:
+        if self._fh is not None:
+            self._fh.close()  # libère le flock
+            self._fh = None
+
+
+class MongoLeaderLease:
+    def __init__(self, collection, name: str, ttl_seconds: int = 120):
+        self.collection = collection
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.owner = _owner_id()
+
+    def acquire(self) -> bool:
+        """Prend le bail s'il est libre/expiré, ou le prolonge s'il est à nous."""
+        now = datetime.utcnow()
+        try:
+            doc = self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"expires_at": {"$lt": now}}, {"owner": self.owner}]},
+                {"$set": {"owner": self.owner, "expires_at": now + self.ttl}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # Le document existe et appartient à un autre processus encore vivant
+            return False
+        except PyMongoError:
+            return False
+        return bool(doc) and doc.get("owner") == self.owner
+
+    renew = acquire
+
+    def release(self) -> None:
+        try:
+            self.collection.delete_one({"_id": self.name, "owner": self.owner})
+        except PyMongoError:
+            pass
+
+
+def build_leader_lock(kind: str, mongo_db=None, path: Optional[str] = None, name: str = "scheduler"):
+    """``kind`` : ``mongo`` | ``file`` | ``none``."""
+    if kind == "none":
+        return None
+    if kind == "file":
+        return FileLeaderLock(path or "instance/scheduler.lock")
+    if kind == "mongo":
+        return MongoLeaderLease(mongo_db["scheduler_locks"], name)
+    raise ValueError(f"Verrou de leader inconnu : {kind}")
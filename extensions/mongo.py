@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, TYPE_CHECKING
+import atexit
+import logging
 import os
+import threading
 
 from flask import current_app, request
 from pymongo import MongoClient, DESCENDING
@@ -8,17 +11,24 @@ from pymongo.errors import PyMongoError
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.schedulers.base import STATE_RUNNING
 
+from .leader import build_leader_lock
+from .mongo_writer import BatchWriter, DROP_OLDEST, SPILL
+
+logger = logging.getLogger(__name__)
+
 
 class MongoLogger:
     """
     Gestion centralisée de MongoDB :
-      • connexion unique (singleton)
-      • purge automatique des logs
+      • un client par processus, créé à la première utilisation (après le
+        fork des workers Gunicorn) et fermé uniquement à la sortie du processus
+      • écriture asynchrone par lots (``BatchWriter``)
+      • purge automatique des logs, par un seul processus élu (verrou
+        Mongo ou fichier)
       • indexation
     """
 
     _instance: "MongoLogger | None" = None
-    _scheduler: BackgroundScheduler | None = None
 
     # ------------------------------------------------------------------ #
     # Singleton
@@ -26,48 +36,156 @@ class MongoLogger:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._init_connection()
-            cls._instance._init_scheduler()
+            cls._instance._configure()
         return cls._instance
 
     # ------------------------------------------------------------------ #
-    # Initialisation
+    # Initialisation (aucune connexion ni thread ici : fork-safe)
     # ------------------------------------------------------------------ #
-    def _init_connection(self):
-        uri = os.getenv("MONGODB_URI")
-        if not uri:
+    def _configure(self):
+        self.uri = os.getenv("MONGODB_URI")
+        if not self.uri:
             raise ValueError("⚠️  MONGODB_URI manquant dans l'environnement")
 
-        try:
-            self.client = MongoClient(
-                uri,
-                connectTimeoutMS=3_000,
-                socketTimeoutMS=5_000,
-                serverSelectionTimeoutMS=5_000,
-            )
-            self.db = self.client[os.getenv("MONGODB_DB", "library_analytics")]
-            self._ensure_indexes()
-        except PyMongoError as e:
-            print(f"[MongoLogger] Connexion impossible → {e}")
-            raise
-
-    def _init_scheduler(self):
-        if self._scheduler is None:
-            self._scheduler = BackgroundScheduler()
-            self._scheduler.add_job(
-                self.purge_old_data,
-                trigger="cron",
-                day="*",
-                hour=3,
-                timezone="UTC",
-                id="purge_old_logs",
+        self.db_name = os.getenv("MONGODB_DB", "library_analytics")
+        self.client_options = dict(
+            connectTimeoutMS=int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "3000")),
+            socketTimeoutMS=int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "5000")),
+            serverSelectionTimeoutMS=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+            maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "10")),
+            minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+            maxIdleTimeMS=int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000")),
+            waitQueueTimeoutMS=int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+        )
+        self.scheduler_lock_kind = os.getenv("MONGO_SCHEDULER_LOCK", "mongo")
+        self.scheduler_lock_path = os.getenv("MONGO_SCHEDULER_LOCK_PATH", "instance/mongo_scheduler.lock")
+        self.election_interval = int(os.getenv("MONGO_SCHEDULER_ELECTION_INTERVAL", "60"))
+
+        self._pid: Optional[int] = None
+        self._client: Optional[MongoClient] = None
+        self._scheduler: Optional[BackgroundScheduler] = None
+        self._leader_lock = None
+        self._process_lock = threading.Lock()
+
+        overflow = os.getenv("MONGO_LOG_OVERFLOW", DROP_OLDEST)
+        self.writer = BatchWriter(
+            lambda: self.db,
+            max_queue=int(os.getenv("MONGO_LOG_QUEUE_SIZE", "10000")),
+            batch_size=int(os.getenv("MONGO_LOG_BATCH_SIZE", "500")),
+            flush_interval=float(os.getenv("MONGO_LOG_FLUSH_INTERVAL", "1.0")),
+            overflow=overflow,
+            spill_path=os.getenv("MONGO_LOG_SPILL_PATH", "instance/mongo_log_spill.jsonl") if overflow == SPILL else None,
+        )
+
+    # ------------------------------------------------------------------ #
+    # Ressources par processus
+    # ------------------------------------------------------------------ #
+    @property
+    def client(self) -> MongoClient:
+        if self._pid != os.getpid():
+            self._start_process()
+        return self._client
+
+    @property
+    def db(self):
+        return self.client[self.db_name]
+
+    def _start_process(self):
+        with self._process_lock:
+            if self._pid == os.getpid():
+                return
+            # Hérités du parent (fork) : on les abandonne sans les fermer,
+            # ils appartiennent toujours au processus maître.
+            self._pid = os.getpid()
+            self._client = None
+            self._scheduler = None
+            self._leader_lock = None
+
+            try:
+                self._client = MongoClient(self.uri, **self.client_options)
+            except PyMongoError as e:
+                self._pid = None
+                print(f"[MongoLogger] Connexion impossible → {e}")
+                raise
+            try:
+                self._ensure_indexes()
+            except PyMongoError as e:
+                logger.warning(f"[MongoLogger] Création des index KO : {e}")
+            # Fermeture uniquement à la sortie du processus
+            atexit.register(self.close)
+        self._elect_scheduler()
+
+    def reset_after_fork(self):
+        """Hook post-fork (Gunicorn) : force un nouveau client au prochain accès."""
+        self._pid = None
+
+    # ------------------------------------------------------------------ #
+    # Planificateur : un seul processus élu par déploiement
+    # ------------------------------------------------------------------ #
+    def _elect_scheduler(self):
+        if self.scheduler_lock_kind == "none" or self._scheduler is not None:
+            return
+        if self._leader_lock is None:
+            self._leader_lock = build_leader_lock(
+                self.scheduler_lock_kind,
+                mongo_db=self._client[self.db_name],
+                path=self.scheduler_lock_path,
+                name="purge_old_logs",
             )
-            self._scheduler.start()
+        if self._leader_lock.acquire():
+            self._start_scheduler()
+        else:
+            # Suiveur : on retente plus tard, au cas où le leader disparaîtrait
+            timer = threading.Timer(self.election_interval, self._elect_scheduler)
+            timer.daemon = True
+            timer.start()
+
+    def _start_scheduler(self):
+        scheduler = BackgroundScheduler()
+        scheduler.add_job(
+            self._run_purge_if_leader,
+            trigger="cron",
+            day="*",
+            hour=3,
+            timezone="UTC",
+            id="purge_old_logs",
+        )
+        scheduler.add_job(
+            self._renew_leadership,
+            trigger="interval",
+            seconds=max(self.election_interval // 2, 1),
+            id="renew_scheduler_lease",
+        )
+        scheduler.start()
+        self._scheduler = scheduler
+        logger.info(f"[MongoLogger] planificateur de purge démarré (pid {os.getpid()})")
+
+    def _renew_leadership(self):
+        if not self._leader_lock.renew():
+            logger.warning("[MongoLogger] bail de leader perdu → arrêt du planificateur")
+            self._stop_scheduler(wait=False)
+            self._elect_scheduler()
+
+    def _run_purge_if_leader(self):
+        if self._leader_lock.renew():
+            self.purge_old_data()
+
+    def _stop_scheduler(self, wait: bool = True):
+        scheduler, self._scheduler = self._scheduler, None
+        if scheduler and scheduler.state == STATE_RUNNING:
+            try:
+                scheduler.shutdown(wait=wait)
+            except Exception as e:
+                logger.warning(f"[MongoLogger] shutdown fail: {e}")
 
     def _ensure_indexes(self):
         self.db.users_loggings.create_index(
             [("user_id", DESCENDING), ("timestamp", DESCENDING)]
         )
+        # Pipelines d'analytique (services/log_analytics.py)
+        self.db.users_loggings.create_index(
+            [("event_type", DESCENDING), ("timestamp", DESCENDING)]
+        )
         self.db.user_actions.create_index(
             [("event_type", DESCENDING), ("timestamp", DESCENDING)]
         )
@@ -86,37 +204,36 @@ class MongoLogger:
         event_type: str,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> bool:
-        try:
-            doc = {
-                "user_id": user_id,
-                "email": self._sanitize_email(email),
-                "event_type": event_type,
-                "timestamp": datetime.utcnow(),
-                "http_metadata": {
-                    "ip": self._get_client_ip(),
-                    "method": request.method,
-                    "path": request.path,
-                    "user_agent": self._sanitize_user_agent(request.user_agent.string),
-                },
-            }
-            if metadata:
-                doc["details"] = metadata
-            self.db[collection].insert_one(doc)
-            return True
-        except PyMongoError as e:
-            current_app.logger.warning(f"[MongoLogger] Échec log_event : {e}")
-            return False
+        """Construit le document dans la requête, l'écriture se fait en tâche de fond."""
+        doc = {
+            "user_id": user_id,
+            "email": self._sanitize_email(email),
+            "event_type": event_type,
+            "timestamp": datetime.utcnow(),
+            "http_metadata": {
+                "ip": self._get_client_ip(),
+                "method": request.method,
+                "path": request.path,
+                "user_agent": self._sanitize_user_agent(request.user_agent.string),
+            },
+        }
+        if metadata:
+            doc["details"] = metadata
+        return self.writer.enqueue(collection, doc)
+
+    def stats(self) -> Dict[str, int]:
+        return self.writer.stats()
 
     def purge_old_data(self, retention_days: int = 90):
         cutoff = datetime.utcnow() - timedelta(days=retention_days)
         try:
             r1 = self.db.users_loggings.delete_many({"timestamp": {"$lt": cutoff}})
             r2 = self.db.user_actions.delete_many({"timestamp": {"$lt": cutoff}})
-            current_app.logger.info(
+            logger.info(
                 f"Purge auto : {r1.deleted_count} logins + {r2.deleted_count} actions."
             )
         except PyMongoError as e:
-            current_app.logger.error(f"[MongoLogger] Purge KO : {e}")
+            logger.error(f"[MongoLogger] Purge KO : {e}")
 
     # ------------------------------------------------------------------ #
     # Helpers internes
@@ -137,16 +254,15 @@ class MongoLogger:
     # Fermeture
     # ------------------------------------------------------------------ #
     def close(self):
-        if hasattr(self, "client"):
-            self.client.close()
-        if (
-            self._scheduler
-            and self._scheduler.state == STATE_RUNNING
-        ):
-            try:
-                self._scheduler.shutdown()
-            except Exception as e:
-                current_app.logger.warning(f"[MongoLogger] shutdown fail: {e}")
+        """Sortie du processus : vide la file, libère le bail, ferme le client."""
+        if self._pid != os.getpid():
+            return
+        self.writer.close()
+        self._stop_scheduler()
+        if self._leader_lock is not None:
+            self._leader_lock.release()
+        if self._client is not None:
+            self._client.close()
 
 
 # ---------------------------------------------------------------------- #
@@ -154,12 +270,9 @@ class MongoLogger:
 # ---------------------------------------------------------------------- #
 def init_mongo(app):
     """À appeler depuis app.py (ou la factory) après avoir créé *app*."""
-    logger = MongoLogger()
-    app.extensions["mongo_logger"] = logger
-
-    @app.teardown_appcontext
-    def _shutdown_mongo(exc=None):
-        logger.close()
+    app.extensions["mongo_logger"] = MongoLogger()
+    # Pas de fermeture en fin de requête ni de connexion ici : le client est
+    # créé au premier usage dans chaque worker et fermé à la sortie (atexit).
 
 
 # ---------------------------------------------------------------------- #
@@ -0,0 +1,225 @@
+"""
+Pipeline d'écriture asynchrone pour les logs Mongo.
+
+    requête HTTP ──enqueue()──▶ file bornée ──thread──▶ insert_many(ordered=False)
+
+    • vidage par taille (``batch_size``) ou par délai (``flush_interval``) ;
+    • débordement configurable : ``drop_oldest`` ou ``spill`` (fichier
+      JSON-lines en ajout seul, rejoué dès que Mongo répond à nouveau) ;
+    • fichier de débordement commun aux workers Gunicorn : ajout et reprise
+      sous ``flock`` (``<fichier>.lock``). La reprise renomme le fichier
+      avant de le lire : rien n'est perdu ni rejoué deux fois, et les
+      entrées reprises repassent par la file bornée (surplus re-débordé) ;
+    • vidage complet à l'arrêt (``close``) ;
+    • compteurs : queued / flushed / dropped / spilled / failed.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl  # verrou inter-processus (POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from bson import json_util
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+SPILL = "spill"
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        get_database: Callable,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = DROP_OLDEST,
+        spill_path: Optional[str] = None,
+    ):
+        if overflow not in (DROP_OLDEST, SPILL):
+            raise ValueError(f"Politique de débordement inconnue : {overflow}")
+        if overflow == SPILL and not spill_path:
+            raise ValueError("overflow='spill' nécessite spill_path")
+
+        # Fabrique plutôt qu'objet : le client Mongo est propre à chaque processus
+        self.get_database = get_database
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = spill_path
+
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._spill_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = False
+        self._counters = dict(queued=0, flushed=0, dropped=0, spilled=0, failed=0)
+
+    # ------------------------------------------------------------------ #
+    # API
+    # ------------------------------------------------------------------ #
+    def enqueue(self, collection: str, doc: Dict[str, Any]) -> bool:
+        """Non bloquant : jamais d'aller-retour réseau dans la requête."""
+        self._ensure_started()
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                if self.overflow == SPILL:
+                    self._spill([(collection, doc)])
+                    return True
+                self._queue.popleft()
+                self._counters["dropped"] += 1
+            self._queue.append((collection, doc))
+            self._counters["queued"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def flush(self) -> None:
+        """Écrit de façon synchrone tout ce qui est en file (tests, arrêt)."""
+        while True:
+            batch = self._take(self.batch_size)
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._counters, pending=len(self._queue))
+
+    def replay_spill(self) -> int:
+        """Reprend le fichier de débordement ; renvoie le nombre d'entrées lues."""
+        if not self.spill_path:
+            return 0
+        claimed = f"{self.spill_path}.{os.getpid()}.{threading.get_ident()}.replay"
+        with self._spill_locked():
+            # Un seul worker obtient le fichier ; les ajouts suivants en créent un neuf
+            try:
+                os.replace(self.spill_path, claimed)
+            except FileNotFoundError:
+                return 0
+        with open(claimed, "r", encoding="utf-8") as fh:
+            entries = [json_util.loads(line) for line in fh if line.strip()]
+        os.remove(claimed)
+
+        overflow = []
+        with self._cond:
+            for entry in entries:
+                item = (entry["collection"], entry["doc"])
+                if len(self._queue) >= self.max_queue:
+                    overflow.append(item)
+                else:
+                    self._queue.append(item)
+            self._cond.notify()
+        if overflow:
+            self._spill(overflow)
+        return len(entries)
+
+    # ------------------------------------------------------------------ #
+    # Thread d'écriture
+    # ------------------------------------------------------------------ #
+    def _ensure_started(self) -> None:
+        # Après un fork (Gunicorn), le thread du parent n'existe plus
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="mongo-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        self.replay_spill()
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._stopping and len(self._queue) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                stopping = self._stopping
+            batch = self._take(self.batch_size)
+            if batch and self._write(batch) and self.spill_path:
+                self.replay_spill()
+            if stopping:
+                return
+
+    def _take(self, limit: int) -> list:
+        with self._cond:
+            batch = []
+            while self._queue and len(batch) < limit:
+                batch.append(self._queue.popleft())
+            return batch
+
+    def _write(self, batch: list) -> bool:
+        by_collection: Dict[str, list] = {}
+        for collection, doc in batch:
+            by_collection.setdefault(collection, []).append(doc)
+
+        ok = True
+        for collection, docs in by_collection.items():
+            try:
+                self.get_database()[collection].insert_many(docs, ordered=False)
+                written = len(docs)
+            except BulkWriteError as e:
+                # ordered=False : les documents valides sont quand même écrits
+                written = e.details.get("nInserted", 0)
+                self._count("failed", len(docs) - written)
+            except PyMongoError as e:
+                logger.warning(f"[MongoLogger] insert_many KO ({collection}) : {e}")
+                written, ok = 0, False
+                if self.overflow == SPILL:
+                    self._spill([(collection, d) for d in docs])
+                else:
+                    self._count("failed", len(docs))
+            self._count("flushed", written)
+        return ok
+
+    def _spill(self, entries: list) -> None:
+        with self._spill_locked():
+            with open(self.spill_path, "a", encoding="utf-8") as fh:
+                for collection, doc in entries:
+                    fh.write(json_util.dumps({"collection": collection, "doc": doc}) + "\n")
+        self._count("spilled", len(entries))
+
+    @contextmanager
+    def _spill_locked(self):
+        with self._spill_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.spill_path}.lock", "a") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _count(self, name: str, n: int) -> None:
+        if n:
+            with self._cond:
+                self._counters[name] += n
@@ -0,0 +1,157 @@
+"""
+Passerelle unique vers l'API Stripe (``stripe.StripeClient``).
+
+    • un ``requests.Session`` par processus, pool keep-alive borné
+      (``STRIPE_POOL_SIZE``) : plus de poignée TLS à chaque paiement ;
+    • délais explicites connexion / lecture (``STRIPE_CONNECT_TIMEOUT`` /
+      ``STRIPE_READ_TIMEOUT``) au lieu des 80 s par défaut de la lib, qui
+      bloquaient un worker Gunicorn synchrone ;
+    • retries automatiques avec backoff exponentiel + jitter de la lib
+      (``STRIPE_MAX_RETRIES``), sûrs grâce aux clés d'idempotence ;
+    • latence par appel (calls / errors / avg / max en ms), cf. ``stats()``.
+
+Le client est construit au premier appel et reconstruit après un fork ; la
+lib ``stripe`` (~1 s d'import) n'est chargée qu'à ce moment-là. Plus aucune
+affectation globale ``stripe.api_key`` dans l'application.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+import os
+import time
+
+from flask import current_app
+
+if TYPE_CHECKING:
+    import stripe
+
+
+class LatencyStats:
+    """Compteurs de latence par opération, partagés entre threads."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._ops: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation: str, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            op = self._ops.setdefault(operation, dict(calls=0, errors=0, total_ms=0.0, max_ms=0.0))
+            op["calls"] += 1
+            op["errors"] += 0 if ok else 1
+            op["total_ms"] += elapsed_ms
+            op["max_ms"] = max(op["max_ms"], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: dict(
+                    calls=int(op["calls"]),
+                    errors=int(op["errors"]),
+                    avg_ms=round(op["total_ms"] / op["calls"], 1),
+                    max_ms=round(op["max_ms"], 1),
+                )
+                for name, op in self._ops.items()
+            }
+
+
+class StripeGateway:
+    def __init__(
+        self,
+        api_key: Optional[str],
+        timeout: Tuple[float, float] = (3.0, 10.0),
+        max_retries: int = 2,
+        pool_size: int = 10,
+        base_url: Optional[str] = None,
+    ):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.base_url = base_url
+        self.metrics = LatencyStats()
+        self._client: Optional[stripe.StripeClient] = None
+        self._pid: Optional[int] = None
+        self._lock = Lock()
+
+    # ------------------------------------------------------------------ #
+    # Client (lazy, propre à chaque processus)
+    # ------------------------------------------------------------------ #
+    @property
+    def client(self) -> stripe.StripeClient:
+        if self._client is None or self._pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._pid != os.getpid():
+                    self._client = self._build_client()
+                    self._pid = os.getpid()
+        return self._client
+
+    def _build_client(self) -> stripe.StripeClient:
+        import requests
+        import stripe
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # Les retries sont faits par la lib Stripe (backoff + Stripe-Should-Retry)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        options: Dict[str, Any] = {}
+        if self.base_url:
+            options["base_addresses"] = {"api": self.base_url}
+        return stripe.StripeClient(
+            self.api_key,
+            http_client=stripe.RequestsClient(timeout=self.timeout, session=session),
+            max_network_retries=self.max_retries,
+            **options,
+        )
+
+    @contextmanager
+    def _timed(self, operation: str):
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.metrics.record(operation, (time.perf_counter() - start) * 1000, ok)
+
+    # ------------------------------------------------------------------ #
+    # API
+    # ------------------------------------------------------------------ #
+    def create_session(self, params: Dict[str, Any], idempotency_key: str):
+        """Crée une session Checkout (cf. services.payments)."""
+        with self._timed("checkout.sessions.create"):
+            return self.client.checkout.sessions.create(
+                params=params, options={"idempotency_key": idempotency_key}
+            )
+
+    def retrieve_session(self, session_id: str):
+        with self._timed("checkout.sessions.retrieve"):
+            return self.client.checkout.sessions.retrieve(session_id)
+
+    @staticmethod
+    def construct_event(payload: bytes, signature: str, secret: str, tolerance: int = 300):
+        """Vérification locale de la signature (aucun appel réseau)."""
+        import stripe
+
+        return stripe.Webhook.construct_event(payload, signature, secret, tolerance=tolerance)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return self.metrics.snapshot()
+
+
+def init_stripe(app) -> None:
+    app.extensions["stripe_gateway"] = StripeGateway(
+        app.config.get("STRIPE_SECRET_KEY"),
+        timeout=(app.config["STRIPE_CONNECT_TIMEOUT"], app.config["STRIPE_READ_TIMEOUT"]),
+        max_retries=app.config["STRIPE_MAX_RETRIES"],
+        pool_size=app.config["STRIPE_POOL_SIZE"],
+    )
+
+
+def get_stripe() -> StripeGateway:
+    return current_app.extensions["stripe_gateway"]
@@ -0,0 +1,89 @@
+"""
+Configuration Gunicorn (production).
+
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+
+Tout se règle par variables d'environnement (cf. ``.env.example``) :
+
+    • ``GUNICORN_WORKER_CLASS`` : ``gthread`` (défaut), ``sync`` ou ``gevent``.
+      Avec ``sync``, un appel Stripe lent immobilise un worker entier ;
+      ``gthread`` garde ``GUNICORN_THREADS`` requêtes en vol par processus ;
+      ``gevent`` (paquet optionnel, non installé par défaut) pour beaucoup
+      d'attentes réseau concurrentes ;
+    • ``GUNICORN_WORKERS`` : défaut dérivé du nombre de CPU ;
+    • ``GUNICORN_PRELOAD`` : l'application est importée une fois dans le
+      maître puis partagée (copy-on-write) ; ``post_fork`` remet à zéro le
+      pool SQLAlchemy et le client Mongo hérités ;
+    • ``GUNICORN_MAX_REQUESTS`` (+ jitter) : recyclage étalé des workers.
+
+Mesures comparatives : ``scripts/loadtest.py``.
+"""
+
+import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
+
+
+# ---------------------------------------------------------------------- #
+#  Modèle de worker
+# ---------------------------------------------------------------------- #
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class not in ("sync", "gthread", "gevent"):
+    raise ValueError(f"GUNICORN_WORKER_CLASS inconnu : {worker_class}")
+
+if worker_class == "sync":
+    workers = _env_int("GUNICORN_WORKERS", 2 * _cpus + 1)
+elif worker_class == "gthread":
+    workers = _env_int("GUNICORN_WORKERS", _cpus + 1)
+    threads = _env_int("GUNICORN_THREADS", 4)
+else:
+    workers = _env_int("GUNICORN_WORKERS", _cpus)
+    worker_connections = _env_int("GUNICORN_WORKER_CONNECTIONS", 1000)
+
+# gevent patche la stdlib au démarrage du worker : les modules importés avant
+# (préchargement dans le maître) garderaient des sockets bloquantes.
+preload_app = os.getenv("GUNICORN_PRELOAD", "false" if worker_class == "gevent" else "true").lower() == "true"
+
+# ---------------------------------------------------------------------- #
+#  Réseau et délais
+# ---------------------------------------------------------------------- #
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+backlog = _env_int("GUNICORN_BACKLOG", 2048)
+# Au-dessus de STRIPE_READ_TIMEOUT × (1 + STRIPE_MAX_RETRIES)
+timeout = _env_int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+# Derrière un répartiteur, à régler au-dessus de son délai d'inactivité
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# ---------------------------------------------------------------------- #
+#  Recyclage des workers (fuites mémoire lentes), étalé dans le temps
+# ---------------------------------------------------------------------- #
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+
+# Battement de cœur des workers en RAM (évite les blocages sur overlay Docker)
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None  # vide = désactivé
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+proc_name = "la-plume"
+
+
+# ---------------------------------------------------------------------- #
+#  Hooks
+# ---------------------------------------------------------------------- #
+def post_fork(server, worker):
+    # Sans préchargement, rien n'a été hérité du maître
+    if not server.cfg.preload_app:
+        return
+    from app import reset_after_fork
+
+    reset_after_fork(server.app.wsgi())
+    server.log.debug("Worker %s : pools hérités réinitialisés", worker.pid)
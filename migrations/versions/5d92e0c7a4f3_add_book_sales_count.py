@@ -0,0 +1,39 @@
+"""add book sales count
+
+Revision ID: 5d92e0c7a4f3
+Revises: c3f58a1b6e27
+Create Date: 2026-10-18 11:21:30.557812
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d92e0c7a4f3'
+down_revision = 'c3f58a1b6e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sales_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index('ix_book_category_sales_id', ['category_id', 'sales_count', 'book_id'], unique=False)
+        batch_op.create_index('ix_book_sales_id', ['sales_count', 'book_id'], unique=False)
+
+    # Historique : exemplaires vendus sur les commandes déjà payées
+    op.execute(
+        'UPDATE "Book" SET sales_count = COALESCE(('
+        '  SELECT SUM(od.quantity) FROM order_details od'
+        '  JOIN "Orders" o ON o.order_id = od.order_id'
+        "  WHERE od.book_id = \"Book\".book_id AND o.payment_status = 'paid'"
+        '), 0)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_sales_id')
+        batch_op.drop_index('ix_book_category_sales_id')
+        batch_op.drop_column('sales_count')
@@ -0,0 +1,26 @@
+"""add orders history index
+
+Revision ID: 6a2d8e5f1b37
+Revises: 9e1b7f4c2d85
+Create Date: 2026-10-18 14:02:51.730462
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a2d8e5f1b37'
+down_revision = '9e1b7f4c2d85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_user_status_date_id', ['user_id', 'payment_status', 'order_date', 'order_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('Orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_status_date_id')
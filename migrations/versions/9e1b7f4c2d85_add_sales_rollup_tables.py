@@ -0,0 +1,48 @@
+"""add sales rollup tables
+
+Revision ID: 9e1b7f4c2d85
+Revises: 5d92e0c7a4f3
+Create Date: 2026-10-18 12:40:12.913274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e1b7f4c2d85'
+down_revision = '5d92e0c7a4f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'book_sales_stats',
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('units_sold', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('revenue', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('last_sold_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['book_id'], ['Book.book_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('book_id'),
+    )
+    op.create_index('ix_book_sales_stats_units_id', 'book_sales_stats', ['units_sold', 'book_id'], unique=False)
+
+    op.create_table(
+        'category_daily_revenue',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('units_sold', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('revenue', sa.Float(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['category_id'], ['Category.category_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category_id', 'day'),
+    )
+    op.create_index('ix_category_daily_revenue_day', 'category_daily_revenue', ['day'], unique=False)
+    # Remplissage : lancer `flask sales backfill` après la migration
+
+
+def downgrade():
+    op.drop_index('ix_category_daily_revenue_day', table_name='category_daily_revenue')
+    op.drop_table('category_daily_revenue')
+    op.drop_index('ix_book_sales_stats_units_id', table_name='book_sales_stats')
+    op.drop_table('book_sales_stats')
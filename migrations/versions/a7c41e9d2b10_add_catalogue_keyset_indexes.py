@@ -0,0 +1,32 @@
+"""add catalogue keyset indexes
+
+Revision ID: a7c41e9d2b10
+Revises: ef30efc16c05
+Create Date: 2026-10-18 09:12:04.418211
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c41e9d2b10'
+down_revision = 'ef30efc16c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.create_index('ix_book_category_price_pubdate_id', ['category_id', 'book_price', 'publication_date', 'book_id'], unique=False)
+        batch_op.create_index('ix_book_category_pubdate_id', ['category_id', 'publication_date', 'book_id'], unique=False)
+        batch_op.create_index('ix_book_price_id', ['book_price', 'book_id'], unique=False)
+        batch_op.create_index('ix_book_pubdate_id', ['publication_date', 'book_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_pubdate_id')
+        batch_op.drop_index('ix_book_price_id')
+        batch_op.drop_index('ix_book_category_pubdate_id')
+        batch_op.drop_index('ix_book_category_price_pubdate_id')
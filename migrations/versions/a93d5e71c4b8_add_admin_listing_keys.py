@@ -0,0 +1,78 @@
+"""add admin listing keys
+
+Revision ID: a93d5e71c4b8
+Revises: f2b86d0c5a19
+Create Date: 2026-10-18 20:26:13.480517
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a93d5e71c4b8'
+down_revision = 'f2b86d0c5a19'
+branch_labels = None
+depends_on = None
+
+# Copie figée de services.admin_listing.name_key (et de la normalisation de
+# services.search) au moment de cette migration.
+_ELISION = re.compile(r"\b(?:l|d|j|m|n|s|t|c|qu|jusqu|lorsqu|puisqu)['’]")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "ß": "ss"})
+
+
+def name_key(*parts, length=200):
+    text = " ".join(p or "" for p in parts).lower().translate(_LIGATURES)
+    text = _ELISION.sub(" ", text)
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_TOKEN.findall(folded))[:length]
+
+
+def upgrade():
+    with op.batch_alter_table('Author', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('author_name_key', sa.String(length=201), nullable=True))
+        batch_op.create_index('ix_author_name_key_id', ['author_name_key', 'author_id'], unique=False)
+    with op.batch_alter_table('Category', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('category_name_key', sa.String(length=100), nullable=True))
+        batch_op.create_index('ix_category_name_key_id', ['category_name_key', 'category_id'], unique=False)
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.create_index('ix_book_title_id', ['book_title', 'book_id'], unique=False)
+
+    # Remplissage des lignes existantes (normalisation faite côté Python)
+    bind = op.get_bind()
+    authors = bind.execute(sa.text('SELECT author_id, author_firstname, author_lastname FROM "Author"')).fetchall()
+    if authors:
+        bind.execute(
+            sa.text('UPDATE "Author" SET author_name_key = :key WHERE author_id = :id'),
+            [{'id': r.author_id, 'key': name_key(r.author_lastname, r.author_firstname)} for r in authors],
+        )
+    categories = bind.execute(sa.text('SELECT category_id, category_name FROM "Category"')).fetchall()
+    if categories:
+        bind.execute(
+            sa.text('UPDATE "Category" SET category_name_key = :key WHERE category_id = :id'),
+            [{'id': r.category_id, 'key': name_key(r.category_name, length=100)} for r in categories],
+        )
+
+    # LIKE 'préfixe%' indexé quelle que soit la collation : PostgreSQL uniquement
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE INDEX ix_author_name_key_prefix ON "Author" (author_name_key varchar_pattern_ops)')
+        op.execute('CREATE INDEX ix_category_name_key_prefix ON "Category" (category_name_key varchar_pattern_ops)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_category_name_key_prefix')
+        op.execute('DROP INDEX IF EXISTS ix_author_name_key_prefix')
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_title_id')
+    with op.batch_alter_table('Category', schema=None) as batch_op:
+        batch_op.drop_index('ix_category_name_key_id')
+        batch_op.drop_column('category_name_key')
+    with op.batch_alter_table('Author', schema=None) as batch_op:
+        batch_op.drop_index('ix_author_name_key_id')
+        batch_op.drop_column('author_name_key')
@@ -0,0 +1,26 @@
+"""add processed_events.session_id
+
+Revision ID: b5e0d82c7f31
+Revises: a93d5e71c4b8
+Create Date: 2026-10-19 09:12:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e0d82c7f31'
+down_revision = 'a93d5e71c4b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('processed_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('session_id', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('processed_events', schema=None) as batch_op:
+        batch_op.drop_column('session_id')
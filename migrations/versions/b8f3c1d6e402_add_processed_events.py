@@ -0,0 +1,37 @@
+"""add processed_events
+
+Revision ID: b8f3c1d6e402
+Revises: 6a2d8e5f1b37
+Create Date: 2026-10-18 15:21:37.094118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8f3c1d6e402'
+down_revision = '6a2d8e5f1b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'processed_events',
+        sa.Column('event_id', sa.String(length=255), nullable=False),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=True),
+        sa.Column('target_status', sa.String(length=20), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('error', sa.String(length=255), nullable=True),
+        sa.Column('received_at', sa.DateTime(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('event_id'),
+    )
+    op.create_index('ix_processed_events_status_received', 'processed_events', ['status', 'received_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_processed_events_status_received', table_name='processed_events')
+    op.drop_table('processed_events')
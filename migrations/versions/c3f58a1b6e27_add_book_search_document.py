@@ -0,0 +1,67 @@
+"""add book search document
+
+Revision ID: c3f58a1b6e27
+Revises: a7c41e9d2b10
+Create Date: 2026-10-18 10:03:47.102934
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f58a1b6e27'
+down_revision = 'a7c41e9d2b10'
+branch_labels = None
+depends_on = None
+
+# Copie figée de la normalisation de services.search au moment de cette
+# migration : une évolution ultérieure du code ne doit pas changer son effet.
+_ELISION = re.compile(r"\b(?:l|d|j|m|n|s|t|c|qu|jusqu|lorsqu|puisqu)['’]")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "ß": "ss"})
+
+
+def build_document(title, firstname='', lastname=''):
+    text = f"{title} {firstname} {lastname}".lower().translate(_LIGATURES)
+    text = _ELISION.sub(" ", text)
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_TOKEN.findall(folded))
+
+
+def upgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_document', sa.Text(), nullable=True))
+
+    # Remplissage des livres existants (normalisation faite côté Python)
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        'SELECT b.book_id, b.book_title, a.author_firstname, a.author_lastname '
+        'FROM "Book" b LEFT JOIN "Author" a ON a.author_id = b.author_id'
+    )).fetchall()
+    if rows:
+        bind.execute(
+            sa.text('UPDATE "Book" SET search_document = :doc WHERE book_id = :book_id'),
+            [
+                {'book_id': r.book_id, 'doc': build_document(r.book_title, r.author_firstname or '', r.author_lastname or '')}
+                for r in rows
+            ],
+        )
+
+    # Index plein texte : PostgreSQL uniquement (SQLite → index en mémoire)
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            'CREATE INDEX ix_book_search_document_fts ON "Book" '
+            "USING gin (to_tsvector('simple', coalesce(search_document, '')))"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_book_search_document_fts')
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.drop_column('search_document')
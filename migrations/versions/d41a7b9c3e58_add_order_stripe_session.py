@@ -0,0 +1,30 @@
+"""add order stripe session
+
+Revision ID: d41a7b9c3e58
+Revises: b8f3c1d6e402
+Create Date: 2026-10-18 15:58:09.552714
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41a7b9c3e58'
+down_revision = 'b8f3c1d6e402'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Orders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('stripe_session_id', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('stripe_session_url', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('stripe_session_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('Orders', schema=None) as batch_op:
+        batch_op.drop_column('stripe_session_expires_at')
+        batch_op.drop_column('stripe_session_url')
+        batch_op.drop_column('stripe_session_id')
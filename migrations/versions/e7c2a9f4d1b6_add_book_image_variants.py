@@ -0,0 +1,26 @@
+"""add book image variants
+
+Revision ID: e7c2a9f4d1b6
+Revises: d41a7b9c3e58
+Create Date: 2026-10-18 17:42:31.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c2a9f4d1b6'
+down_revision = 'd41a7b9c3e58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('book_image_variants', sa.JSON(none_as_null=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.drop_column('book_image_variants')
@@ -0,0 +1,28 @@
+"""add book updated_at
+
+Revision ID: f2b86d0c5a19
+Revises: e7c2a9f4d1b6
+Create Date: 2026-10-18 19:08:44.615302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b86d0c5a19'
+down_revision = 'e7c2a9f4d1b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Les livres existants prennent la date de la migration
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=False,
+                                      server_default=sa.text('CURRENT_TIMESTAMP')))
+
+
+def downgrade():
+    with op.batch_alter_table('Book', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -9,3 +9,5 @@ from .author_model import Author
 from .cart_items_model import CartItem
 from .order_model import Order
 from .order_details_model import OrderDetail
+from .sales_stats_model import BookSalesStats, CategoryDailyRevenue
+from .processed_event_model import ProcessedEvent
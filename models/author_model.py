@@ -3,10 +3,16 @@ from datetime import datetime
 
 class Author(db.Model):
     __tablename__ = 'Author'  # Nom exact de la table
+    # Liste admin triée par nom (pagination par clé) ; préfixe : cf. migration
+    __table_args__ = (
+        db.Index('ix_author_name_key_id', 'author_name_key', 'author_id'),
+    )
     author_id = db.Column(db.Integer, primary_key=True)
     author_firstname = db.Column(db.String(100), nullable=False)
     author_lastname = db.Column(db.String(100), nullable=False)
     author_birthday = db.Column(db.Date, nullable=False, default=datetime.utcnow)
+    # « nom prénom » normalisé (cf. services.admin_listing.index_author)
+    author_name_key = db.Column(db.String(201), nullable=True)
 
     def __repr__(self):
         return f"<Author {self.author_firstname} {self.author_lastname}>"
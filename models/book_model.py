@@ -1,10 +1,23 @@
 # models/book_model.py
+from datetime import datetime
+
 from .import db
 from .author_model import Author
 from .category_model import Category
 
 class Book(db.Model):
     __tablename__ = 'Book'
+    # Index composites pour la pagination par clé de la galerie (… , book_id)
+    __table_args__ = (
+        db.Index('ix_book_category_price_pubdate_id', 'category_id', 'book_price', 'publication_date', 'book_id'),
+        db.Index('ix_book_category_pubdate_id', 'category_id', 'publication_date', 'book_id'),
+        db.Index('ix_book_price_id', 'book_price', 'book_id'),
+        db.Index('ix_book_pubdate_id', 'publication_date', 'book_id'),
+        db.Index('ix_book_category_sales_id', 'category_id', 'sales_count', 'book_id'),
+        db.Index('ix_book_sales_id', 'sales_count', 'book_id'),
+        # Liste admin triée par titre
+        db.Index('ix_book_title_id', 'book_title', 'book_id'),
+    )
     book_id = db.Column(db.Integer, primary_key=True)
     book_title = db.Column(db.String(255), nullable=False)
     publication_date = db.Column(db.Date, nullable=False)
@@ -12,6 +25,15 @@ class Book(db.Model):
     author_id = db.Column(db.Integer, db.ForeignKey('Author.author_id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('Category.category_id'), nullable=False)
     book_image_url = db.Column(db.String, nullable=True)
+    # Variantes WebP / JPEG de la couverture (cf. services.covers)
+    book_image_variants = db.Column(db.JSON(none_as_null=True), nullable=True)
+    # Titre + auteur normalisés (cf. services.search) ; index GIN sous PostgreSQL
+    search_document = db.Column(db.Text, nullable=True)
+    # Exemplaires vendus (commandes payées), maintenu par services.sales
+    sales_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Dernière modification (UTC) : ETag / Last-Modified de la fiche livre
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                           server_default=db.text('CURRENT_TIMESTAMP'))
 
     # Relations
     author = db.relationship('Author', backref='books')
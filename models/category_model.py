@@ -2,8 +2,13 @@ from .import db
 
 class Category(db.Model):
     __tablename__ = 'Category'  # Nom exact de la table en base de données
+    __table_args__ = (
+        db.Index('ix_category_name_key_id', 'category_name_key', 'category_id'),
+    )
     category_id = db.Column(db.Integer, primary_key=True)
     category_name = db.Column(db.String(100), nullable=False, unique=True)  # Ajout d'unicité pour éviter les doublons
+    # Nom normalisé (cf. services.admin_listing.index_category)
+    category_name_key = db.Column(db.String(100), nullable=True)
 
     def __repr__(self):
         return f"<Category {self.category_name}>"
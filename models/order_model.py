@@ -3,12 +3,20 @@ from datetime import datetime
 
 class Order(db.Model):
     __tablename__ = 'Orders'  # Table avec majuscule
+    # Historique client paginé par clé (cf. services.orders)
+    __table_args__ = (
+        db.Index('ix_orders_user_status_date_id', 'user_id', 'payment_status', 'order_date', 'order_id'),
+    )
 
     order_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('User.user_id'), nullable=False)
     order_date = db.Column(db.DateTime, default=datetime.utcnow)
     total_price = db.Column(db.Float, nullable=False)
     payment_status = db.Column(db.String(20), default='pending')
+    # Session Stripe Checkout réutilisée tant qu'elle est ouverte (cf. services.payments)
+    stripe_session_id = db.Column(db.String(255), nullable=True)
+    stripe_session_url = db.Column(db.Text, nullable=True)
+    stripe_session_expires_at = db.Column(db.DateTime, nullable=True)
 
     # Relation avec User
     user = db.relationship('User', back_populates='orders')
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from . import db
+
+
+class ProcessedEvent(db.Model):
+    """
+    Événement webhook Stripe reçu, clé = id d'événement Stripe.
+
+    Sert à la fois de garde d'idempotence (un retry Stripe ne crée jamais de
+    seconde ligne) et de file durable lue par le worker (cf. services.webhooks).
+    """
+    __tablename__ = 'processed_events'
+    __table_args__ = (
+        db.Index('ix_processed_events_status_received', 'status', 'received_at'),
+    )
+
+    event_id = db.Column(db.String(255), primary_key=True)
+    event_type = db.Column(db.String(100), nullable=False)
+    order_id = db.Column(db.Integer, nullable=True)
+    # Session Checkout concernée : un échec ne vaut que pour la session en cours
+    session_id = db.Column(db.String(255), nullable=True)
+    # Statut de commande visé : 'paid' | 'failed' | NULL (événement ignoré)
+    target_status = db.Column(db.String(20), nullable=True)
+    # 'pending' → 'done' | 'ignored' | 'error'
+    status = db.Column(db.String(20), nullable=False, default='pending', server_default='pending')
+    error = db.Column(db.String(255), nullable=True)
+    received_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ProcessedEvent {self.event_id} {self.event_type} {self.status}>"
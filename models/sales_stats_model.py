@@ -0,0 +1,37 @@
+from . import db
+
+
+class BookSalesStats(db.Model):
+    """Agrégat matérialisé par livre (commandes payées), cf. services.sales."""
+    __tablename__ = 'book_sales_stats'
+    __table_args__ = (
+        db.Index('ix_book_sales_stats_units_id', 'units_sold', 'book_id'),
+    )
+
+    book_id = db.Column(db.Integer, db.ForeignKey('Book.book_id', ondelete='CASCADE'), primary_key=True)
+    units_sold = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    revenue = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    last_sold_at = db.Column(db.DateTime, nullable=True)
+
+    book = db.relationship('Book')
+
+    def __repr__(self):
+        return f"<BookSalesStats book={self.book_id} units={self.units_sold}>"
+
+
+class CategoryDailyRevenue(db.Model):
+    """Chiffre d'affaires payé par catégorie et par jour (date de commande)."""
+    __tablename__ = 'category_daily_revenue'
+    __table_args__ = (
+        db.Index('ix_category_daily_revenue_day', 'day'),
+    )
+
+    category_id = db.Column(db.Integer, db.ForeignKey('Category.category_id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    units_sold = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    revenue = db.Column(db.Float, nullable=False, default=0, server_default='0')
+
+    category = db.relationship('Category')
+
+    def __repr__(self):
+        return f"<CategoryDailyRevenue {self.category_id} {self.day}>"
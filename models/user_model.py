@@ -1,7 +1,7 @@
 from . import db
 from datetime import datetime
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from services.passwords import hash_password, verify_password
 
 class User(db.Model, UserMixin):
     __tablename__ = 'User'
@@ -33,12 +33,12 @@ class User(db.Model, UserMixin):
     def is_anonymous(self):
         return False  # False car nous n'utilisons pas d'utilisateurs anonymes
 
-    # Méthodes pour la gestion du mot de passe
+    # Méthodes pour la gestion du mot de passe (cf. services.passwords)
     def set_password(self, password):
-        self.user_password = generate_password_hash(password)
+        self.user_password = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.user_password, password)
+        return verify_password(self.user_password, password)
 
     def __repr__(self):
         return f"<User {self.user_firstname} {self.user_lastname}>"
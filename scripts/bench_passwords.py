@@ -0,0 +1,75 @@
+"""
+Banc d'essai du hachage des mots de passe.
+
+    python scripts/bench_passwords.py
+    python scripts/bench_passwords.py -m scrypt:32768:8:1 -m pbkdf2:sha256:600000 --seconds 3
+
+Pour chaque méthode : coût d'une vérification, vérifications / s / cœur, et
+débit mesuré avec un pool de N processus (``PASSWORD_VERIFY_WORKERS``).
+Capacité de connexion ≈ débit du pool × nombre de workers Gunicorn par
+hôte, à comparer au pic de connexions attendu.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import check_password_hash, generate_password_hash  # noqa: E402
+
+from services.passwords import DEFAULT_METHOD  # noqa: E402
+
+PASSWORD = "Correct-Horse-Battery-Staple-42"
+
+
+def _verify_for(stored: str, seconds: float) -> int:
+    done, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        check_password_hash(stored, PASSWORD)
+        done += 1
+    return done
+
+
+def bench(method: str, seconds: float, workers: int) -> dict:
+    stored = generate_password_hash(PASSWORD, method)
+
+    start = time.perf_counter()
+    single = _verify_for(stored, seconds)
+    per_core = single / (time.perf_counter() - start)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_verify_for, [stored] * workers, [0.01] * workers))  # démarrage des processus
+        start = time.perf_counter()
+        total = sum(pool.map(_verify_for, [stored] * workers, [seconds] * workers))
+        pooled = total / (time.perf_counter() - start)
+
+    return {
+        "method": stored.split("$", 1)[0],
+        "ms_per_hash": 1000 / per_core,
+        "per_core": per_core,
+        "pooled": pooled,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-m", "--method", action="append", help="Méthode werkzeug (répétable).")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Durée de mesure par méthode.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Taille du pool mesuré.")
+    args = parser.parse_args(argv)
+
+    methods = args.method or [DEFAULT_METHOD, "scrypt:16384:8:1", "pbkdf2:sha256:600000"]
+    print(f"{'méthode':<28} {'ms/hash':>9} {'hash/s/cœur':>12} {f'hash/s ({args.workers} proc.)':>20}")
+    for method in methods:
+        r = bench(method, args.seconds, args.workers)
+        print(f"{r['method']:<28} {r['ms_per_hash']:>9.1f} {r['per_core']:>12.1f} {r['pooled']:>20.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Banc d'essai du démarrage à froid de ``create_app()``.
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py -n 20 --importtime 15
+    python scripts/bench_startup.py --json >> startup-history.jsonl
+
+Chaque mesure lance un interpréteur neuf (aucun module en cache) qui
+importe ``app`` puis appelle ``create_app()`` ; on rapporte min / médiane /
+max pour l'import seul et pour l'ensemble. ``--importtime`` affiche en plus
+les modules les plus coûteux (``python -X importtime``), à comparer d'une
+version à l'autre.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.create_app()
+t2 = time.perf_counter()
+heavy = [m for m in ("stripe", "pymongo", "flask_mail", "alembic", "zxcvbn") if m in sys.modules]
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "total_ms": (t2 - t0) * 1000, "heavy": heavy}))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "bench")
+    env.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+    return env
+
+
+def measure(runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=ROOT, env=_env(), capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    def summary(key: str) -> dict:
+        values = [s[key] for s in samples]
+        return dict(
+            min=round(min(values), 1), median=round(statistics.median(values), 1), max=round(max(values), 1)
+        )
+
+    return dict(runs=runs, import_ms=summary("import_ms"), total_ms=summary("total_ms"), heavy=samples[-1]["heavy"])
+
+
+def importtime(top: int) -> list:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app; app.create_app()"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return [dict(module=name, cumulative_ms=round(c / 1000, 1), self_ms=round(s / 1000, 1)) for c, s, name in rows[:top]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="top N modules les plus lents")
+    parser.add_argument("--json", action="store_true", help="une ligne JSON (suivi dans le temps)")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    if args.importtime:
+        result["slowest_imports"] = importtime(args.importtime)
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(f"{args.runs} démarrages à froid")
+    for key, label in (("import_ms", "import app"), ("total_ms", "create_app()")):
+        s = result[key]
+        print(f"  {label:<14} min {s['min']:>7.1f} ms   médiane {s['median']:>7.1f} ms   max {s['max']:>7.1f} ms")
+    print(f"  modules lourds chargés : {', '.join(result['heavy']) or 'aucun'}")
+    for row in result.get("slowest_imports", []):
+        print(f"  {row['cumulative_ms']:>8.1f} ms  (propre {row['self_ms']:>6.1f})  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
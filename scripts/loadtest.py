@@ -0,0 +1,192 @@
+"""
+Test de charge des configurations Gunicorn (``gunicorn.conf.py``).
+
+    python scripts/loadtest.py                              # sync, gthread
+    python scripts/loadtest.py -k gthread -k gevent -c 64 -d 20 / /books
+    python scripts/loadtest.py --slow-clients 4             # + appels lents
+    python scripts/loadtest.py --url http://staging:8000 /books --json
+
+Pour chaque classe de worker (``-k``), un Gunicorn est lancé sur un port
+local avec ``gunicorn.conf.py`` et une base SQLite jetable, puis ``-c``
+clients enchaînent les requêtes sur les chemins donnés pendant ``-d``
+secondes : requêtes/s, p50 / p95 / p99, erreurs.
+
+``--slow-clients K`` ajoute K clients sur une route de test qui dort
+``--slow-seconds`` (un appel Stripe qui traîne) : on mesure alors ce que
+subissent les autres pages pendant ce temps.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import urlopen
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SLOW_PATH = "/__loadtest/slow"
+
+
+def bench_app():
+    """Cible Gunicorn : l'application + une route lente, tables créées."""
+    sys.path.insert(0, ROOT)
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    seconds = float(os.getenv("LOADTEST_SLOW_SECONDS", "2"))
+    app.add_url_rule(SLOW_PATH, "loadtest_slow", lambda: (time.sleep(seconds), "ok")[1])
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+# ---------------------------------------------------------------------- #
+#  Clients
+# ---------------------------------------------------------------------- #
+def _fetch(url: str, timeout: float) -> bool:
+    try:
+        with urlopen(url, timeout=timeout) as resp:
+            resp.read()
+            return resp.status < 500
+    except (URLError, OSError):
+        return False
+
+
+def run_load(base: str, paths: list, clients: int, duration: float, slow_clients: int, timeout: float) -> dict:
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def fast(index: int) -> None:
+        nonlocal errors
+        i = index
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            ok = _fetch(base + paths[i % len(paths)], timeout)
+            elapsed = (time.perf_counter() - start) * 1000
+            i += 1
+            with lock:
+                latencies.append(elapsed)
+                errors += 0 if ok else 1
+
+    def slow(_: int) -> None:
+        while time.monotonic() < deadline:
+            _fetch(base + SLOW_PATH, timeout)
+
+    with ThreadPoolExecutor(max_workers=clients + slow_clients) as pool:
+        for i in range(slow_clients):
+            pool.submit(slow, i)
+        for i in range(clients):
+            pool.submit(fast, i)
+
+    if not latencies:
+        return dict(requests=0, errors=errors)
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return dict(
+        requests=len(latencies),
+        errors=errors,
+        rps=round(len(latencies) / duration, 1),
+        p50_ms=round(cuts[49], 1),
+        p95_ms=round(cuts[94], 1),
+        p99_ms=round(cuts[98], 1),
+        max_ms=round(max(latencies), 1),
+    )
+
+
+# ---------------------------------------------------------------------- #
+#  Serveur
+# ---------------------------------------------------------------------- #
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _fetch(base + "/", 2):
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"Gunicorn ne répond pas sur {base}")
+
+
+def spawn(worker_class: str, args) -> tuple:
+    port = _free_port()
+    tmp = tempfile.mkdtemp(prefix="loadtest-")
+    env = dict(
+        os.environ,
+        SECRET_KEY=os.getenv("SECRET_KEY", "loadtest"),
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(tmp, 'loadtest.db')}",
+        GUNICORN_WORKER_CLASS=worker_class,
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_ACCESS_LOG="",
+        LOADTEST_SLOW_SECONDS=str(args.slow_seconds),
+        STRIPE_WEBHOOK_WORKER="off",
+    )
+    if args.workers:
+        env["GUNICORN_WORKERS"] = str(args.workers)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "scripts.loadtest:bench_app()"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base)
+    except RuntimeError:
+        proc.terminate()
+        raise
+    return proc, base
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=["/", "/books"])
+    parser.add_argument("-k", "--worker-class", action="append", choices=["sync", "gthread", "gevent"])
+    parser.add_argument("-w", "--workers", type=int, default=0, help="GUNICORN_WORKERS (défaut : conf)")
+    parser.add_argument("-c", "--clients", type=int, default=32)
+    parser.add_argument("-d", "--duration", type=float, default=10.0)
+    parser.add_argument("--slow-clients", type=int, default=0)
+    parser.add_argument("--slow-seconds", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="délai client par requête (s)")
+    parser.add_argument("--url", help="serveur déjà lancé (aucun Gunicorn démarré)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    targets = [("external", None)] if args.url else [(k, None) for k in (args.worker_class or ["sync", "gthread"])]
+    results = {}
+    for name, _ in targets:
+        proc, base = (None, args.url.rstrip("/")) if args.url else spawn(name, args)
+        try:
+            _fetch(base + args.paths[0], args.timeout)  # chauffe
+            results[name] = run_load(base, args.paths, args.clients, args.duration, args.slow_clients, args.timeout)
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(10)
+
+    if args.json:
+        print(json.dumps(dict(paths=args.paths, clients=args.clients, slow_clients=args.slow_clients, results=results)))
+        return
+    print(f"{args.clients} clients × {args.duration:g} s sur {', '.join(args.paths)}"
+          + (f" ; {args.slow_clients} clients sur une route de {args.slow_seconds:g} s" if args.slow_clients else ""))
+    for name, r in results.items():
+        if not r["requests"]:
+            print(f"  {name:<8} aucune réponse ({r['errors']} erreurs)")
+            continue
+        print(f"  {name:<8} {r['rps']:>8.1f} req/s   p50 {r['p50_ms']:>7.1f}   p95 {r['p95_ms']:>7.1f}   "
+              f"p99 {r['p99_ms']:>7.1f}   max {r['max_ms']:>7.1f} ms   erreurs {r['errors']}")
+
+
+if __name__ == "__main__":
+    main()
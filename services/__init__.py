@@ -0,0 +1,5 @@
+"""
+Couche « services » : logique applicative réutilisée par les blueprints.
+
+    from services.cart_snapshot import get_cart_snapshot, invalidate_cart
+"""
@@ -0,0 +1,150 @@
+"""
+Listes de l'admin (livres, auteurs, catégories) et sélecteurs du formulaire
+livre :
+
+    • pagination par clé (``services.pagination``), 25 lignes par page ;
+      chaque tri est couvert par un index composite (…, id) ;
+    • livres : auteur et catégorie chargés avec la page (``joinedload``),
+      filtre texte via la recherche plein texte existante ;
+    • auteurs / catégories : recherche par préfixe sur une clé normalisée
+      (minuscules, sans accents) stockée en base — ``author_name_key``
+      (« nom prénom », retrouvée aussi en tapant « prénom nom ») et
+      ``category_name_key``. Sous PostgreSQL un index
+      ``varchar_pattern_ops`` sert ``LIKE 'préfixe%'`` ;
+    • sélecteurs auteur / catégorie : autocomplétion JSON (``lookup_*``) au
+      lieu d'un ``<select>`` contenant toute la table.
+
+Les clés sont tenues à jour par les écritures admin (``index_author`` /
+``index_category``, avant commit), comme ``search_document`` pour les livres.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+
+from models import db
+from models.author_model import Author
+from models.book_model import Book
+from models.category_model import Category
+from services.pagination import KeysetPage, keyset_paginate
+from services.search import search_condition, tokenize
+
+ADMIN_PER_PAGE = 25
+LOOKUP_LIMIT = 10
+
+# clé de tri → (colonne, décroissant) ; index (colonne, id) pour chacune
+BOOK_SORTS = {
+    "title": (Book.book_title, False),
+    "newest": (Book.publication_date, True),
+    "price": (Book.book_price, False),
+    "recent": (Book.book_id, True),
+}
+AUTHOR_SORTS = {
+    "name": (Author.author_name_key, False),
+    "recent": (Author.author_id, True),
+}
+CATEGORY_SORTS = {
+    "name": (Category.category_name_key, False),
+    "recent": (Category.category_id, True),
+}
+
+
+# ---------------------------------------------------------------------- #
+#  Clés normalisées
+# ---------------------------------------------------------------------- #
+def name_key(*parts: str, length: int = 200) -> str:
+    """``"Éluard", "Paul"`` → ``"eluard paul"`` (tokens [a-z0-9], comme la recherche)."""
+    return " ".join(tokenize(" ".join(p or "" for p in parts)))[:length]
+
+
+def index_author(author: Author) -> None:
+    author.author_name_key = name_key(author.author_lastname, author.author_firstname)
+
+
+def index_category(category: Category) -> None:
+    category.category_name_key = name_key(category.category_name, length=100)
+
+
+def _prefix(query, column, text: Optional[str], either_order: bool = False):
+    # Tokens [a-z0-9] séparés par des espaces : aucun joker LIKE possible
+    key = name_key(text or "")
+    if not key:
+        return query
+    condition = column.like(key + "%")
+    tokens = key.split(" ")
+    if either_order and len(tokens) > 1:
+        # « paul el » sur la clé « eluard paul » : chaque découpe prénom | nom
+        # donne un motif « el% paul% », toujours ancré sur un préfixe indexé
+        condition = or_(condition, *(
+            column.like(f"{' '.join(tokens[k:])}% {' '.join(tokens[:k])}%") for k in range(1, len(tokens))
+        ))
+    return query.filter(condition)
+
+
+def _paginate(query, sorts: dict, sort: Optional[str], default: str, id_column,
+              after: Optional[str], before: Optional[str], per_page: int) -> KeysetPage:
+    column, descending = sorts.get(sort) or sorts[default]
+    columns = [id_column] if column is id_column else [column, id_column]
+    return keyset_paginate(query, columns, per_page=per_page, after=after, before=before, descending=descending)
+
+
+# ---------------------------------------------------------------------- #
+#  Listes paginées
+# ---------------------------------------------------------------------- #
+def admin_books(
+    sort: Optional[str] = None,
+    q: Optional[str] = None,
+    category_id: Optional[int] = None,
+    author_id: Optional[int] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: int = ADMIN_PER_PAGE,
+) -> KeysetPage:
+    query = Book.query.options(joinedload(Book.author), joinedload(Book.category))
+    if q and q.strip():
+        query = query.filter(search_condition(q))
+    if category_id:
+        query = query.filter(Book.category_id == category_id)
+    if author_id:
+        query = query.filter(Book.author_id == author_id)
+    return _paginate(query, BOOK_SORTS, sort, "title", Book.book_id, after, before, per_page)
+
+
+def admin_authors(
+    sort: Optional[str] = None,
+    q: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: int = ADMIN_PER_PAGE,
+) -> KeysetPage:
+    query = _prefix(Author.query, Author.author_name_key, q, either_order=True)
+    return _paginate(query, AUTHOR_SORTS, sort, "name", Author.author_id, after, before, per_page)
+
+
+def admin_categories(
+    sort: Optional[str] = None,
+    q: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: int = ADMIN_PER_PAGE,
+) -> KeysetPage:
+    query = _prefix(Category.query, Category.category_name_key, q)
+    return _paginate(query, CATEGORY_SORTS, sort, "name", Category.category_id, after, before, per_page)
+
+
+# ---------------------------------------------------------------------- #
+#  Autocomplétion
+# ---------------------------------------------------------------------- #
+def lookup_authors(q: Optional[str], limit: int = LOOKUP_LIMIT) -> list:
+    query = db.session.query(Author.author_id, Author.author_firstname, Author.author_lastname)
+    rows = _prefix(query, Author.author_name_key, q, either_order=True).order_by(Author.author_name_key, Author.author_id).limit(limit)
+    return [{"id": r.author_id, "label": f"{r.author_firstname} {r.author_lastname}"} for r in rows]
+
+
+def lookup_categories(q: Optional[str], limit: int = LOOKUP_LIMIT) -> list:
+    query = db.session.query(Category.category_id, Category.category_name)
+    rows = _prefix(query, Category.category_name_key, q).order_by(Category.category_name_key, Category.category_id).limit(limit)
+    return [{"id": r.category_id, "label": r.category_name} for r in rows]
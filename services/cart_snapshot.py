@@ -0,0 +1,110 @@
+"""
+Instantané du panier pour l'en-tête (badge + modale) :
+
+    • une seule requête jointe CartItem ⨝ Book par requête HTTP ;
+    • mémoïsation sur ``flask.g`` (plusieurs rendus = 0 requête) ;
+    • résumé compact mis en cache par utilisateur (backend ``extensions.cache``) ;
+    • invalidation explicite depuis le panier et le checkout.
+"""
+
+from __future__ import annotations
+
+from collections import namedtuple
+from typing import Optional
+
+from flask import current_app, g
+
+from extensions.cache import get_cache
+from models import db
+from models.book_model import Book
+from models.cart_items_model import CartItem
+
+# Mêmes noms d'attributs que les modèles : les templates restent inchangés
+CartBook = namedtuple("CartBook", "book_id book_title book_image_url book_price")
+CartLine = namedtuple("CartLine", "cart_item_id book_id book")
+
+
+class CartSnapshot:
+    """Vue en lecture seule du panier d'un utilisateur."""
+
+    __slots__ = ("items", "total_price")
+
+    def __init__(self, items: list, total_price: float = 0):
+        self.items = items
+        self.total_price = total_price
+
+    @property
+    def count(self) -> int:
+        return len(self.items)
+
+    @classmethod
+    def from_summary(cls, summary: dict) -> "CartSnapshot":
+        items = [
+            CartLine(cart_item_id, book_id, CartBook(book_id, title, image_url, price))
+            for cart_item_id, book_id, title, image_url, price in summary["items"]
+        ]
+        return cls(items, summary["total"])
+
+    def as_context(self) -> dict:
+        return dict(
+            cart_items=self.items,
+            total_price=self.total_price,
+            cart_count=self.count,
+        )
+
+
+EMPTY_CART = CartSnapshot([], 0)
+
+
+# ---------------------------------------------------------------------- #
+#  Chargement
+# ---------------------------------------------------------------------- #
+def _cache_key(user_id: int) -> str:
+    return f"cart:{user_id}"
+
+
+def _load_summary(user_id: int) -> dict:
+    """Une requête jointe ; résultat sérialisable en JSON."""
+    rows = (
+        db.session.query(
+            CartItem.cart_item_id,
+            Book.book_id,
+            Book.book_title,
+            Book.book_image_url,
+            Book.book_price,
+        )
+        .join(Book, CartItem.book_id == Book.book_id)
+        .filter(CartItem.user_id == user_id)
+        .order_by(CartItem.cart_item_id)
+        .all()
+    )
+    return {
+        "items": [list(row) for row in rows],
+        "total": sum(row.book_price for row in rows),
+    }
+
+
+def get_cart_snapshot(user_id: Optional[int]) -> CartSnapshot:
+    if not user_id:
+        return EMPTY_CART
+
+    memo = g.setdefault("_cart_snapshots", {})
+    if user_id in memo:
+        return memo[user_id]
+
+    cache = get_cache()
+    summary = cache.get(_cache_key(user_id))
+    if summary is None:
+        summary = _load_summary(user_id)
+        cache.set(_cache_key(user_id), summary, ttl=current_app.config["CART_CACHE_TTL"])
+
+    snapshot = memo[user_id] = CartSnapshot.from_summary(summary)
+    return snapshot
+
+
+def invalidate_cart(user_id: Optional[int]) -> None:
+    """À appeler après toute écriture sur ``cart_items`` de *user_id*."""
+    if not user_id:
+        return
+    get_cache().delete(_cache_key(user_id))
+    g.get("_cart_snapshots", {}).pop(user_id, None)
@@ -0,0 +1,226 @@
+"""
+Requêtes du catalogue (/books) :
+
+    • pagination par clé sur (clé de tri, book_id) — pas d'OFFSET ;
+    • filtres prix min/max et tris (popularité, prix, nouveautés) ;
+    • comptages par filtre mis en cache ;
+    • liste des catégories mise en cache ;
+    • chargement anticipé de ``author`` / ``category`` pour les cartes.
+
+Les clés de cache incluent une version du catalogue : toute écriture admin
+appelle ``invalidate_catalogue()`` qui incrémente ce compteur, ce qui
+périme d'un coup tous les comptages, quels que soient les filtres.
+"""
+
+from __future__ import annotations
+
+from collections import namedtuple
+from datetime import datetime
+import math
+from typing import Optional, Sequence
+
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from extensions.cache import get_cache
+from models import db
+from models.author_model import Author
+from models.book_model import Book
+from models.category_model import Category
+from services.pagination import KeysetPage, keyset_paginate
+from services.search import search_condition, tokenize
+
+# clé de tri → (colonne, décroissant). Chaque tri est couvert par un index
+# composite (…, book_id) déclaré sur Book, avec ou sans category_id en tête.
+SORT_KEYS = {
+    "popular": (Book.sales_count, True),
+    "newest": (Book.publication_date, True),
+    "price-asc": (Book.book_price, False),
+    "price-desc": (Book.book_price, True),
+}
+DEFAULT_SORT = "popular"
+
+# bornes du curseur « Prix max » de la galerie (en haut de course : pas de filtre)
+PRICE_SLIDER = (5.0, 100.0)
+
+CategoryOption = namedtuple("CategoryOption", "category_id category_name")
+
+
+def browse_books(
+    category_id: Optional[int] = None,
+    sort: str = DEFAULT_SORT,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: int = 9,
+    search: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+) -> KeysetPage:
+    """*search* restreint le parcours aux résultats d'une recherche, dans la
+    même requête que les filtres et le tri (``search_condition``)."""
+    column, descending = SORT_KEYS.get(sort, SORT_KEYS[DEFAULT_SORT])
+
+    query = Book.query.options(joinedload(Book.author), joinedload(Book.category))
+    query = _apply_filters(query, category_id, min_price, max_price, search)
+    total = count_books(category_id, min_price, max_price, search)
+
+    return keyset_paginate(
+        query,
+        [column, Book.book_id],
+        per_page=per_page,
+        after=after,
+        before=before,
+        descending=descending,
+        total=total,
+    )
+
+
+def parse_price(raw: Optional[str], low: float = 0.0, high: Optional[float] = None) -> Optional[float]:
+    """Prix de filtre lu dans la query string, borné à [*low*, *high*] et
+    arrondi au centime ; ``ValueError`` si non numérique ou non fini
+    (``inf``, ``nan``, ``1e400``)."""
+    if raw is None or not raw.strip():
+        return None
+    value = float(raw)
+    if not math.isfinite(value):
+        raise ValueError(f"Prix invalide : {raw}")
+    value = max(value, low)
+    if high is not None:
+        value = min(value, high)
+    return round(value, 2)
+
+
+def _apply_filters(query, category_id, min_price, max_price, search=None):
+    if search is not None:
+        query = query.filter(search_condition(search))
+    if category_id:
+        query = query.filter(Book.category_id == category_id)
+    if min_price is not None:
+        query = query.filter(Book.book_price >= min_price)
+    if max_price is not None:
+        query = query.filter(Book.book_price <= max_price)
+    return query
+
+
+# ---------------------------------------------------------------------- #
+#  API : seulement les colonnes demandées (?fields=…)
+# ---------------------------------------------------------------------- #
+# nom public → expression SQL ; author / category ajoutent leur jointure
+API_FIELDS = {
+    "id": Book.book_id,
+    "title": Book.book_title,
+    "author": Author.author_firstname + " " + Author.author_lastname,
+    "category": Category.category_name,
+    "price": Book.book_price,
+    "publication_date": Book.publication_date,
+    "image_url": Book.book_image_url,
+    "image_variants": Book.book_image_variants,
+    "updated_at": Book.updated_at,
+}
+DEFAULT_API_FIELDS = ("id", "title", "author", "category", "price", "publication_date", "image_url")
+
+
+def parse_fields(raw: Optional[str]) -> list:
+    """``"id,title"`` → ``["id", "title"]`` ; ``ValueError`` si un champ est inconnu."""
+    if not raw:
+        return list(DEFAULT_API_FIELDS)
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in API_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Champs inconnus : {', '.join(unknown) or raw}")
+    return fields
+
+
+def book_rows(
+    fields: Sequence[str],
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: str = DEFAULT_SORT,
+):
+    """Lignes nommées (pas d'entités) ; clé de tri et ``book_id`` toujours lus pour les curseurs."""
+    column, _ = SORT_KEYS.get(sort, SORT_KEYS[DEFAULT_SORT])
+    query = db.session.query(*(API_FIELDS[f].label(f) for f in fields), Book.book_id, column).select_from(Book)
+    if "author" in fields:
+        query = query.join(Author, Book.author_id == Author.author_id)
+    if "category" in fields:
+        query = query.join(Category, Book.category_id == Category.category_id)
+    return _apply_filters(query, category_id, min_price, max_price)
+
+
+# ---------------------------------------------------------------------- #
+#  Données annexes mises en cache
+# ---------------------------------------------------------------------- #
+def catalogue_version() -> int:
+    return get_cache().get("catalogue:version") or 0
+
+
+def count_books(
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    search: Optional[str] = None,
+) -> int:
+    cache = get_cache()
+    key = f"catalogue:v{catalogue_version()}:count:{category_id or 'all'}:{min_price}:{max_price}"
+    if search is not None:
+        key += ":q:" + " ".join(tokenize(search))
+    total = cache.get(key)
+    if total is None:
+        query = _apply_filters(
+            db.session.query(func.count(Book.book_id)), category_id, min_price, max_price, search,
+        )
+        total = query.scalar()
+        cache.set(key, total, ttl=current_app.config["CATALOGUE_CACHE_TTL"])
+    return total
+
+
+def list_categories() -> list:
+    cache = get_cache()
+    key = f"catalogue:v{catalogue_version()}:categories"
+    rows = cache.get(key)
+    if rows is None:
+        rows = [
+            [c.category_id, c.category_name]
+            for c in db.session.query(Category.category_id, Category.category_name)
+            .order_by(Category.category_name)
+        ]
+        cache.set(key, rows, ttl=current_app.config["CATALOGUE_CACHE_TTL"])
+    return [CategoryOption(*row) for row in rows]
+
+
+def book_updated_at(book_id: int) -> Optional[datetime]:
+    """``Book.updated_at`` sans charger le livre (ETag de la fiche) ; ``None`` si absent."""
+    cache = get_cache()
+    key = f"catalogue:v{catalogue_version()}:updated:{book_id}"
+    stamp = cache.get(key)
+    if stamp is None:
+        updated_at = db.session.query(Book.updated_at).filter(Book.book_id == book_id).scalar()
+        if updated_at is None:
+            return None
+        stamp = updated_at.isoformat()
+        cache.set(key, stamp, ttl=current_app.config["CATALOGUE_CACHE_TTL"])
+    return datetime.fromisoformat(stamp)
+
+
+def catalogue_stamp() -> str:
+    """Nombre de livres + dernière modification : valide les listes (ETag).
+
+    Complète la version du catalogue quand le cache n'est pas partagé
+    (``memory://``) : un worker qui n'a pas vu l'écriture admin voit quand
+    même changer l'empreinte au plus tard après ``CATALOGUE_CACHE_TTL``.
+    """
+    cache = get_cache()
+    key = f"catalogue:v{catalogue_version()}:stamp"
+    stamp = cache.get(key)
+    if stamp is None:
+        count, last = db.session.query(func.count(Book.book_id), func.max(Book.updated_at)).one()
+        stamp = f"{count}:{last.isoformat() if last else '-'}"
+        cache.set(key, stamp, ttl=current_app.config["CATALOGUE_CACHE_TTL"])
+    return stamp
+
+
+def invalidate_catalogue() -> None:
+    """À appeler après une écriture sur Book / Category (admin)."""
+    get_cache().incr("catalogue:version", ttl=0)
@@ -0,0 +1,74 @@
+"""
+Passage du panier en commande, ensembliste et transactionnel.
+
+Nombre d'allers-retours constant quelle que soit la taille du panier :
+
+    1. ``SELECT … FOR UPDATE``   verrouille les lignes du panier (un double
+                                 clic attend la première transaction puis
+                                 trouve un panier vide) ;
+    2. ``INSERT Orders``         commande « pending », id via RETURNING ;
+    3. ``INSERT … SELECT``       lignes de commande depuis cart_items ⨝ Book ;
+    4. ``UPDATE Orders``         total = SUM(quantity × unit_price) en SQL ;
+    5. ``DELETE cart_items``     lignes verrouillées uniquement ;
+
+le tout validé par un seul commit : plus de commande sans panier vidé (ou
+l'inverse) si le processus tombe en cours de route.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, literal, select, update
+
+from models import db
+from models.book_model import Book
+from models.cart_items_model import CartItem
+from models.order_details_model import OrderDetail
+from models.order_model import Order
+from services.cart_snapshot import invalidate_cart
+
+
+def checkout_cart(user_id: int) -> Optional[int]:
+    """Crée la commande du panier de *user_id* ; ``None`` si le panier est vide."""
+    try:
+        cart_item_ids = db.session.scalars(
+            select(CartItem.cart_item_id)
+            .where(CartItem.user_id == user_id)
+            .with_for_update()
+        ).all()
+        if not cart_item_ids:
+            db.session.rollback()  # libère les verrous
+            return None
+
+        order_id = db.session.execute(
+            insert(Order)
+            .values(user_id=user_id, order_date=datetime.utcnow(), total_price=0, payment_status="pending")
+            .returning(Order.order_id)
+        ).scalar_one()
+
+        db.session.execute(
+            insert(OrderDetail).from_select(
+                ["order_id", "book_id", "quantity", "unit_price"],
+                select(literal(order_id), CartItem.book_id, literal(1), Book.book_price)
+                .join(Book, Book.book_id == CartItem.book_id)
+                .where(CartItem.cart_item_id.in_(cart_item_ids)),
+            )
+        )
+
+        line_total = (
+            select(func.coalesce(func.sum(OrderDetail.quantity * OrderDetail.unit_price), 0))
+            .where(OrderDetail.order_id == order_id)
+            .scalar_subquery()
+        )
+        db.session.execute(update(Order).where(Order.order_id == order_id).values(total_price=line_total))
+
+        db.session.execute(delete(CartItem).where(CartItem.cart_item_id.in_(cart_item_ids)))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    invalidate_cart(user_id)
+    return order_id
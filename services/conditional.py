@@ -0,0 +1,115 @@
+"""
+Requêtes conditionnelles (ETag / Last-Modified) sur les pages du catalogue.
+
+    1re visite ─▶ 200 + ETag: W/"…" (+ Last-Modified sur la fiche livre)
+    revisite   ─▶ If-None-Match / If-Modified-Since inchangé ─▶ 304 vide,
+                  décidé avant le cache de pages et tout rendu de template
+
+    • l'ETag est calculé sans rien rendre ni charger : version du catalogue,
+      ``Book.updated_at`` pour la fiche (en cache, cf. ``book_updated_at``)
+      et état du visiteur. Le menu de connexion et le panier font partie de
+      la page : un visiteur connecté a son propre ETag, qui change avec son
+      panier ;
+    • ETag faible : le HTML est équivalent, pas forcément identique octet
+      pour octet (compression, ordre des attributs…) ;
+    • ``Last-Modified`` seulement pour les anonymes : la date d'un livre ne
+      dit rien du panier. Si le client envoie les deux, l'ETag prime ;
+    • ``Cache-Control: private, no-cache`` + ``Vary: Cookie`` : le navigateur
+      garde la page mais la revalide à chaque fois, aucun cache partagé ne
+      la sert à un autre visiteur ;
+    • messages flash en attente : ni 304 ni ETag, la page est rendue pour
+      les afficher (et les consommer) et n'est pas gardée telle quelle ;
+    • ``per_user=False`` (API JSON) : ni session ni panier dans l'ETag,
+      ``Cache-Control: public, no-cache`` ;
+    • listes : ``catalogue_stamp()`` (nombre de livres + dernière
+      modification) s'ajoute à la version du catalogue ;
+    • les mêmes validateurs entrent dans la clé du cache de pages
+      (``g.page_validators``) : un worker dont l'empreinte vient de changer
+      ne peut pas servir sous ce nouvel ETag une page rendue avant.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Optional, Sequence, Tuple
+import hashlib
+
+from flask import abort, current_app, g, make_response, request, session
+from werkzeug.http import is_resource_modified
+
+from services.cart_snapshot import get_cart_snapshot
+from services.catalogue import book_updated_at, catalogue_stamp, catalogue_version
+
+# (éléments propres à la ressource, date de dernière modification)
+Validators = Tuple[Sequence[object], Optional[datetime]]
+
+
+def viewer_state() -> str:
+    user_id = session.get("user_id")
+    if not user_id:
+        return "anon"
+    snapshot = get_cart_snapshot(user_id)
+    items = ",".join(str(line.cart_item_id) for line in snapshot.items)
+    return f"u{user_id}:{items}:{snapshot.total_price}"
+
+
+def page_etag(*parts: object, per_user: bool = True) -> str:
+    viewer = viewer_state() if per_user else "public"
+    seed = "|".join(str(part) for part in (catalogue_version(), viewer, *parts))
+    return hashlib.sha1(seed.encode("utf-8")).hexdigest()[:20]
+
+
+def _finalize(response, etag: str, last_modified: Optional[datetime], per_user: bool):
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    if per_user:
+        response.cache_control.private = True
+        response.vary.add("Cookie")
+    else:
+        response.cache_control.public = True
+    return response
+
+
+def catalogue_validators(**_) -> Validators:
+    """Listes : pas de Last-Modified (une suppression ne le ferait pas bouger)."""
+    return (catalogue_stamp(),), None
+
+
+def conditional(validators: Callable[..., Validators] = catalogue_validators, per_user: bool = True) -> Callable:
+    """Décorateur : *validators(**view_args)* → ``(parts, last_modified)``."""
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD") or (per_user and "_flashes" in session):
+                return view(*args, **kwargs)
+
+            parts, last_modified = validators(**kwargs)
+            # Repris par la clé du cache de pages : corps et ETag vont ensemble
+            g.page_validators = parts
+            if per_user and session.get("user_id"):
+                last_modified = None
+            etag = page_etag(request.path, *parts, per_user=per_user)
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                return _finalize(current_app.response_class(status=304), etag, last_modified, per_user)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _finalize(response, etag, last_modified, per_user)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def book_validators(book_id: int) -> Validators:
+    """Fiche livre : 404 immédiat si le livre n'existe pas."""
+    updated_at = book_updated_at(book_id)
+    if updated_at is None:
+        abort(404)
+    return (book_id, updated_at.isoformat()), updated_at
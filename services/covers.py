@@ -0,0 +1,245 @@
+"""
+Couvertures des livres : variantes redimensionnées, converties et nommées
+par leur contenu.
+
+    upload admin ─▶ original (static/images) ─▶ enqueue_cover(book_id)
+                                                      │
+                       worker local ◀─────────────────┘
+                       WebP + JPEG × COVER_WIDTHS ─▶ static/images/covers/<hash>-<w>.<ext>
+                       Book.book_image_variants, book_image_url = JPEG par défaut
+
+    • métadonnées supprimées (EXIF, profil ICC…), orientation EXIF appliquée ;
+    • jamais d'agrandissement au-delà de la largeur d'origine ;
+    • nom = empreinte du fichier produit : URL immuable, cache navigateur
+      illimité, deux couvertures identiques partagent les mêmes fichiers ;
+    • l'original est conservé (``variants["source"]``) : on peut régénérer
+      avec d'autres largeurs via ``flask covers convert --all``.
+
+Pillow n'est importé qu'au premier traitement.
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+import logging
+import os
+import queue
+import threading
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from werkzeug.utils import secure_filename
+
+from models import db
+from models.book_model import Book
+from services.catalogue import invalidate_catalogue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = (160, 320, 480, 640)
+FALLBACK_WIDTH = 320  # variante JPEG servie en <img src> (panier, anciens navigateurs)
+COVERS_DIR = "images/covers"  # relatif au dossier static
+# format → (extension, format Pillow, options d'encodage)
+FORMATS = {
+    "webp": ("webp", "WEBP", dict(quality=80, method=6)),
+    "jpeg": ("jpg", "JPEG", dict(quality=82, optimize=True, progressive=True)),
+}
+
+
+# ---------------------------------------------------------------------- #
+#  Traitement d'image (sans Flask)
+# ---------------------------------------------------------------------- #
+def render_variants(data: bytes, widths: Sequence[int]) -> Tuple[Tuple[int, int], List[Tuple[str, int, bytes]]]:
+    """``((largeur, hauteur) d'origine, [(format, largeur, octets), …])``."""
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as img:
+        largest = max(widths)
+        size = img.size  # avant draft(), qui réduit le décodage
+        if img.getexif().get(0x0112) in (5, 6, 7, 8):  # orientation EXIF pivotée de 90°
+            size = size[::-1]
+        img.draft("RGB", (largest, largest * 2))  # JPEG : décodage directement réduit
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ("RGBA", "LA", "P"):
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+
+        targets = sorted({w for w in widths if w < img.width} | {min(largest, img.width)})
+        out = []
+        for width in targets:
+            height = max(1, round(img.height * width / img.width))
+            resized = img.resize((width, height), Image.LANCZOS) if width != img.width else img.copy()
+            resized.info = {}  # ni EXIF, ni ICC, ni commentaires
+            for name, (_, pil_format, options) in FORMATS.items():
+                buffer = BytesIO()
+                resized.save(buffer, pil_format, **options)
+                out.append((name, width, buffer.getvalue()))
+        return size, out
+
+
+def write_variants(
+    data: bytes, output_dir: str, url_prefix: str, widths: Sequence[int] = DEFAULT_WIDTHS
+) -> Dict[str, object]:
+    """Écrit les fichiers (si absents) et renvoie la description des variantes."""
+    (width, height), rendered = render_variants(data, widths)
+    os.makedirs(output_dir, exist_ok=True)
+
+    variants: Dict[str, object] = {"width": width, "height": height, "webp": [], "jpeg": []}
+    for name, w, payload in rendered:
+        extension = FORMATS[name][0]
+        filename = f"{hashlib.sha256(payload).hexdigest()[:16]}-{w}.{extension}"
+        path = os.path.join(output_dir, filename)
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp, path)  # jamais de fichier à moitié écrit servi
+        variants[name].append([w, f"{url_prefix}/{filename}"])
+
+    jpegs = variants["jpeg"]
+    variants["fallback"] = min(jpegs, key=lambda pair: (pair[0] < FALLBACK_WIDTH, abs(pair[0] - FALLBACK_WIDTH)))[1]
+    return variants
+
+
+# ---------------------------------------------------------------------- #
+#  Intégration Flask
+# ---------------------------------------------------------------------- #
+def _static_path(url: Optional[str]) -> Optional[str]:
+    """Chemin disque d'une URL ``/static/…``, sans sortir du dossier static."""
+    prefix = current_app.static_url_path + "/"
+    if not url or not url.startswith(prefix):
+        return None
+    root = os.path.realpath(current_app.static_folder)
+    path = os.path.realpath(os.path.join(root, url[len(prefix):]))
+    return path if path.startswith(root + os.sep) else None
+
+
+def save_upload(file_storage) -> str:
+    """Enregistre l'original sous un nom unique ; renvoie son URL."""
+    data = file_storage.read()
+    stem, extension = os.path.splitext(secure_filename(file_storage.filename) or "cover")
+    filename = f"{stem}-{hashlib.sha256(data).hexdigest()[:8]}{extension.lower()}"
+    with open(os.path.join(current_app.static_folder, "images", filename), "wb") as fh:
+        fh.write(data)
+    return f"{current_app.static_url_path}/images/{filename}"
+
+
+def process_cover(book_id: int) -> bool:
+    """Génère les variantes d'un livre ; ``False`` si rien à traiter."""
+    book = db.session.get(Book, book_id)
+    if book is None:
+        return False
+    source = (book.book_image_variants or {}).get("source") or book.book_image_url
+    path = _static_path(source)
+    if path is None or not os.path.isfile(path):
+        logger.warning(f"[covers] livre {book_id} : image introuvable ({source})")
+        return False
+
+    with open(path, "rb") as fh:
+        data = fh.read()
+    try:
+        variants = write_variants(
+            data,
+            os.path.join(current_app.static_folder, COVERS_DIR),
+            f"{current_app.static_url_path}/{COVERS_DIR}",
+            current_app.config["COVER_WIDTHS"],
+        )
+    except (OSError, ValueError) as e:  # fichier illisible / pas une image
+        logger.warning(f"[covers] livre {book_id} : conversion impossible ({e})")
+        return False
+
+    variants["source"] = source
+    book.book_image_variants = variants
+    book.book_image_url = variants["fallback"]
+    db.session.commit()
+    invalidate_catalogue()
+    return True
+
+
+class CoverWorker:
+    """Thread local au processus ; une file d'identifiants de livres."""
+
+    def __init__(self, app):
+        self.app = app
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def submit(self, book_id: int) -> None:
+        self._ensure_started()
+        self._queue.put(book_id)
+
+    def join(self) -> None:
+        """Attend que la file soit vide (tests, arrêt)."""
+        self._queue.join()
+
+    def _ensure_started(self) -> None:
+        # Après un fork (Gunicorn), le thread du parent n'existe plus
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="cover-images", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            book_id = self._queue.get()
+            with self.app.app_context():
+                try:
+                    process_cover(book_id)
+                except Exception:
+                    logger.exception(f"[covers] livre {book_id} : traitement KO")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+                    self._queue.task_done()
+
+
+def init_covers(app) -> None:
+    app.extensions["cover_worker"] = CoverWorker(app)
+
+
+def enqueue_cover(book_id: int) -> None:
+    """``COVER_WORKER`` : thread (défaut) | inline (dans la requête) | off (CLI seule)."""
+    mode = current_app.config.get("COVER_WORKER", "thread")
+    if mode == "thread":
+        current_app.extensions["cover_worker"].submit(book_id)
+    elif mode == "inline":
+        process_cover(book_id)
+
+
+# ---------------------------------------------------------------------- #
+#  CLI : flask covers convert
+# ---------------------------------------------------------------------- #
+covers_cli = AppGroup("covers", help="Variantes des couvertures.")
+
+
+@covers_cli.command("convert")
+@click.option("--all", "convert_all", is_flag=True, help="Régénère aussi les livres déjà convertis.")
+@click.option("--book-id", type=int, multiple=True, help="Limiter à ces livres.")
+def convert_command(convert_all: bool, book_id: tuple):
+    """Convertit les couvertures existantes."""
+    query = db.session.query(Book.book_id).filter(Book.book_image_url.isnot(None))
+    if book_id:
+        query = query.filter(Book.book_id.in_(book_id))
+    elif not convert_all:
+        query = query.filter(Book.book_image_variants.is_(None))
+
+    done = skipped = 0
+    for (current_id,) in query.order_by(Book.book_id).all():
+        if process_cover(current_id):
+            done += 1
+        else:
+            skipped += 1
+        db.session.expunge_all()
+    click.echo(f"✅ {done} couvertures converties, {skipped} ignorées.")
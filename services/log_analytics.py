@@ -0,0 +1,196 @@
+"""
+Analytique admin sur les logs Mongo (``users_loggings`` / ``user_actions``).
+
+    • taux de succès / échec des connexions et utilisateurs actifs par jour ;
+    • volume d'actions par jour et par type ;
+    • IP ayant le plus d'échecs de connexion sur une fenêtre glissante.
+
+Tout est calculé côté serveur par des pipelines d'agrégation dont le
+``$match`` porte sur ``timestamp`` (et ``event_type``), donc servi par les
+index créés dans ``extensions/mongo.py``. Les résultats sont lus via des
+curseurs (``batchSize``) et renvoyés en générateurs : rien n'est chargé en
+liste côté Python.
+
+Une journée terminée ne change plus : son bucket est mis en cache une fois
+calculé et seule la plage [premier jour absent du cache → aujourd'hui] est
+recalculée, en un seul pipeline.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional
+
+from flask import current_app
+
+from extensions.cache import get_cache
+
+BUCKET_FORMAT = "%Y-%m-%d"
+LOG_RETENTION_DAYS = 100  # même durée que le TTL des logs
+FINISHED_BUCKET_TTL = LOG_RETENTION_DAYS * 86400
+MAX_FAILING_IPS = 200
+
+
+def _bounded(value: int, high: int) -> int:
+    """Fenêtres et limites venues de la query string : ramenées à [1, high]."""
+    return max(1, min(value, high))
+
+
+def _day_start(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _day_bucket() -> dict:
+    return {"$dateToString": {"format": BUCKET_FORMAT, "date": "$timestamp"}}
+
+
+class LogAnalytics:
+    def __init__(self, database, cache, batch_size: int = 500):
+        self.db = database
+        self.cache = cache
+        self.batch_size = batch_size
+
+    # ------------------------------------------------------------------ #
+    # Connexions
+    # ------------------------------------------------------------------ #
+    def daily_logins(self, days: int = 30, now: Optional[datetime] = None) -> Iterator[dict]:
+        """Un bucket par jour (UTC) : success / fail / locked / active_users / success_rate."""
+        for bucket in self._daily_series("logins", self._login_buckets, days, now, _empty_login_bucket):
+            attempts = bucket["success"] + bucket["fail"]
+            yield dict(bucket, success_rate=round(bucket["success"] / attempts, 4) if attempts else None)
+
+    def _login_buckets(self, start: datetime, end: datetime) -> Iterator[dict]:
+        is_success = {"$eq": ["$details.status", "success"]}
+        pipeline = [
+            {"$match": {"timestamp": {"$gte": start, "$lt": end}, "event_type": "login"}},
+            {"$group": {
+                "_id": _day_bucket(),
+                "success": {"$sum": {"$cond": [is_success, 1, 0]}},
+                "fail": {"$sum": {"$cond": [{"$eq": ["$details.status", "fail"]}, 1, 0]}},
+                "locked": {"$sum": {"$cond": [{"$eq": ["$details.status", "locked"]}, 1, 0]}},
+                "users": {"$addToSet": {"$cond": [is_success, "$user_id", "$$REMOVE"]}},
+            }},
+            {"$project": {
+                "_id": 0,
+                "day": "$_id",
+                "success": 1,
+                "fail": 1,
+                "locked": 1,
+                "active_users": {"$size": "$users"},
+            }},
+        ]
+        return self._aggregate("users_loggings", pipeline)
+
+    def top_failing_ips(self, hours: int = 24, limit: int = 20, now: Optional[datetime] = None) -> Iterator[dict]:
+        """Fenêtre relative à *now* : jamais mise en cache."""
+        now = now or datetime.utcnow()
+        hours = _bounded(hours, LOG_RETENTION_DAYS * 24)
+        limit = _bounded(limit, MAX_FAILING_IPS)
+        pipeline = [
+            {"$match": {
+                "timestamp": {"$gte": now - timedelta(hours=hours), "$lt": now},
+                "event_type": "login",
+                "details.status": {"$in": ["fail", "locked"]},
+            }},
+            {"$group": {
+                "_id": {"$ifNull": ["$details.ip", "$http_metadata.ip"]},
+                "failures": {"$sum": 1},
+                "emails": {"$addToSet": "$email"},
+                "last_seen": {"$max": "$timestamp"},
+            }},
+            {"$sort": {"failures": -1, "_id": 1}},
+            {"$limit": limit},
+            {"$project": {
+                "_id": 0,
+                "ip": "$_id",
+                "failures": 1,
+                "distinct_emails": {"$size": "$emails"},
+                "last_seen": 1,
+            }},
+        ]
+        return self._aggregate("users_loggings", pipeline)
+
+    # ------------------------------------------------------------------ #
+    # Actions
+    # ------------------------------------------------------------------ #
+    def daily_actions(self, days: int = 30, now: Optional[datetime] = None) -> Iterator[dict]:
+        """Un bucket par jour : ``{"day", "total", "by_type": {event_type: n}}``."""
+        return self._daily_series("actions", self._action_buckets, days, now, _empty_action_bucket)
+
+    def _action_buckets(self, start: datetime, end: datetime) -> Iterator[dict]:
+        pipeline = [
+            {"$match": {"timestamp": {"$gte": start, "$lt": end}}},
+            {"$group": {"_id": {"day": _day_bucket(), "type": "$event_type"}, "n": {"$sum": 1}}},
+            {"$sort": {"_id.day": 1}},
+        ]
+        # Un document par (jour, type), triés par jour : regroupement en flux
+        current = None
+        for row in self._aggregate("user_actions", pipeline):
+            day = row["_id"]["day"]
+            if current is None or current["day"] != day:
+                if current is not None:
+                    yield current
+                current = _empty_action_bucket(day)
+            current["by_type"][row["_id"]["type"]] = row["n"]
+            current["total"] += row["n"]
+        if current is not None:
+            yield current
+
+    # ------------------------------------------------------------------ #
+    # Buckets quotidiens en cache
+    # ------------------------------------------------------------------ #
+    def _daily_series(
+        self,
+        name: str,
+        compute: Callable[[datetime, datetime], Iterator[dict]],
+        days: int,
+        now: Optional[datetime],
+        empty: Callable[[str], dict],
+    ) -> Iterator[dict]:
+        days = _bounded(days, LOG_RETENTION_DAYS)
+        today = _day_start(now or datetime.utcnow())
+        day_list = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+
+        cached = {}
+        for day in day_list[:-1]:
+            label = day.strftime(BUCKET_FORMAT)
+            bucket = self.cache.get(f"analytics:{name}:{label}")
+            if bucket is None:
+                break  # à partir d'ici, tout est recalculé d'un seul pipeline
+            cached[label] = bucket
+
+        start = day_list[len(cached)]
+        computed = {b["day"]: b for b in compute(start, today + timedelta(days=1))}
+
+        for day in day_list:
+            label = day.strftime(BUCKET_FORMAT)
+            if label in cached:
+                yield cached[label]
+                continue
+            bucket = computed.get(label) or empty(label)
+            if day < today:
+                self.cache.set(f"analytics:{name}:{label}", bucket, ttl=FINISHED_BUCKET_TTL)
+            yield bucket
+
+    def _aggregate(self, collection: str, pipeline: list):
+        return self.db[collection].aggregate(pipeline, batchSize=self.batch_size, allowDiskUse=True)
+
+
+def _empty_login_bucket(day: str) -> dict:
+    return {"day": day, "success": 0, "fail": 0, "locked": 0, "active_users": 0}
+
+
+def _empty_action_bucket(day: str) -> dict:
+    return {"day": day, "total": 0, "by_type": {}}
+
+
+def get_log_analytics() -> Optional[LogAnalytics]:
+    """``None`` si la journalisation Mongo n'est pas active sur cette instance."""
+    mongo_logger = current_app.extensions.get("mongo_logger")
+    if mongo_logger is None:
+        return None
+    return LogAnalytics(
+        mongo_logger.db,
+        get_cache(),
+        batch_size=current_app.config.get("ANALYTICS_BATCH_SIZE", 500),
+    )
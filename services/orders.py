@@ -0,0 +1,66 @@
+"""
+Lectures de l'espace client : historique et détail des commandes.
+
+Chaque page se sert en un nombre constant de requêtes, quel que soit le
+nombre de commandes ou de lignes :
+
+    • historique : 1 requête paginée par clé sur ``(order_date, order_id)``
+      (index ``ix_orders_user_status_date_id``) + 1 ``selectinload`` pour
+      les lignes, leurs livres et auteurs ;
+    • détail : 1 seule requête ``joinedload`` Order → lignes → livre → auteur.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from models.book_model import Book
+from models.order_details_model import OrderDetail
+from models.order_model import Order
+from services.pagination import KeysetPage, keyset_paginate
+
+PAID = "paid"
+HISTORY_PAGE_SIZE = 20
+
+
+def order_history(
+    user_id: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: int = HISTORY_PAGE_SIZE,
+    status: str = PAID,
+) -> KeysetPage:
+    """Commandes de *user_id*, de la plus récente à la plus ancienne."""
+    query = (
+        Order.query
+        .filter(Order.user_id == user_id, Order.payment_status == status)
+        .options(
+            selectinload(Order.details)
+            .joinedload(OrderDetail.book)
+            .joinedload(Book.author)
+        )
+    )
+    return keyset_paginate(
+        query,
+        [Order.order_date, Order.order_id],
+        per_page=per_page,
+        after=after,
+        before=before,
+        descending=True,
+    )
+
+
+def get_user_order(user_id: int, order_id: int) -> Optional[Order]:
+    """La commande *order_id* si elle appartient à *user_id*, sinon ``None``."""
+    return (
+        Order.query
+        .filter(Order.order_id == order_id, Order.user_id == user_id)
+        .options(
+            joinedload(Order.details)
+            .joinedload(OrderDetail.book)
+            .joinedload(Book.author)
+        )
+        .first()
+    )
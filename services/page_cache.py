@@ -0,0 +1,143 @@
+"""
+Cache des pages publiques du catalogue (accueil, /books, fiche livre).
+
+    GET /books?sort=price-asc
+        clé = page:<version du catalogue>:/books?sort=price-asc
+        ├─ trouvée ─▶ HTML stocké + trous personnels remplis ─▶ réponse
+        └─ absente ─▶ vue rendue avec des trous à la place des fragments
+                      personnels ─▶ stockée (200 uniquement) ─▶ trous remplis
+
+    • les parties propres à l'utilisateur (menu connexion, compteur et
+      fenêtre du panier) sont des fragments : ``{{ user_fragment('…') }}``
+      dans les templates. Pendant le remplissage du cache ils laissent un
+      marqueur ``<!--fragment:…-->``, rendu ensuite pour chaque requête
+      (panier lu via ``services.cart_snapshot``, lui-même en cache) ;
+    • la clé contient la version du catalogue : une écriture admin
+      (``invalidate_catalogue()``) périme toutes les pages d'un coup. Elle
+      contient aussi les validateurs de l'ETag : la page en cache est
+      toujours au moins aussi récente que l'ETag qui l'accompagne ;
+    • magasin choisi par ``PAGE_CACHE_URL`` (défaut : ``CACHE_URL``) :
+      ``memory://`` par processus, ``file:///…`` partagé entre les workers
+      d'une machine, ``redis://…`` entre machines. La version étant lue dans
+      le cache partagé (``CACHE_URL``), celui-ci doit être partagé lui aussi
+      pour qu'une écriture soit vue par tous les workers. Préfixe propre
+      (``plume:page:``, sous-dossier en ``file://``) : les pages ne purgent
+      jamais les entrées du cache applicatif ;
+    • pas de cache pour les requêtes autres que GET/HEAD ni quand un message
+      flash attend d'être affiché ; ``PAGE_CACHE_TTL=0`` désactive tout.
+
+En-tête ``X-Page-Cache: HIT | MISS`` pour le suivi.
+"""
+
+from __future__ import annotations
+
+from functools import wraps
+from typing import Callable
+from urllib.parse import urlencode
+import hashlib
+import re
+
+from flask import current_app, g, make_response, render_template, request, session
+from markupsafe import Markup
+
+from extensions.cache import build_cache
+from services.catalogue import catalogue_version
+
+# nom de fragment → template (rendu avec les context processors habituels)
+FRAGMENTS = {
+    "user_nav": "_user_nav.html",
+    "cart_modal": "_cart_modal.html",
+}
+_HOLE = re.compile(r"<!--fragment:([a-z_]+)-->")
+
+
+# ---------------------------------------------------------------------- #
+#  Fragments personnels
+# ---------------------------------------------------------------------- #
+def render_fragment(name: str) -> Markup:
+    return Markup(render_template(FRAGMENTS[name]))
+
+
+def user_fragment(name: str) -> Markup:
+    """Global Jinja : le fragment, ou son marqueur si la page part en cache."""
+    if name not in FRAGMENTS:
+        raise KeyError(f"Fragment inconnu : {name}")
+    if g.get("page_cache_fill"):
+        return Markup(f"<!--fragment:{name}-->")
+    return render_fragment(name)
+
+
+def fill_fragments(body: str) -> str:
+    rendered = {}
+
+    def replace(match) -> str:
+        name = match.group(1)
+        if name not in FRAGMENTS:
+            return match.group(0)
+        if name not in rendered:
+            rendered[name] = render_fragment(name)
+        return rendered[name]
+
+    return _HOLE.sub(replace, body)
+
+
+# ---------------------------------------------------------------------- #
+#  Décorateur de vue
+# ---------------------------------------------------------------------- #
+def page_cache_key() -> str:
+    args = urlencode(sorted(request.args.items(multi=True)))
+    # Validateurs de l'ETag (services.conditional), s'il y en a
+    parts = "|".join(str(part) for part in g.get("page_validators", ()))
+    stamp = hashlib.sha1(parts.encode("utf-8")).hexdigest()[:12]
+    return f"page:{catalogue_version()}:{stamp}:{request.path}?{args}"
+
+
+def _cacheable() -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and current_app.config["PAGE_CACHE_TTL"] > 0
+        and "_flashes" not in session
+    )
+
+
+def cached_page(view: Callable) -> Callable:
+    """Sert la page depuis le cache ; seuls les trous personnels sont rendus."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _cacheable():
+            return view(*args, **kwargs)
+
+        store = current_app.extensions["page_cache"]
+        key = page_cache_key()
+        entry = store.get(key)
+        if entry is not None:
+            response = current_app.response_class(fill_fragments(entry["body"]), mimetype=entry["mimetype"])
+            response.headers["X-Page-Cache"] = "HIT"
+            return response
+
+        g.page_cache_fill = True
+        try:
+            response = make_response(view(*args, **kwargs))
+        finally:
+            g.page_cache_fill = False
+        if response.status_code != 200 or response.direct_passthrough:
+            return response
+
+        body = response.get_data(as_text=True)
+        store.set(key, {"body": body, "mimetype": response.mimetype}, ttl=current_app.config["PAGE_CACHE_TTL"])
+        response.set_data(fill_fragments(body))
+        response.headers["X-Page-Cache"] = "MISS"
+        return response
+
+    return wrapper
+
+
+def init_page_cache(app) -> None:
+    app.extensions["page_cache"] = build_cache(
+        app.config.get("PAGE_CACHE_URL") or app.config.get("CACHE_URL"),
+        maxsize=app.config.get("PAGE_CACHE_MAXSIZE", 512),
+        default_ttl=app.config["PAGE_CACHE_TTL"],
+        prefix="plume:page:",
+    )
+    app.add_template_global(user_fragment)
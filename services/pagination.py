@@ -0,0 +1,141 @@
+"""
+Pagination par clé (« keyset » / seek) réutilisable :
+
+    page = keyset_paginate(query, [Book.book_price, Book.book_id], per_page=9,
+                           after=request.args.get("after"))
+
+Au lieu d'un ``OFFSET n`` (qui relit les n premières lignes), on filtre sur
+``(clé de tri, id) > (dernière valeur vue)`` : la page 1 000 coûte autant
+que la page 1 tant qu'un index couvre les colonnes de tri.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+import base64
+import json
+
+from sqlalchemy import tuple_
+
+
+class KeysetPage:
+    """Une page de résultats + curseurs opaques pour naviguer."""
+
+    def __init__(
+        self,
+        items: list,
+        next_cursor: Optional[str] = None,
+        prev_cursor: Optional[str] = None,
+        total: Optional[int] = None,
+    ):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+# ---------------------------------------------------------------------- #
+#  Curseurs
+# ---------------------------------------------------------------------- #
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str], columns: Sequence) -> Optional[list]:
+    """Décode un curseur ; ``None`` si absent ou invalide (→ première page)."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            return None
+        return [_coerce(col, v) for col, v in zip(columns, values)]
+    except (ValueError, TypeError):
+        return None
+
+
+def _coerce(column, value):
+    """Reconvertit les dates sérialisées en ISO vers le type de la colonne."""
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+# ---------------------------------------------------------------------- #
+#  Pagination
+# ---------------------------------------------------------------------- #
+def keyset_paginate(
+    query,
+    columns: Sequence,
+    per_page: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    descending: bool = False,
+    total: Optional[int] = None,
+) -> KeysetPage:
+    """
+    Pagine *query* sur *columns* (la dernière doit être unique, ex. l'id).
+
+    Toutes les colonnes partagent le même sens de tri, ce qui permet une
+    comparaison de tuples ``(a, b) > (x, y)`` servie directement par un index
+    composite.
+    """
+    key = tuple_(*columns)
+    after_values = decode_cursor(after, columns)
+    before_values = decode_cursor(before, columns) if after_values is None else None
+    backwards = before_values is not None
+
+    # En reculant, on inverse le sens puis on remet la page à l'endroit
+    reverse = descending != backwards
+    order = [c.desc() if reverse else c.asc() for c in columns]
+
+    if after_values is not None:
+        query = query.filter(key < tuple_(*after_values) if descending else key > tuple_(*after_values))
+    elif backwards:
+        query = query.filter(key > tuple_(*before_values) if descending else key < tuple_(*before_values))
+
+    rows = query.order_by(*order).limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def cursor_of(item):
+        return encode_cursor([_value_of(item, col) for col in columns])
+
+    if backwards:
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, after_values is not None
+
+    return KeysetPage(
+        rows,
+        next_cursor=cursor_of(rows[-1]) if rows and has_next else None,
+        prev_cursor=cursor_of(rows[0]) if rows and has_prev else None,
+        total=total,
+    )
+
+
+def _value_of(item, column):
+    # Entité ORM (attribut du même nom) ou ligne nommée (Row._mapping)
+    name = column.key
+    if hasattr(item, name):
+        return getattr(item, name)
+    return item._mapping[column]
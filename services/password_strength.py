@@ -0,0 +1,87 @@
+"""
+Analyse de robustesse des mots de passe (zxcvbn), pour la validation en
+temps réel de l'inscription.
+
+    • une seule passe zxcvbn par mot de passe (règles + score + conseils) ;
+    • entrée tronquée à ``MAX_ANALYZED_LENGTH`` caractères pour zxcvbn : son
+      coût explose avec la longueur (~25 ms à 64 car., ~270 ms à 200, et
+      une erreur au-delà de quelques centaines) ;
+    • petit LRU des derniers résultats, clé = HMAC-SHA256 avec une clé
+      aléatoire propre au processus : jamais de mot de passe en clair ni
+      d'empreinte réutilisable hors du processus ;
+    • évaluation par lot (``analyze_many``).
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence
+import hashlib
+import hmac
+import re
+import secrets
+
+from extensions.cache import LRUCache
+
+MIN_LENGTH = 12
+MIN_SCORE = 3  # sur 4
+MAX_ANALYZED_LENGTH = 64
+MAX_BATCH = 20
+
+_KEY = secrets.token_bytes(32)
+_results = LRUCache(maxsize=512, default_ttl=600)
+
+RULES = (
+    ("length", lambda p: len(p) >= MIN_LENGTH, f"Le mot de passe doit contenir au moins {MIN_LENGTH} caractères"),
+    ("uppercase", lambda p: re.search(r"[A-Z]", p) is not None, "Le mot de passe doit contenir au moins une majuscule"),
+    ("lowercase", lambda p: re.search(r"[a-z]", p) is not None, "Le mot de passe doit contenir au moins une minuscule"),
+    ("digit", lambda p: re.search(r"\d", p) is not None, "Le mot de passe doit contenir au moins un chiffre"),
+    ("special", lambda p: re.search(r"[^A-Za-z0-9]", p) is not None, "Le mot de passe doit contenir au moins un caractère spécial"),
+)
+
+
+def _cache_key(password: str, user_inputs: Sequence[str]) -> str:
+    message = "\x00".join([password, *user_inputs]).encode()
+    return hmac.new(_KEY, message, hashlib.sha256).hexdigest()
+
+
+def analyze(password: str, user_inputs: Optional[Sequence[str]] = None) -> dict:
+    """``{valid, errors, requirements, score, feedback, crack_time}``."""
+    user_inputs = [u for u in (user_inputs or ()) if isinstance(u, str) and u]
+    key = _cache_key(password, user_inputs)
+    result = _results.get(key)
+    if result is None:
+        result = _analyze(password, user_inputs)
+        _results.set(key, result)
+    return result
+
+
+def analyze_many(passwords: Iterable[str], user_inputs: Optional[Sequence[str]] = None) -> list:
+    return [analyze(p, user_inputs) for p in list(passwords)[:MAX_BATCH]]
+
+
+def _analyze(password: str, user_inputs: list) -> dict:
+    requirements = {name: check(password) for name, check, _ in RULES}
+    errors = [message for name, _, message in RULES if not requirements[name]]
+
+    if password:
+        import zxcvbn  # import différé (~35 ms), seulement à la première analyse
+
+        report = zxcvbn.zxcvbn(password[:MAX_ANALYZED_LENGTH], user_inputs=user_inputs)
+        score = report["score"]
+        feedback = report["feedback"]["suggestions"]
+        crack_time = report["crack_times_display"]["offline_slow_hashing_1e4_per_second"]
+    else:
+        score, feedback, crack_time = 0, [], None
+
+    requirements["common"] = score >= MIN_SCORE
+    if not requirements["common"]:
+        errors.append("Le mot de passe est trop commun ou facile à deviner")
+
+    return {
+        "valid": not errors,
+        "errors": errors,
+        "requirements": requirements,
+        "score": score,
+        "feedback": feedback,
+        "crack_time": crack_time,
+    }
@@ -0,0 +1,158 @@
+"""
+Hachage des mots de passe : algorithme et coût configurables, vérification
+hors du worker HTTP.
+
+    • ``PASSWORD_HASH_METHOD`` : toute méthode werkzeug (``scrypt:32768:8:1``,
+      ``pbkdf2:sha256:600000``…), réglée avec ``scripts/bench_passwords.py`` ;
+    • ``PASSWORD_VERIFY_WORKERS`` : taille du pool de processus qui exécute
+      les vérifications (0 = dans le thread courant). Le calcul ne tient
+      plus le GIL du worker : une rafale de connexions ne gèle plus les
+      autres routes ;
+    • file bornée (``PASSWORD_VERIFY_QUEUE``) : au-delà, ``HasherBusy`` est
+      levée tout de suite plutôt que d'empiler les requêtes ;
+    • délai dépassé ou pool cassé (processus fils tué) : ``HasherBusy``
+      aussi, et un pool cassé est recréé à l'appel suivant ;
+    • re-hachage transparent à la connexion quand la méthode configurée a
+      changé (``verify_and_update``).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+from typing import Optional
+import multiprocessing
+import os
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+class HasherBusy(RuntimeError):
+    """Trop de vérifications en attente : la requête doit être refusée (503)."""
+
+
+def _method_of(password_hash: str) -> str:
+    return password_hash.split("$", 1)[0]
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        method: str = DEFAULT_METHOD,
+        workers: int = 0,
+        max_pending: Optional[int] = None,
+        timeout: float = 10.0,
+    ):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending or max(workers, 1) * 8
+        self._canonical: Optional[str] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = Lock()
+        self._slots = BoundedSemaphore(self.max_pending)
+
+    # ------------------------------------------------------------------ #
+    # API
+    # ------------------------------------------------------------------ #
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        if not password_hash:
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return _method_of(password_hash) != self.canonical_method
+
+    def verify_and_update(self, user, password: str) -> bool:
+        """Vérifie et, si besoin, re-hache avec la méthode courante (commit à la charge de l'appelant)."""
+        if not self.verify(user.user_password, password):
+            return False
+        if self.needs_rehash(user.user_password):
+            user.user_password = self.hash(password)
+        return True
+
+    @property
+    def canonical_method(self) -> str:
+        # « scrypt » → « scrypt:32768:8:1 » : forme réellement écrite par werkzeug
+        if self._canonical is None:
+            self._canonical = _method_of(generate_password_hash("", self.method))
+        return self._canonical
+
+    def shutdown(self) -> None:
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    # ------------------------------------------------------------------ #
+    # Exécution (pool de processus propre à chaque worker)
+    # ------------------------------------------------------------------ #
+    def _run(self, func, *args):
+        if self.workers <= 0:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy("File de vérification des mots de passe saturée")
+        try:
+            pool = self._executor()
+            return pool.submit(func, *args).result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HasherBusy("Vérification du mot de passe trop lente") from None
+        except BrokenProcessPool:
+            self._discard(pool)
+            raise HasherBusy("Pool de vérification interrompu") from None
+        finally:
+            self._slots.release()
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        # Un seul thread remplace le pool, les autres le trouvent déjà neuf
+        with self._lock:
+            if self._pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Jamais hérité d'un fork (Gunicorn) : un pool par processus
+        if self._pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    methods = multiprocessing.get_all_start_methods()
+                    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                    self._pid = os.getpid()
+        return self._pool
+
+
+# ---------------------------------------------------------------------- #
+#  Intégration Flask
+# ---------------------------------------------------------------------- #
+_fallback = PasswordHasher()
+
+
+def init_passwords(app) -> None:
+    app.extensions["password_hasher"] = PasswordHasher(
+        method=app.config["PASSWORD_HASH_METHOD"],
+        workers=app.config["PASSWORD_VERIFY_WORKERS"],
+        max_pending=app.config["PASSWORD_VERIFY_QUEUE"],
+    )
+
+
+def get_hasher() -> PasswordHasher:
+    """Hacheur de l'application, ou hacheur local hors contexte (scripts)."""
+    if has_app_context():
+        return current_app.extensions.get("password_hasher", _fallback)
+    return _fallback
+
+
+def hash_password(password: str) -> str:
+    return get_hasher().hash(password)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    return get_hasher().verify(password_hash, password)
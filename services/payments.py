@@ -0,0 +1,116 @@
+"""
+Sessions Stripe Checkout, une par commande et réutilisée.
+
+    clic « Payer » ─▶ session encore ouverte sur la commande ? ─oui─▶ URL stockée
+                                         │ non
+                                         ▼
+                      client.create_session(…, idempotency_key)
+                      → id / url / expires_at enregistrés sur Order
+
+    • un second clic ne refait aucun appel réseau tant que la session n'a
+      pas expiré ;
+    • la clé d'idempotence dérive de la commande, du montant, de la
+      session précédente et du créneau de 5 minutes de la demande, dont
+      ``expires_at`` est aussi déduit : un double envoi ou une nouvelle
+      tentative envoie exactement les mêmes paramètres sous la même clé et
+      ne crée qu'une session chez Stripe, une session expirée est bien
+      renouvelée ;
+    • le client réseau est injectable (``init_payments(app, client=…)``) :
+      par défaut la passerelle ``extensions.stripe_gateway``, un faux local
+      dans les tests.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Optional
+import time
+
+from flask import current_app
+
+from extensions.stripe_gateway import get_stripe
+
+from models.order_model import Order
+
+# Marge avant expiration : on ne renvoie pas vers une session sur le point d'expirer
+REUSE_MARGIN = timedelta(minutes=2)
+# Créneau (s) partagé par la clé d'idempotence et expires_at
+SESSION_SLOT = 300
+# Stripe n'accepte qu'un expires_at compris entre +30 min et +24 h
+STRIPE_MIN_TTL, STRIPE_MAX_TTL = 30 * 60, 24 * 3600
+
+
+def init_payments(app, client=None) -> None:
+    """*client* : tout objet exposant ``create_session(params, idempotency_key)``."""
+    app.extensions["payments_client"] = client
+
+
+def get_payments_client():
+    return current_app.extensions.get("payments_client") or get_stripe()
+
+
+def amount_cents(order: Order) -> int:
+    return int(round(order.total_price * 100))
+
+
+def session_slot(now: Optional[float] = None) -> int:
+    """Début (epoch) du créneau de ``SESSION_SLOT`` secondes contenant *now*."""
+    now = int(time.time() if now is None else now)
+    return now - now % SESSION_SLOT
+
+
+def session_expires_at(slot: int, ttl: int) -> int:
+    """Identique pour tout le créneau, et dans la plage acceptée par Stripe."""
+    ttl = max(STRIPE_MIN_TTL, min(ttl, STRIPE_MAX_TTL - SESSION_SLOT))
+    return slot + SESSION_SLOT + ttl
+
+
+def idempotency_key(order: Order, slot: int) -> str:
+    previous = order.stripe_session_id or "new"
+    return f"checkout-{order.order_id}-{amount_cents(order)}-{previous}-{slot}"
+
+
+def reusable_session_url(order: Order, now: Optional[datetime] = None) -> Optional[str]:
+    now = now or datetime.utcnow()
+    if order.stripe_session_url and order.stripe_session_expires_at and order.stripe_session_expires_at > now + REUSE_MARGIN:
+        return order.stripe_session_url
+    return None
+
+
+def checkout_session_url(order: Order, success_url: str, cancel_url: str) -> str:
+    """
+    URL de paiement de *order*, en réutilisant la session ouverte si possible.
+
+    Les champs ``stripe_session_*`` sont modifiés sur la commande : le commit
+    reste à la charge de l'appelant.
+    """
+    url = reusable_session_url(order)
+    if url:
+        return url
+
+    slot = session_slot()
+    ttl = current_app.config.get("STRIPE_CHECKOUT_TTL", 3600)
+    params = {
+        "payment_method_types": ["card"],
+        "line_items": [{
+            "price_data": {
+                "currency": "eur",
+                "product_data": {"name": f"Commande {order.order_id}"},
+                "unit_amount": amount_cents(order),
+            },
+            "quantity": 1,
+        }],
+        "mode": "payment",
+        # Relie l'événement webhook à la commande (cf. services.webhooks)
+        "client_reference_id": str(order.order_id),
+        "metadata": {"order_id": order.order_id},
+        "success_url": success_url,
+        "cancel_url": cancel_url,
+        "expires_at": session_expires_at(slot, ttl),
+    }
+    session = get_payments_client().create_session(params, idempotency_key(order, slot))
+
+    order.stripe_session_id = session["id"]
+    order.stripe_session_url = session["url"]
+    order.stripe_session_expires_at = datetime.utcfromtimestamp(session["expires_at"])
+    return session["url"]
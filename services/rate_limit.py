@@ -0,0 +1,103 @@
+"""
+Limitation de débit côté serveur pour la connexion.
+
+Compteurs à fenêtre glissante (approximation « sliding window counter » :
+fenêtre courante + fenêtre précédente pondérée), deux entiers par clé, posés
+dans un backend ``extensions.cache`` :
+
+    • ``memory://``  : un seul processus ;
+    • ``redis://…``  : partagé entre tous les workers Gunicorn / hôtes.
+
+Deux clés pour la connexion : l'IP (échecs toutes adresses confondues) et
+l'email (échecs sur un même compte, l'email est haché dans la clé). Le
+contrôle a lieu avant toute requête SQL et tout hachage : une rafale
+abusive ne coûte que deux lectures de compteurs.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+import hashlib
+import math
+import time
+
+from flask import current_app
+
+from extensions.cache import build_cache
+
+
+class SlidingWindowLimiter:
+    def __init__(self, store, name: str, limit: int, window: int):
+        self.store = store
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def _keys(self, ident: str, now: float):
+        index = int(now // self.window)
+        prefix = f"rl:{self.name}:{ident}:"
+        return prefix + str(index), prefix + str(index - 1), now - index * self.window
+
+    def retry_after(self, ident: str, now: Optional[float] = None) -> int:
+        """0 si *ident* peut encore essayer, sinon l'attente en secondes."""
+        now = time.time() if now is None else now
+        current_key, previous_key, elapsed = self._keys(ident, now)
+        current = int(self.store.get(current_key) or 0)
+        previous = int(self.store.get(previous_key) or 0)
+        weight = 1 - elapsed / self.window
+        if previous * weight + current < self.limit:
+            return 0
+        if current >= self.limit or not previous:
+            return max(1, math.ceil(self.window - elapsed))
+        # Attente jusqu'à ce que la part de la fenêtre précédente repasse sous la limite
+        wait = self.window * (1 - (self.limit - current) / previous) - elapsed
+        return max(1, math.ceil(wait))
+
+    def hit(self, ident: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        current_key, _, _ = self._keys(ident, now)
+        self.store.incr(current_key, 1, ttl=2 * self.window)
+
+    def reset(self, ident: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        current_key, previous_key, _ = self._keys(ident, now)
+        self.store.delete(current_key, previous_key)
+
+
+def _email_key(email: str) -> str:
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+class LoginRateLimiter:
+    def __init__(self, store, ip_limit: int = 20, email_limit: int = 5, window: int = 300):
+        self.by_ip = SlidingWindowLimiter(store, "login-ip", ip_limit, window)
+        self.by_email = SlidingWindowLimiter(store, "login-email", email_limit, window)
+
+    def blocked_for(self, ip: str, email: str) -> int:
+        """À appeler avant toute recherche en base ; 0 = autorisé."""
+        return max(self.by_ip.retry_after(ip or "-"), self.by_email.retry_after(_email_key(email)))
+
+    def failure(self, ip: str, email: str) -> None:
+        self.by_ip.hit(ip or "-")
+        self.by_email.hit(_email_key(email))
+
+    def success(self, email: str) -> None:
+        self.by_email.reset(_email_key(email))
+
+
+def init_rate_limits(app) -> None:
+    store = build_cache(
+        app.config.get("RATE_LIMIT_URL") or app.config.get("CACHE_URL"),
+        maxsize=app.config.get("RATE_LIMIT_MAXSIZE", 100_000),
+        default_ttl=None,
+    )
+    app.extensions["login_limiter"] = LoginRateLimiter(
+        store,
+        ip_limit=app.config["LOGIN_IP_LIMIT"],
+        email_limit=app.config["LOGIN_EMAIL_LIMIT"],
+        window=app.config["LOGIN_WINDOW"],
+    )
+
+
+def get_login_limiter() -> LoginRateLimiter:
+    return current_app.extensions["login_limiter"]
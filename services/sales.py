@@ -0,0 +1,302 @@
+"""
+Agrégats de ventes matérialisés.
+
+    • ``book_sales_stats``        : unités, CA et dernière vente par livre ;
+    • ``category_daily_revenue``  : CA payé par catégorie et par jour ;
+    • ``Book.sales_count``        : copie dénormalisée des unités, clé de tri
+      « popularité » indexée de la galerie.
+
+Tout est mis à jour de façon incrémentale au moment où une commande passe
+à « paid », dans la même transaction. ``flask sales backfill`` reconstruit
+l'ensemble depuis l'historique (lu par lots de commandes) et le remplace en
+une seule transaction.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import and_, bindparam, case, delete, func, or_, select, text
+from sqlalchemy.exc import IntegrityError
+
+from models import db
+from models.book_model import Book
+from models.category_model import Category
+from models.order_details_model import OrderDetail
+from models.order_model import Order
+from models.sales_stats_model import BookSalesStats, CategoryDailyRevenue
+
+PAID = "paid"
+
+
+# ---------------------------------------------------------------------- #
+#  Transition de paiement
+# ---------------------------------------------------------------------- #
+def mark_order_paid(order: Order) -> bool:
+    """
+    Passe *order* à « paid » et répercute ses lignes dans les agrégats.
+
+    Idempotent : renvoie ``False`` (sans rien toucher) si la commande était
+    déjà payée, ce qui évite de compter deux fois un rechargement de page.
+    Le commit reste à la charge de l'appelant.
+    """
+    if order.payment_status == PAID:
+        return False
+    order.payment_status = PAID
+    record_paid_order(order)
+    return True
+
+
+def record_paid_order(order: Order) -> None:
+    lines = (
+        db.session.query(
+            OrderDetail.book_id,
+            Book.category_id,
+            OrderDetail.quantity,
+            OrderDetail.unit_price,
+        )
+        .join(Book, Book.book_id == OrderDetail.book_id)
+        .filter(OrderDetail.order_id == order.order_id)
+    )
+    sold_at = order.order_date or datetime.utcnow()
+    _apply_rollup((book_id, category_id, sold_at, qty, price) for book_id, category_id, qty, price in lines)
+
+
+# ---------------------------------------------------------------------- #
+#  Application d'un lot de lignes vendues
+# ---------------------------------------------------------------------- #
+def _new_rollup() -> tuple:
+    """(par livre : [unités, CA, dernière vente], par (catégorie, jour) : [unités, CA])."""
+    return defaultdict(lambda: [0, 0.0, None]), defaultdict(lambda: [0, 0.0])
+
+
+def _accumulate(rollup: tuple, lines: Iterable[tuple]) -> int:
+    """*lines* : (book_id, category_id, sold_at, quantity, unit_price)."""
+    per_book, per_category_day = rollup
+    count = 0
+    for book_id, category_id, sold_at, quantity, unit_price in lines:
+        count += 1
+        revenue = quantity * unit_price
+        stats = per_book[book_id]
+        stats[0] += quantity
+        stats[1] += revenue
+        if stats[2] is None or sold_at > stats[2]:
+            stats[2] = sold_at
+        daily = per_category_day[(category_id, sold_at.date())]
+        daily[0] += quantity
+        daily[1] += revenue
+    return count
+
+
+def _rollup_rows(rollup: tuple) -> tuple:
+    per_book, per_category_day = rollup
+    return (
+        [{"book_id": b, "units_sold": u, "revenue": r, "last_sold_at": t} for b, (u, r, t) in per_book.items()],
+        [{"category_id": c, "day": d, "units_sold": u, "revenue": r} for (c, d), (u, r) in per_category_day.items()],
+    )
+
+
+def _add_sales_count(per_book: dict) -> None:
+    books = Book.__table__
+    db.session.execute(
+        books.update()
+        .where(books.c.book_id == bindparam("b_id"))
+        .values(sales_count=books.c.sales_count + bindparam("qty")),
+        [{"b_id": b, "qty": u} for b, (u, _, _) in per_book.items()],
+    )
+
+
+def _apply_rollup(lines: Iterable[tuple]) -> int:
+    """Ajoute *lines* aux agrégats existants (paiement d'une commande)."""
+    rollup = _new_rollup()
+    count = _accumulate(rollup, lines)
+    if not count:
+        return 0
+
+    book_rows, daily_rows = _rollup_rows(rollup)
+    _upsert_add(BookSalesStats, book_rows, keys=["book_id"], latest="last_sold_at")
+    _upsert_add(CategoryDailyRevenue, daily_rows, keys=["category_id", "day"])
+    _add_sales_count(rollup[0])
+    return count
+
+
+def _upsert_add(model, rows: list, keys: list, latest: str | None = None) -> None:
+    """INSERT … ON CONFLICT DO UPDATE : additionne units_sold / revenue."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        greatest = func.greatest
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        greatest = func.max
+    else:
+        _locked_upsert_add(model, rows, keys, latest)
+        return
+
+    table = model.__table__
+    stmt = insert(table)
+    updates = {
+        "units_sold": table.c.units_sold + stmt.excluded.units_sold,
+        "revenue": table.c.revenue + stmt.excluded.revenue,
+    }
+    if latest:
+        current = func.coalesce(table.c[latest], stmt.excluded[latest])
+        updates[latest] = greatest(current, stmt.excluded[latest])
+    db.session.execute(stmt.on_conflict_do_update(index_elements=keys, set_=updates), rows)
+
+
+def _locked_upsert_add(model, rows: list, keys: list, latest: str | None = None) -> None:
+    """
+    Même effet que ``_upsert_add`` sans ON CONFLICT : ligne verrouillée
+    (``SELECT … FOR UPDATE``) puis UPDATE, ou INSERT dans un savepoint. Si
+    une autre transaction insère la même clé entre-temps, on retombe sur
+    l'UPDATE.
+    """
+    table = model.__table__
+    for row in rows:
+        match = and_(*(table.c[k] == row[k] for k in keys))
+        exists = db.session.execute(select(*(table.c[k] for k in keys)).where(match).with_for_update()).first()
+        if exists is None:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(table.insert().values(**row))
+                continue
+            except IntegrityError:
+                pass
+
+        updates = {
+            "units_sold": table.c.units_sold + row["units_sold"],
+            "revenue": table.c.revenue + row["revenue"],
+        }
+        if latest:
+            column = table.c[latest]
+            updates[latest] = case((or_(column.is_(None), column < row[latest]), row[latest]), else_=column)
+        db.session.execute(table.update().where(match).values(**updates))
+
+
+# ---------------------------------------------------------------------- #
+#  Reconstruction complète
+# ---------------------------------------------------------------------- #
+def _lock_rollup_tables() -> None:
+    """
+    Bloque les paiements concurrents jusqu'au commit de la reconstruction.
+
+    PostgreSQL : ``EXCLUSIVE`` laisse passer les lectures (tableaux de bord,
+    galerie) mais fait attendre l'upsert de ``record_paid_order`` ; une
+    commande payée pendant la reconstruction est donc soit déjà visible par
+    le parcours, soit ajoutée après coup — jamais perdue ni comptée deux
+    fois. SQLite n'a qu'un écrivain : le DELETE qui suit suffit.
+    """
+    if db.session.get_bind().dialect.name == "postgresql":
+        db.session.execute(text(
+            f"LOCK TABLE {BookSalesStats.__tablename__}, {CategoryDailyRevenue.__tablename__} IN EXCLUSIVE MODE"
+        ))
+
+
+def backfill(chunk_size: int = 1000, echo=None) -> int:
+    """
+    Reconstruit les agrégats depuis toutes les commandes payées.
+
+    Parcours par clé sur ``order_id`` (pas d'OFFSET), lignes lues en flux
+    (``yield_per``) et cumulées en mémoire — bornée par le nombre de livres
+    et de (catégorie, jour), pas par l'historique. Les anciens agrégats
+    sont remplacés dans la même transaction : jusqu'au commit, les lecteurs
+    voient les chiffres précédents, jamais des zéros ou un état partiel.
+    Le commit reste à la charge de l'appelant.
+    """
+    _lock_rollup_tables()
+    rollup = _new_rollup()
+
+    last_order_id, orders_done = 0, 0
+    while True:
+        order_ids = [
+            order_id
+            for (order_id,) in db.session.query(Order.order_id)
+            .filter(Order.payment_status == PAID, Order.order_id > last_order_id)
+            .order_by(Order.order_id)
+            .limit(chunk_size)
+        ]
+        if not order_ids:
+            break
+
+        lines = (
+            db.session.query(
+                OrderDetail.book_id,
+                Book.category_id,
+                Order.order_date,
+                OrderDetail.quantity,
+                OrderDetail.unit_price,
+            )
+            .join(Order, Order.order_id == OrderDetail.order_id)
+            .join(Book, Book.book_id == OrderDetail.book_id)
+            .filter(OrderDetail.order_id.in_(order_ids))
+            .execution_options(yield_per=chunk_size)
+        )
+        _accumulate(rollup, (
+            (book_id, category_id, order_date or datetime.utcnow(), qty, price)
+            for book_id, category_id, order_date, qty, price in lines
+        ))
+
+        last_order_id = order_ids[-1]
+        orders_done += len(order_ids)
+        if echo:
+            echo(f"… {orders_done} commandes lues (jusqu'à #{last_order_id})")
+
+    book_rows, daily_rows = _rollup_rows(rollup)
+    db.session.execute(delete(BookSalesStats))
+    db.session.execute(delete(CategoryDailyRevenue))
+    db.session.execute(Book.__table__.update().values(sales_count=0))
+    for model, rows in ((BookSalesStats, book_rows), (CategoryDailyRevenue, daily_rows)):
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(model.__table__.insert(), rows[start:start + chunk_size])
+    if rollup[0]:
+        _add_sales_count(rollup[0])
+    return orders_done
+
+
+# ---------------------------------------------------------------------- #
+#  Lectures pour les tableaux de bord
+# ---------------------------------------------------------------------- #
+def top_sellers(limit: int = 10) -> list:
+    return (
+        db.session.query(Book.book_title, BookSalesStats.units_sold, BookSalesStats.revenue)
+        .join(Book, Book.book_id == BookSalesStats.book_id)
+        .order_by(BookSalesStats.units_sold.desc(), BookSalesStats.book_id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def revenue_by_category(days: int = 30) -> list:
+    since = date.today() - timedelta(days=days)
+    return (
+        db.session.query(
+            Category.category_name,
+            func.sum(CategoryDailyRevenue.units_sold).label("units_sold"),
+            func.sum(CategoryDailyRevenue.revenue).label("revenue"),
+        )
+        .join(Category, Category.category_id == CategoryDailyRevenue.category_id)
+        .filter(CategoryDailyRevenue.day >= since)
+        .group_by(Category.category_name)
+        .order_by(func.sum(CategoryDailyRevenue.revenue).desc())
+        .all()
+    )
+
+
+# ---------------------------------------------------------------------- #
+#  CLI : flask sales backfill
+# ---------------------------------------------------------------------- #
+sales_cli = AppGroup("sales", help="Agrégats de ventes matérialisés.")
+
+
+@sales_cli.command("backfill")
+@click.option("--chunk-size", default=1000, show_default=True, help="Commandes par lot.")
+def backfill_command(chunk_size: int):
+    """Reconstruit book_sales_stats / category_daily_revenue / Book.sales_count."""
+    total = backfill(chunk_size=chunk_size, echo=click.echo)
+    db.session.commit()
+    click.echo(f"✅ {total} commandes payées agrégées.")
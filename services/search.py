@@ -0,0 +1,212 @@
+"""
+Recherche plein texte sur le catalogue (titre + prénom/nom de l'auteur).
+
+    • Normalisation « à la française » : minuscules, accents retirés,
+      ligatures (œ, æ) dépliées, élisions (l', d', qu'…) supprimées.
+    • ``Book.search_document`` stocke le texte normalisé, tenu à jour par
+      les écritures admin (``index_book`` / ``reindex_author`` avant commit,
+      ``refresh_index`` / ``unindex_book`` après) : l'index en mémoire ne
+      voit jamais une écriture annulée.
+    • PostgreSQL : ``to_tsvector('simple', search_document)`` + index GIN,
+      requête ``to_tsquery`` avec préfixes (``mot:*``).
+    • ``search_condition`` : critère WHERE à combiner avec les filtres et le
+      tri de la galerie, sans liste d'ids tronquée au préalable.
+    • Autres bases (SQLite) : index inversé en mémoire, construit à la première
+      recherche puis mis à jour incrémentalement — jamais de ``LIKE '%…%'``.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from threading import Lock
+from typing import Optional
+import re
+import unicodedata
+
+from flask import current_app
+from sqlalchemy import false, func
+
+from models import db
+from models.author_model import Author
+from models.book_model import Book
+
+_ELISION = re.compile(r"\b(?:l|d|j|m|n|s|t|c|qu|jusqu|lorsqu|puisqu)['’]")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "ß": "ss"})
+
+
+# ---------------------------------------------------------------------- #
+#  Normalisation
+# ---------------------------------------------------------------------- #
+def fold(text: str) -> str:
+    text = (text or "").lower().translate(_LIGATURES)
+    text = _ELISION.sub(" ", text)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(fold(text))
+
+
+def build_document(title: str, firstname: str = "", lastname: str = "") -> str:
+    return " ".join(tokenize(f"{title} {firstname} {lastname}"))
+
+
+# ---------------------------------------------------------------------- #
+#  Index inversé en mémoire (repli hors PostgreSQL)
+# ---------------------------------------------------------------------- #
+class InvertedIndex:
+    """token → {book_id}, avec vocabulaire trié pour la recherche par préfixe."""
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = {}
+        self._documents: dict[int, tuple[str, ...]] = {}
+        self._vocabulary: list[str] = []
+        self._lock = Lock()
+
+    def add(self, book_id: int, document: str) -> None:
+        with self._lock:
+            self._remove(book_id)
+            tokens = tuple(set(document.split()))
+            self._documents[book_id] = tokens
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    insort(self._vocabulary, token)
+                postings.add(book_id)
+
+    def remove(self, book_id: int) -> None:
+        with self._lock:
+            self._remove(book_id)
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[int]:
+        """Tous les termes doivent matcher (ET), chacun en préfixe."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            matches = sorted((self._prefix_matches(t) for t in set(terms)), key=len)
+            result = set(matches[0])
+            for ids in matches[1:]:
+                result &= ids
+                if not result:
+                    break
+        ordered = sorted(result, reverse=True)
+        return ordered[:limit] if limit else ordered
+
+    def _prefix_matches(self, prefix: str) -> set[int]:
+        ids: set[int] = set()
+        start = bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            ids |= self._postings[token]
+        return ids
+
+    def _remove(self, book_id: int) -> None:
+        for token in self._documents.pop(book_id, ()):
+            postings = self._postings[token]
+            postings.discard(book_id)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+
+def _memory_index() -> InvertedIndex:
+    index = current_app.extensions.get("search_index")
+    if index is None:
+        index = InvertedIndex()
+        rows = (
+            db.session.query(Book.book_id, Book.search_document)
+            .filter(Book.search_document.isnot(None))
+            .execution_options(yield_per=1000)
+        )
+        for book_id, document in rows:
+            index.add(book_id, document)
+        current_app.extensions["search_index"] = index
+    return index
+
+
+def _uses_postgres() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+# ---------------------------------------------------------------------- #
+#  API
+# ---------------------------------------------------------------------- #
+def _tsquery_match(terms: list[str]):
+    # Les tokens sont [a-z0-9]+ : pas d'échappement tsquery nécessaire.
+    # Même expression que l'index GIN ix_book_search_document_fts.
+    tsquery = " & ".join(f"{t}:*" for t in terms)
+    vector = func.to_tsvector("simple", func.coalesce(Book.search_document, ""))
+    return vector.op("@@")(func.to_tsquery("simple", tsquery))
+
+
+def search_condition(query: str):
+    """Critère sur ``Book`` : tous les termes, chacun en préfixe, sans limite."""
+    terms = tokenize(query)
+    if not terms:
+        return false()
+    if not _uses_postgres():
+        return Book.book_id.in_(_memory_index().search(query))
+    return _tsquery_match(terms)
+
+
+def search_book_ids(query: str, limit: Optional[int] = None) -> list[int]:
+    """Les *limit* résultats les plus récents (id décroissant)."""
+    limit = limit or current_app.config["SEARCH_MAX_RESULTS"]
+    terms = tokenize(query)
+    if not terms:
+        return []
+
+    if not _uses_postgres():
+        return _memory_index().search(query, limit)
+
+    rows = (
+        db.session.query(Book.book_id)
+        .filter(_tsquery_match(terms))
+        .order_by(Book.book_id.desc())
+        .limit(limit)
+    )
+    return [book_id for (book_id,) in rows]
+
+
+def index_book(book: Book) -> None:
+    """Recalcule ``search_document`` (avant commit ; ``refresh_index`` après)."""
+    author = db.session.get(Author, book.author_id)
+    book.search_document = build_document(
+        book.book_title,
+        author.author_firstname if author else "",
+        author.author_lastname if author else "",
+    )
+
+
+def refresh_index(*books: Book) -> None:
+    """Après commit : reporte les documents dans l'index en mémoire."""
+    index = current_app.extensions.get("search_index")
+    if index is not None:
+        for book in books:
+            index.add(book.book_id, book.search_document)
+
+
+def unindex_book(book_id: int) -> None:
+    index = current_app.extensions.get("search_index")
+    if index is not None:
+        index.remove(book_id)
+
+
+def reindex_author(author: Author) -> list[Book]:
+    """Après renommage d'un auteur : recalcule ses livres (avant commit),
+    renvoyés pour ``refresh_index`` une fois le commit passé."""
+    books = Book.query.filter_by(author_id=author.author_id).all()
+    for book in books:
+        book.search_document = build_document(
+            book.book_title, author.author_firstname, author.author_lastname
+        )
+    return books
+
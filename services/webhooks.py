@@ -0,0 +1,264 @@
+"""
+Pipeline des webhooks Stripe.
+
+    POST /webhook/stripe ─▶ signature ─▶ INSERT processed_events ─▶ 200
+                                         (ON CONFLICT DO NOTHING)
+                                                   │
+                               worker local ◀──────┘  notify()
+                               lots de ``pending`` ─▶ transitions de commande
+
+    • idempotence : l'id d'événement Stripe est la clé primaire, un retry
+      ou un doublon ne crée jamais de seconde ligne ;
+    • la requête HTTP ne fait qu'un INSERT : une rafale de Stripe n'occupe
+      pas les workers Gunicorn ;
+    • la table est aussi la file : après un crash, les lignes ``pending``
+      sont reprises par le worker (relevé périodique) ou par
+      ``flask webhooks process``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+import logging
+import os
+import threading
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy.exc import IntegrityError
+
+from extensions.stripe_gateway import StripeGateway
+from models import db
+from models.order_model import Order
+from models.processed_event_model import ProcessedEvent
+from services.sales import PAID, mark_order_paid
+
+logger = logging.getLogger(__name__)
+
+FAILED = "failed"
+PENDING, DONE, IGNORED, ERROR = "pending", "done", "ignored", "error"
+
+
+def _completed_status(session) -> Optional[str]:
+    # Moyens de paiement différés : « completed » arrive avant l'encaissement
+    return PAID if session.get("payment_status") in ("paid", "no_payment_required") else None
+
+
+TRANSITIONS = {
+    "checkout.session.completed": _completed_status,
+    "checkout.session.async_payment_succeeded": lambda session: PAID,
+    "checkout.session.async_payment_failed": lambda session: FAILED,
+    "checkout.session.expired": lambda session: FAILED,
+}
+
+
+# ---------------------------------------------------------------------- #
+#  Réception
+# ---------------------------------------------------------------------- #
+def verify_event(payload: bytes, signature: str, secret: str, tolerance: int = 300):
+    """Lève ``ValueError`` / ``SignatureVerificationError`` si invalide."""
+    return StripeGateway.construct_event(payload, signature, secret, tolerance=tolerance)
+
+
+def _order_id_of(session) -> Optional[int]:
+    raw = session.get("client_reference_id") or (session.get("metadata") or {}).get("order_id")
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def enqueue_event(event) -> bool:
+    """
+    Enregistre *event* ; ``False`` si cet id a déjà été reçu.
+
+    Les types sans transition sont gardés (idempotence, audit) mais
+    directement marqués ``ignored``.
+    """
+    session = event["data"]["object"]
+    resolve = TRANSITIONS.get(event["type"])
+    target = resolve(session) if resolve else None
+    now = datetime.utcnow()
+    row = {
+        "event_id": event["id"],
+        "event_type": event["type"],
+        "order_id": _order_id_of(session),
+        "session_id": session.get("id"),
+        "target_status": target,
+        "status": PENDING if target else IGNORED,
+        "received_at": now,
+        "processed_at": None if target else now,
+    }
+    inserted = _insert_ignore(ProcessedEvent, row, key="event_id")
+    db.session.commit()
+    return inserted
+
+
+def _insert_ignore(model, row: dict, key: str) -> bool:
+    """INSERT … ON CONFLICT DO NOTHING ; ``True`` si la ligne est nouvelle."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(model.__table__.insert().values(**row))
+            return True
+        except IntegrityError:
+            return False
+
+    stmt = insert(model.__table__).values(**row).on_conflict_do_nothing(index_elements=[key])
+    return db.session.execute(stmt).rowcount == 1
+
+
+# ---------------------------------------------------------------------- #
+#  Traitement par lots
+# ---------------------------------------------------------------------- #
+def process_pending(batch_size: int = 100) -> int:
+    """
+    Applique un lot d'événements ``pending`` en une transaction.
+
+    ``SKIP LOCKED`` (PostgreSQL) : plusieurs workers se partagent la file
+    sans jamais traiter deux fois le même événement. Une commande payée
+    n'est jamais rétrogradée, quel que soit l'ordre d'arrivée, et l'échec
+    d'une session remplacée (cf. ``services.payments``) ne touche pas la
+    commande payée via la nouvelle.
+    """
+    events = (
+        ProcessedEvent.query
+        .filter(ProcessedEvent.status == PENDING)
+        .order_by(ProcessedEvent.received_at, ProcessedEvent.event_id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not events:
+        db.session.rollback()
+        return 0
+
+    order_ids = {e.order_id for e in events if e.order_id is not None}
+    orders = {
+        order.order_id: order
+        for order in Order.query
+        .filter(Order.order_id.in_(order_ids))
+        .order_by(Order.order_id)
+        .with_for_update()
+    } if order_ids else {}
+
+    now = datetime.utcnow()
+    for event in events:
+        order = orders.get(event.order_id)
+        if order is None:
+            event.status, event.error = ERROR, "Commande introuvable"
+        else:
+            event.status = DONE
+            if event.target_status == PAID:
+                mark_order_paid(order)
+            elif _superseded(event, order):
+                event.status = IGNORED
+            elif order.payment_status == "pending":
+                order.payment_status = FAILED
+        event.processed_at = now
+    db.session.commit()
+    return len(events)
+
+
+def _superseded(event: ProcessedEvent, order: Order) -> bool:
+    # Lignes antérieures à session_id, ou commande sans session connue : on applique
+    return bool(event.session_id and order.stripe_session_id and event.session_id != order.stripe_session_id)
+
+
+def drain(batch_size: int = 100) -> int:
+    total = 0
+    while True:
+        done = process_pending(batch_size)
+        total += done
+        if done < batch_size:
+            return total
+
+
+# ---------------------------------------------------------------------- #
+#  Worker local (thread par processus)
+# ---------------------------------------------------------------------- #
+class WebhookWorker:
+    def __init__(self, app, batch_size: int = 100, poll_interval: float = 30.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def notify(self) -> None:
+        self.start()
+        self._wake.set()
+
+    def start(self) -> None:
+        # Après un fork (Gunicorn), le thread du parent n'existe plus
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="stripe-webhooks", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            # Réveil immédiat sur notify(), sinon relevé périodique des restes
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    drain(self.batch_size)
+                except Exception:
+                    logger.exception("[webhooks] traitement du lot KO")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+
+def init_webhooks(app) -> None:
+    app.extensions["webhook_worker"] = WebhookWorker(
+        app,
+        batch_size=app.config["STRIPE_WEBHOOK_BATCH_SIZE"],
+        poll_interval=app.config["STRIPE_WEBHOOK_POLL_INTERVAL"],
+    )
+
+    # Relevé périodique actif dans chaque processus qui sert des requêtes,
+    # pas seulement après le premier webhook reçu. Jamais dans le maître
+    # Gunicorn ni pendant une commande CLI (cf. aussi reset_after_fork).
+    @app.before_request
+    def _start_webhook_worker():
+        start_webhook_worker(app)
+
+
+def start_webhook_worker(app) -> None:
+    """Idempotent ; relance le thread après un fork (contrôle du PID)."""
+    if app.config.get("STRIPE_WEBHOOK_WORKER", "thread") == "thread":
+        app.extensions["webhook_worker"].start()
+
+
+def notify_worker() -> None:
+    """``STRIPE_WEBHOOK_WORKER=off`` : file vidée par la CLI uniquement."""
+    if current_app.config.get("STRIPE_WEBHOOK_WORKER", "thread") == "thread":
+        current_app.extensions["webhook_worker"].notify()
+
+
+# ---------------------------------------------------------------------- #
+#  CLI : flask webhooks process
+# ---------------------------------------------------------------------- #
+webhooks_cli = AppGroup("webhooks", help="File des webhooks Stripe.")
+
+
+@webhooks_cli.command("process")
+@click.option("--batch-size", default=100, show_default=True, help="Événements par transaction.")
+def process_command(batch_size: int):
+    """Traite les événements Stripe en attente."""
+    click.echo(f"✅ {drain(batch_size)} événements traités.")
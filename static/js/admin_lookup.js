@@ -0,0 +1,53 @@
+// Autocomplétion auteur / catégorie du formulaire livre (admin).
+// <input data-lookup-url="…" data-lookup-target="author_id"> + <datalist> :
+// les propositions viennent de /admin/authors/lookup?q=… (10 au plus), l'id
+// choisi est recopié dans le champ caché qui part avec le formulaire.
+document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("input[data-lookup-url]").forEach(function (input) {
+        const target = document.getElementById(input.dataset.lookupTarget);
+        const list = document.getElementById(input.getAttribute("list"));
+        let options = {};   // libellé → id
+        let timer = null;
+
+        function fetchOptions() {
+            const url = input.dataset.lookupUrl + "?q=" + encodeURIComponent(input.value);
+            fetch(url, { headers: { "Accept": "application/json" } })
+                .then(function (response) { return response.json(); })
+                .then(function (items) {
+                    options = {};
+                    list.innerHTML = "";
+                    items.forEach(function (item) {
+                        options[item.label] = item.id;
+                        const option = document.createElement("option");
+                        option.value = item.label;
+                        list.appendChild(option);
+                    });
+                    sync();
+                })
+                .catch(function () { /* réseau : on garde les propositions précédentes */ });
+        }
+
+        function sync() {
+            if (input.value in options) {
+                target.value = options[input.value];
+            }
+        }
+
+        input.addEventListener("input", function () {
+            target.value = "";
+            sync();
+            clearTimeout(timer);
+            timer = setTimeout(fetchOptions, 150);
+        });
+        input.addEventListener("change", sync);
+
+        input.form.addEventListener("submit", function (event) {
+            if (!target.value) {
+                event.preventDefault();
+                input.setCustomValidity("Choisissez une valeur dans la liste.");
+                input.reportValidity();
+                input.setCustomValidity("");
+            }
+        });
+    });
+});
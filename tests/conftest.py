@@ -0,0 +1,7 @@
+import os
+
+# Les tests tournent sur SQLite en mémoire, jamais sur la base Postgres locale
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+# Pas de thread de webhooks qui interroge la base entre deux tests
+os.environ.setdefault("STRIPE_WEBHOOK_WORKER", "off")
@@ -0,0 +1,126 @@
+import unittest
+from datetime import date
+
+from app import create_app
+from models import db, Author, Category, Book, User
+from services.admin_listing import (
+    admin_authors, admin_books, index_author, index_category, lookup_authors, lookup_categories, name_key,
+)
+from tests.test_orders import QueryCounter
+
+NAMES = [("Émile", "Zola"), ("Albert", "Camus"), ("Paul", "Éluard"), ("Jean", "d'Alembert"), ("Gustave", "Flaubert")]
+
+
+class TestAdminListing(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            authors = [Author(author_firstname=f, author_lastname=l, author_birthday=date(1850, 1, 1)) for f, l in NAMES]
+            categories = [Category(category_name=n) for n in ("Roman", "Récit", "Poésie")]
+            for author in authors:
+                index_author(author)
+            for category in categories:
+                index_category(category)
+            admin = User(user_firstname="Ada", user_lastname="Admin", user_email="admin@example.com",
+                         user_password="x", user_role="admin")
+            db.session.add_all([*authors, *categories, admin])
+            db.session.flush()
+            for i in range(30):
+                db.session.add(Book(
+                    book_title=f"Livre {i:02d}",
+                    publication_date=date(1900 + i, 1, 1),
+                    book_price=float(5 + i % 7),
+                    author_id=authors[i % len(authors)].author_id,
+                    category_id=categories[i % len(categories)].category_id,
+                ))
+            db.session.commit()
+            self.admin_id = admin.user_id
+            self.zola_id = authors[0].author_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _login_admin(self):
+        with self.client.session_transaction() as sess:
+            sess["_user_id"] = str(self.admin_id)
+            sess["_fresh"] = True
+
+    def test_name_key_is_folded(self):
+        self.assertEqual(name_key("Éluard", "Paul"), "eluard paul")
+        self.assertEqual(name_key("d'Alembert", "Jean"), "alembert jean")
+
+    def test_books_page_is_eager_loaded_and_walkable(self):
+        with self.app.test_request_context():
+            with QueryCounter(db.engine) as counter:
+                page = admin_books(sort="price", per_page=10)
+                labels = [(b.author.author_lastname, b.category.category_name) for b in page.items]
+            self.assertEqual(len(labels), 10)
+            self.assertEqual(counter.count, 1)
+
+            seen, after = [], None
+            while True:
+                page = admin_books(sort="title", per_page=7, after=after)
+                seen.extend(b.book_title for b in page.items)
+                if not page.has_next:
+                    break
+                after = page.next_cursor
+            self.assertEqual(seen, sorted(seen))
+            self.assertEqual(len(seen), 30)
+
+            by_author = admin_books(author_id=self.zola_id, per_page=50).items
+            self.assertEqual(len(by_author), 6)
+
+    def test_prefix_search_and_lookup(self):
+        with self.app.test_request_context():
+            self.assertEqual([a["label"] for a in lookup_authors("elu")], ["Paul Éluard"])
+            self.assertEqual([a["label"] for a in lookup_authors("ALEM")], ["Jean d'Alembert"])
+            # Libellé « prénom nom » : la saisie dans cet ordre trouve aussi
+            self.assertEqual([a["label"] for a in lookup_authors("Paul Él")], ["Paul Éluard"])
+            self.assertEqual([a["label"] for a in lookup_authors("eluard pa")], ["Paul Éluard"])
+            self.assertEqual([a["label"] for a in lookup_authors("gus flau")], ["Gustave Flaubert"])
+            self.assertEqual(lookup_authors("paul zo"), [])
+            self.assertEqual([a.author_lastname for a in admin_authors(q="albert ca").items], ["Camus"])
+            self.assertEqual([c["label"] for c in lookup_categories("r")], ["Récit", "Roman"])
+            self.assertEqual(len(lookup_authors("", limit=3)), 3)
+            self.assertEqual([a.author_lastname for a in admin_authors(q="fl").items], ["Flaubert"])
+            names = [a.author_name_key for a in admin_authors(sort="name").items]
+            self.assertEqual(names, sorted(names))
+
+    def test_admin_routes(self):
+        self._login_admin()
+        response = self.client.get("/admin/books?sort=price")
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        self.assertEqual(html.count("btn-edit"), 25)
+        self.assertIn("Suivant", html)
+
+        lookup = self.client.get("/admin/authors/lookup?q=zo")
+        self.assertEqual(lookup.get_json(), [{"id": self.zola_id, "label": "Émile Zola"}])
+        self.assertEqual(self.client.get("/admin/categories?q=po").get_data(as_text=True).count("btn-edit"), 1)
+
+        form = self.client.get("/admin/add_book").get_data(as_text=True)
+        self.assertNotIn("<option", form)
+        self.assertIn("data-lookup-url", form)
+
+    def test_category_writes_maintain_the_key(self):
+        self._login_admin()
+        self.client.post("/admin/add_category", data={"category_name": "Théâtre"})
+        with self.app.test_request_context():
+            created = lookup_categories("thea")
+            self.assertEqual([c["label"] for c in created], ["Théâtre"])
+        self.client.post(f"/admin/edit_category/{created[0]['id']}", data={"category_name": "Comédie"})
+        with self.app.test_request_context():
+            self.assertEqual(lookup_categories("thea"), [])
+            self.assertEqual([c["label"] for c in lookup_categories("come")], ["Comédie"])
+
+    def test_lookup_requires_admin(self):
+        self.assertEqual(self.client.get("/admin/authors/lookup?q=zo").status_code, 302)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+from app import create_app
+from models import db, Author, Category, Book
+from services.catalogue import invalidate_catalogue
+from tests.test_orders import QueryCounter
+
+
+class TestBooksApi(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Albert", author_lastname="Camus", author_birthday=date(1913, 11, 7))
+            roman, essai = Category(category_name="Roman"), Category(category_name="Essai")
+            db.session.add_all([author, roman, essai])
+            db.session.flush()
+            for i in range(25):
+                db.session.add(Book(
+                    book_title=f"Livre {i:02d}",
+                    publication_date=date(2000 + i % 5, 1, 1),
+                    book_price=float(5 + i % 7),
+                    author_id=author.author_id,
+                    category_id=roman.category_id if i % 2 else essai.category_id,
+                ))
+            db.session.commit()
+            self.roman_id = roman.category_id
+            self.first_id = Book.query.order_by(Book.book_id).first().book_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _statements(self):
+        statements = []
+        with self.app.app_context():
+            event.listen(db.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+        return statements
+
+    def test_keyset_walk_with_links(self):
+        seen, url = [], "/api/v1/books?sort=price-asc&limit=10&fields=id,price"
+        while url:
+            body = self.client.get(url).get_json()
+            self.assertEqual(body["meta"]["total"], 25)
+            seen.extend(item["id"] for item in body["data"])
+            url = body["links"]["next"]
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+        prev = self.client.get("/api/v1/books?sort=price-asc&limit=10").get_json()
+        second = self.client.get(prev["links"]["next"]).get_json()
+        back = self.client.get(second["links"]["prev"]).get_json()
+        self.assertEqual(back["data"], prev["data"])
+
+    def test_sparse_fieldsets_select_only_requested_columns(self):
+        statements = self._statements()
+        body = self.client.get("/api/v1/books?fields=id,title&limit=3").get_json()
+        self.assertEqual(set(body["data"][0]), {"id", "title"})
+        query = next(s for s in statements if "LIMIT" in s)
+        self.assertNotIn("Author", query)
+        self.assertNotIn("book_image_variants", query)
+
+        body = self.client.get(f"/api/v1/books?fields=title,author,category&category={self.roman_id}").get_json()
+        self.assertEqual(body["meta"]["total"], 12)
+        self.assertEqual(body["data"][0]["author"], "Albert Camus")
+        self.assertEqual({item["category"] for item in body["data"]}, {"Roman"})
+
+    def test_bad_parameters_are_json_400(self):
+        response = self.client.get("/api/v1/books?fields=id,password")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.get_json()["error"])
+        self.assertEqual(self.client.get("/api/v1/books?sort=random").status_code, 400)
+        missing = self.client.get("/api/v1/books/9999")
+        self.assertEqual(missing.status_code, 404)
+        self.assertIn("error", missing.get_json())
+        for raw in ("inf", "nan", "1e400"):
+            response = self.client.get(f"/api/v1/books?max_price={raw}")
+            self.assertEqual(response.status_code, 400, raw)
+            self.assertEqual(self.client.get(f"/api/v1/books/export?min_price={raw}").status_code, 400, raw)
+        self.assertEqual(self.client.get("/api/v1/books?max_price=7").get_json()["meta"]["total"], 12)
+
+    def test_book_detail_and_conditional_get(self):
+        response = self.client.get(f"/api/v1/books/{self.first_id}?fields=id,publication_date")
+        self.assertEqual(response.get_json()["data"], {"id": self.first_id, "publication_date": "2000-01-01"})
+        self.assertIn("public", response.headers["Cache-Control"])
+        self.assertIn("Last-Modified", response.headers)
+
+        listing = self.client.get("/api/v1/books")
+        with self.app.app_context(), QueryCounter(db.engine) as counter:
+            again = self.client.get("/api/v1/books", headers={"If-None-Match": listing.headers["ETag"]})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(counter.count, 0)
+
+        with self.app.test_request_context():
+            db.session.delete(db.session.get(Book, self.first_id))
+            db.session.commit()
+            invalidate_catalogue()
+        again = self.client.get("/api/v1/books", headers={"If-None-Match": listing.headers["ETag"]})
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()["meta"]["total"], 24)
+
+    def test_ndjson_export_streams_every_book(self):
+        response = self.client.get("/api/v1/books/export?fields=id,title,author")
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertTrue(response.is_streamed)
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(rows), 25)
+        self.assertEqual([r["id"] for r in rows], sorted(r["id"] for r in rows))
+        self.assertEqual(rows[0]["author"], "Albert Camus")
+
+        filtered = self.client.get(f"/api/v1/books/export?category={self.roman_id}&fields=id")
+        self.assertEqual(len(filtered.get_data(as_text=True).splitlines()), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from app import create_app
+from extensions.assets import AssetManifest, build_manifest
+
+
+def write(root, rel, content):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(content)
+
+
+class TestAssetManifest(unittest.TestCase):
+    def setUp(self):
+        self.static = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static)
+        write(self.static, "icons/star.svg", "<svg xmlns='http://www.w3.org/2000/svg'></svg>")
+        write(self.static, "js/main.js", "console.log('plume');\n" * 50)
+        write(self.static, "css/home.css", (
+            "body { background: url('../icons/star.svg#a'); }\n"
+            ".hero { background-image: url(../images/8.png); }\n"
+            "@import url(\"https://fonts.example/x.css\");\n"
+        ) * 20)
+        self.manifest = build_manifest(self.static)
+
+        self.app = create_app()
+        self.app.testing = True
+        self.app.static_folder = self.static
+        self.app.static_url_path = "/static"
+        self.app.extensions["asset_manifest"] = AssetManifest.load(self.static)
+        self.client = self.app.test_client()
+
+    def test_build_fingerprints_and_rewrites_css(self):
+        self.assertRegex(self.manifest["js/main.js"], r"^dist/js/main\.[0-9a-f]{10}\.js$")
+        self.assertEqual(build_manifest(self.static), self.manifest)  # stable
+
+        with open(os.path.join(self.static, self.manifest["css/home.css"]), encoding="utf-8") as fh:
+            css = fh.read()
+        self.assertIn(f'url("/static/{self.manifest["icons/star.svg"]}#a")', css)
+        self.assertIn('url("/static/images/8.png")', css)
+        self.assertIn("https://fonts.example/x.css", css)
+        self.assertTrue(os.path.exists(os.path.join(self.static, self.manifest["css/home.css"] + ".gz")))
+        with open(os.path.join(self.static, "dist/manifest.json"), encoding="utf-8") as fh:
+            self.assertEqual(json.load(fh), self.manifest)
+
+    def test_url_for_resolves_fingerprinted_names(self):
+        with self.app.test_request_context():
+            from flask import url_for
+
+            self.assertEqual(url_for("static", filename="js/main.js"), f"/static/{self.manifest['js/main.js']}")
+            self.assertEqual(url_for("static", filename="images/logo.png"), "/static/images/logo.png")
+
+    def test_fingerprinted_files_are_immutable_and_precompressed(self):
+        url = f"/static/{self.manifest['js/main.js']}"
+        response = self.client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.mimetype, "text/javascript")
+        self.assertIn("immutable", response.headers["Cache-Control"])
+        self.assertIn("max-age=31536000", response.headers["Cache-Control"])
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertIn(b"plume", gzip.decompress(response.data))
+
+        plain = self.client.get(url, headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertTrue(plain.data.startswith(b"console.log"))
+
+    def test_unversioned_files_keep_default_caching(self):
+        response = self.client.get("/static/js/main.js")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("immutable", response.headers.get("Cache-Control", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+from app import create_app
+from extensions.cache import LRUCache, RedisCache
+from models import db, User, Author, Category, Book, CartItem
+from services.cart_snapshot import get_cart_snapshot, invalidate_cart
+
+
+class FakeRedis:
+    """Sous-ensemble du protocole Redis utilisé par RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incrby(self, key, amount):
+        self.data[key] = int(self.data.get(key, 0)) + amount
+        return self.data[key]
+
+    def expire(self, key, ttl):
+        pass
+
+    def scan_iter(self, match):
+        return [k for k in self.data if k.startswith(match.rstrip("*"))]
+
+
+class TestCacheBackends(unittest.TestCase):
+    def test_lru_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_lru_ttl_expires(self):
+        cache = LRUCache()
+        cache.set("a", 1, ttl=-1)
+        self.assertIsNone(cache.get("a"))
+
+    def test_redis_roundtrip_and_incr(self):
+        cache = RedisCache(FakeRedis())
+        cache.set("cart:1", {"items": [], "total": 0})
+        self.assertEqual(cache.get("cart:1"), {"items": [], "total": 0})
+        self.assertEqual(cache.incr("v"), 1)
+        self.assertEqual(cache.incr("v"), 2)
+        cache.clear()
+        self.assertIsNone(cache.get("cart:1"))
+
+
+class TestCartSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Victor", author_lastname="Hugo", author_birthday=date(1802, 2, 26))
+            category = Category(category_name="Roman")
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            db.session.add_all([author, category, user])
+            db.session.flush()
+            for i in range(3):
+                book = Book(book_title=f"Livre {i}", publication_date=date(2020, 1, 1), book_price=10.0,
+                            author_id=author.author_id, category_id=category.category_id)
+                db.session.add(book)
+                db.session.flush()
+                db.session.add(CartItem(user_id=user.user_id, book_id=book.book_id))
+            db.session.commit()
+            self.user_id = user.user_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _count_queries(self):
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+        return statements
+
+    def test_single_query_then_cached(self):
+        with self.app.test_request_context():
+            statements = self._count_queries()
+            snapshot = get_cart_snapshot(self.user_id)
+            self.assertEqual(snapshot.count, 3)
+            self.assertEqual(snapshot.total_price, 30.0)
+            self.assertEqual(snapshot.items[0].book.book_title, "Livre 0")
+            get_cart_snapshot(self.user_id)
+            self.assertEqual(len(statements), 1)
+
+        with self.app.test_request_context():
+            statements = self._count_queries()
+            self.assertEqual(get_cart_snapshot(self.user_id).count, 3)
+            self.assertEqual(statements, [])
+
+    def test_invalidation_reloads(self):
+        with self.app.test_request_context():
+            get_cart_snapshot(self.user_id)
+            CartItem.query.filter_by(user_id=self.user_id).delete()
+            db.session.commit()
+            invalidate_cart(self.user_id)
+            self.assertEqual(get_cart_snapshot(self.user_id).count, 0)
+
+    def test_anonymous_is_empty(self):
+        with self.app.test_request_context():
+            self.assertEqual(get_cart_snapshot(None).as_context()["cart_count"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from datetime import date
+
+from app import create_app
+from models import db, Author, Category, Book, User, Order, OrderDetail
+from services.catalogue import browse_books, count_books, invalidate_catalogue, parse_price
+from services.sales import mark_order_paid
+
+
+class TestCatalogue(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Albert", author_lastname="Camus", author_birthday=date(1913, 11, 7))
+            roman, essai = Category(category_name="Roman"), Category(category_name="Essai")
+            db.session.add_all([author, roman, essai])
+            db.session.flush()
+            for i in range(25):
+                db.session.add(Book(
+                    book_title=f"Livre {i:02d}",
+                    publication_date=date(2000 + i % 5, 1, 1),  # dates en double → départage par book_id
+                    book_price=float(5 + i % 7),
+                    author_id=author.author_id,
+                    category_id=roman.category_id if i % 2 else essai.category_id,
+                ))
+            db.session.commit()
+            self.roman_id = roman.category_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _walk(self, **kwargs):
+        seen, after = [], None
+        while True:
+            page = browse_books(after=after, per_page=4, **kwargs)
+            seen.extend(b.book_id for b in page.items)
+            if not page.has_next:
+                return seen
+            after = page.next_cursor
+
+    def test_keyset_walk_covers_every_book_once(self):
+        with self.app.test_request_context():
+            for sort in ("newest", "price-asc", "price-desc"):
+                ids = self._walk(sort=sort)
+                self.assertEqual(len(ids), 25)
+                self.assertEqual(len(set(ids)), 25)
+            self.assertEqual(len(self._walk(category_id=self.roman_id)), 12)
+
+    def test_ordering_and_previous_page(self):
+        with self.app.test_request_context():
+            first = browse_books(sort="price-asc", per_page=4)
+            prices = [b.book_price for b in first.items]
+            self.assertEqual(prices, sorted(prices))
+            self.assertFalse(first.has_prev)
+
+            second = browse_books(sort="price-asc", per_page=4, after=first.next_cursor)
+            back = browse_books(sort="price-asc", per_page=4, before=second.prev_cursor)
+            self.assertEqual([b.book_id for b in back.items], [b.book_id for b in first.items])
+
+    def test_counts_are_cached(self):
+        with self.app.test_request_context():
+            self.assertEqual(count_books(), 25)
+            db.session.query(Book).delete()
+            db.session.commit()
+            self.assertEqual(count_books(), 25)
+            invalidate_catalogue()
+            self.assertEqual(count_books(), 0)
+
+    def test_price_filter(self):
+        with self.app.test_request_context():
+            page = browse_books(sort="price-desc", max_price=7, per_page=30)
+            self.assertTrue(all(b.book_price <= 7 for b in page.items))
+            self.assertEqual(page.total, len(page.items))
+            self.assertEqual(len(self._walk(sort="newest", max_price=7)), page.total)
+
+    def test_popular_sort_follows_paid_orders(self):
+        with self.app.test_request_context():
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            db.session.add(user)
+            db.session.flush()
+            best = Book.query.filter_by(book_title="Livre 07").one()
+            order = Order(user_id=user.user_id, total_price=10, payment_status="pending")
+            order.details = [OrderDetail(book_id=best.book_id, quantity=3, unit_price=10)]
+            db.session.add(order)
+            db.session.commit()
+
+            self.assertTrue(mark_order_paid(order))
+            db.session.commit()
+            self.assertFalse(mark_order_paid(order))  # rechargement de la page de succès
+
+            db.session.refresh(best)
+            self.assertEqual(best.sales_count, 3)
+            self.assertEqual(browse_books(sort="popular", per_page=1).items[0].book_id, best.book_id)
+
+    def test_gallery_route(self):
+        response = self.client.get("/books?sort=price-desc")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"25 livres", response.data)
+        self.assertIn(b"after=", response.data)
+
+    def test_gallery_max_price_is_finite_and_clamped(self):
+        for raw in ("inf", "-inf", "nan", "1e400", "abc", "100", "250"):
+            response = self.client.get(f"/books?max_price={raw}")
+            self.assertEqual(response.status_code, 200, raw)
+            self.assertIn(b"25 livres", response.data, raw)
+            self.assertNotIn(b"max_price=", response.data, raw)
+        clamped = self.client.get("/books?max_price=1")
+        self.assertIn(b'value="5"', clamped.data)
+        self.assertIn(b"4 livres", clamped.data)
+
+    def test_parse_price(self):
+        self.assertEqual(parse_price("12.345"), 12.35)
+        self.assertEqual(parse_price("-3"), 0.0)
+        self.assertEqual(parse_price("1", 5, 100), 5)
+        self.assertIsNone(parse_price(""))
+        for raw in ("inf", "nan", "1e400", "abc"):
+            with self.assertRaises(ValueError):
+                parse_price(raw)
+
+
+if __name__ == '__main__':
+    unittest.main()
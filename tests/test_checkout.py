@@ -0,0 +1,86 @@
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+from app import create_app
+from models import db, User, Author, Category, Book, CartItem, Order, OrderDetail
+from services.cart_snapshot import get_cart_snapshot
+from services.checkout import checkout_cart
+
+
+class TestCheckout(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Victor", author_lastname="Hugo", author_birthday=date(1802, 2, 26))
+            category = Category(category_name="Roman")
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            other = User(user_firstname="John", user_lastname="Doe", user_email="john@example.com", user_password="x")
+            db.session.add_all([author, category, user, other])
+            db.session.flush()
+            self.book_ids = []
+            for i in range(40):
+                book = Book(book_title=f"Livre {i}", publication_date=date(2020, 1, 1), book_price=float(i + 1),
+                            author_id=author.author_id, category_id=category.category_id)
+                db.session.add(book)
+                db.session.flush()
+                self.book_ids.append(book.book_id)
+            db.session.add(CartItem(user_id=other.user_id, book_id=self.book_ids[0]))
+            db.session.commit()
+            self.user_id, self.other_id = user.user_id, other.user_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _fill_cart(self, n):
+        db.session.add_all(CartItem(user_id=self.user_id, book_id=b) for b in self.book_ids[:n])
+        db.session.commit()
+
+    def _checkout_statements(self):
+        statements = []
+        listener = lambda *a: statements.append(a[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            order_id = checkout_cart(self.user_id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        return order_id, statements
+
+    def test_cart_becomes_order(self):
+        with self.app.test_request_context():
+            self._fill_cart(3)
+            self.assertEqual(get_cart_snapshot(self.user_id).count, 3)
+            order_id = checkout_cart(self.user_id)
+
+            order = db.session.get(Order, order_id)
+            self.assertEqual((order.user_id, order.payment_status, order.total_price), (self.user_id, "pending", 6.0))
+            self.assertEqual(sorted(d.unit_price for d in order.details), [1.0, 2.0, 3.0])
+            self.assertEqual(CartItem.query.filter_by(user_id=self.user_id).count(), 0)
+            self.assertEqual(CartItem.query.filter_by(user_id=self.other_id).count(), 1)
+            # Le snapshot en cache a été invalidé
+            self.assertEqual(get_cart_snapshot(self.user_id).count, 0)
+
+    def test_round_trips_do_not_depend_on_cart_size(self):
+        with self.app.test_request_context():
+            self._fill_cart(2)
+            _, small = self._checkout_statements()
+            self._fill_cart(40)
+            _, large = self._checkout_statements()
+            self.assertEqual(len(small), len(large))
+            self.assertEqual(OrderDetail.query.count(), 42)
+
+    def test_empty_cart_or_double_submit(self):
+        with self.app.test_request_context():
+            self._fill_cart(1)
+            self.assertIsNotNone(checkout_cart(self.user_id))
+            self.assertIsNone(checkout_cart(self.user_id))
+            self.assertEqual(Order.query.count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from datetime import date
+
+from app import create_app
+from models import db, Author, Category, Book, User, CartItem
+from services.cart_snapshot import invalidate_cart
+from services.catalogue import invalidate_catalogue
+from tests.test_orders import QueryCounter
+
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Albert", author_lastname="Camus", author_birthday=date(1913, 11, 7))
+            category = Category(category_name="Roman")
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            db.session.add_all([author, category, user])
+            db.session.flush()
+            books = [
+                Book(book_title=title, publication_date=date(1942, 1, 1), book_price=8.0,
+                     author_id=author.author_id, category_id=category.category_id)
+                for title in ("L'Étranger", "La Peste")
+            ]
+            db.session.add_all(books)
+            db.session.commit()
+            self.book_id, self.other_id = books[0].book_id, books[1].book_id
+            self.user_id = user.user_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_revalidation_returns_304_without_work(self):
+        for url in ("/books", f"/books/{self.book_id}"):
+            first = self.client.get(url)
+            etag = first.headers["ETag"]
+            self.assertTrue(etag.startswith('W/"'))
+            self.assertIn("no-cache", first.headers["Cache-Control"])
+            self.assertIn("Cookie", first.headers["Vary"])
+            with self.app.app_context(), QueryCounter(db.engine) as counter:
+                again = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(again.status_code, 304)
+            self.assertEqual(again.data, b"")
+            self.assertEqual(again.headers["ETag"], etag)
+            self.assertEqual(counter.count, 0, url)
+
+    def test_last_modified_on_book_detail(self):
+        first = self.client.get(f"/books/{self.book_id}")
+        self.assertIn("Last-Modified", first.headers)
+        self.assertNotIn("Last-Modified", self.client.get("/books").headers)
+        again = self.client.get(f"/books/{self.book_id}",
+                                headers={"If-Modified-Since": first.headers["Last-Modified"]})
+        self.assertEqual(again.status_code, 304)
+
+    def test_book_update_changes_etag(self):
+        etag = self.client.get(f"/books/{self.book_id}").headers["ETag"]
+        other = self.client.get(f"/books/{self.other_id}").headers["ETag"]
+        self.assertNotEqual(etag, other)
+        with self.app.test_request_context():
+            db.session.get(Book, self.book_id).book_price = 9.5
+            db.session.commit()
+            invalidate_catalogue()
+        response = self.client.get(f"/books/{self.book_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("9.5", response.get_data(as_text=True))
+
+    def test_etag_follows_the_visitor_and_the_cart(self):
+        anonymous = self.client.get("/books").headers["ETag"]
+        with self.client.session_transaction() as sess:
+            sess["user_id"] = self.user_id
+        logged_in = self.client.get("/books", headers={"If-None-Match": anonymous})
+        self.assertEqual(logged_in.status_code, 200)
+        self.assertNotIn("Last-Modified", self.client.get(f"/books/{self.book_id}").headers)
+
+        with self.app.test_request_context():
+            db.session.add(CartItem(user_id=self.user_id, book_id=self.book_id))
+            db.session.commit()
+            invalidate_cart(self.user_id)
+        response = self.client.get("/books", headers={"If-None-Match": logged_in.headers["ETag"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('<span class="cart-count">1</span>', response.get_data(as_text=True))
+
+    def test_pending_flashes_bypass_the_304(self):
+        first = self.client.get("/books")
+        etag = first.headers["ETag"]
+        response = self.client.post(f"/cart/add_to_cart/{self.book_id}")
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.headers["Location"].endswith("/books"))
+
+        after = self.client.get("/books", headers={"If-None-Match": etag})
+        self.assertEqual(after.status_code, 200)
+        self.assertNotIn("ETag", after.headers)
+        self.assertIn("Livre ajouté temporairement", after.get_data(as_text=True))
+        with self.client.session_transaction() as sess:
+            self.assertNotIn("_flashes", sess)
+        # Messages consommés : la revalidation suivante redevient un 304
+        self.assertEqual(self.client.get("/books", headers={"If-None-Match": etag}).status_code, 304)
+
+    def test_missing_book_is_404(self):
+        self.assertEqual(self.client.get("/books/9999").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
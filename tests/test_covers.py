@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from io import BytesIO
+
+from PIL import Image
+
+from app import create_app
+from models import db, Author, Category, Book
+from services.covers import process_cover, render_variants, write_variants
+
+
+def image_bytes(size=(800, 1200), fmt="PNG", **save_options) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 40, 40)).save(buffer, fmt, **save_options)
+    return buffer.getvalue()
+
+
+class TestRenderVariants(unittest.TestCase):
+    def test_widths_formats_and_no_upscaling(self):
+        size, rendered = render_variants(image_bytes((400, 600)), (160, 320, 480, 640))
+        self.assertEqual(size, (400, 600))
+        self.assertEqual(sorted({(name, w) for name, w, _ in rendered}), [
+            ("jpeg", 160), ("jpeg", 320), ("jpeg", 400), ("webp", 160), ("webp", 320), ("webp", 400),
+        ])
+        with Image.open(BytesIO(dict(((n, w), d) for n, w, d in rendered)[("webp", 160)])) as img:
+            self.assertEqual((img.format, img.size), ("WEBP", (160, 240)))
+
+    def test_metadata_is_stripped(self):
+        exif = Image.Exif()
+        exif[0x010F] = "Camera Inc."  # Make
+        source = image_bytes((700, 1000), "JPEG", exif=exif.tobytes(), comment=b"secret")
+        _, rendered = render_variants(source, (320,))
+        for _, _, payload in rendered:
+            with Image.open(BytesIO(payload)) as img:
+                self.assertFalse(img.info.get("exif"))
+                self.assertNotIn("comment", img.info)
+
+    def test_exif_rotation_is_applied_to_the_recorded_size(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation : pivoter de 90° à l'affichage
+        source = image_bytes((1200, 800), "JPEG", exif=exif.tobytes())  # stocké en paysage
+        size, rendered = render_variants(source, (320,))
+        self.assertEqual(size, (800, 1200))
+        with Image.open(BytesIO(rendered[0][2])) as img:
+            self.assertEqual(img.size, (320, 480))
+
+    def test_files_are_named_by_content(self):
+        out = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, out)
+        first = write_variants(image_bytes(), out, "/static/images/covers", (160, 320))
+        again = write_variants(image_bytes(), out, "/static/images/covers", (160, 320))
+        self.assertEqual(first, again)
+        self.assertEqual(len(os.listdir(out)), 4)
+        self.assertTrue(first["fallback"].endswith("-320.jpg"))
+        self.assertEqual((first["width"], first["height"]), (800, 1200))
+
+
+class TestCoverPipeline(unittest.TestCase):
+    def setUp(self):
+        self.static = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static)
+        os.makedirs(os.path.join(self.static, "images"))
+        with open(os.path.join(self.static, "images", "cover.png"), "wb") as fh:
+            fh.write(image_bytes())
+
+        self.app = create_app()
+        self.app.testing = True
+        self.app.static_folder = self.static
+        self.app.static_url_path = "/static"  # sinon dérivé du nom du dossier temporaire
+        self.app.config["COVER_WIDTHS"] = [160, 320]
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Albert", author_lastname="Camus", author_birthday=date(1913, 11, 7))
+            category = Category(category_name="Roman")
+            db.session.add_all([author, category])
+            db.session.flush()
+            books = [
+                Book(book_title=title, publication_date=date(1942, 1, 1), book_price=9.0,
+                     author_id=author.author_id, category_id=category.category_id, book_image_url=url)
+                for title, url in (("L'Étranger", "/static/images/cover.png"), ("La Peste", "/static/../app.py"))
+            ]
+            db.session.add_all(books)
+            db.session.commit()
+            self.book_id, self.outside_id = books[0].book_id, books[1].book_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_process_cover_records_variants_and_renders_srcset(self):
+        with self.app.app_context():
+            self.assertTrue(process_cover(self.book_id))
+            self.assertFalse(process_cover(self.outside_id))  # hors du dossier static
+            book = db.session.get(Book, self.book_id)
+            self.assertEqual(book.book_image_variants["source"], "/static/images/cover.png")
+            self.assertEqual(book.book_image_url, book.book_image_variants["fallback"])
+
+        html = self.app.test_client().get("/books").get_data(as_text=True)
+        self.assertIn('type="image/webp"', html)
+        self.assertRegex(html, r'srcset="/static/images/covers/[0-9a-f]{16}-160\.webp 160w, ')
+
+    def test_worker_and_cli(self):
+        with self.app.app_context():
+            worker = self.app.extensions["cover_worker"]
+            worker.submit(self.book_id)
+            worker.join()
+            self.assertIsNotNone(db.session.get(Book, self.book_id).book_image_variants)
+
+        result = self.app.test_cli_runner().invoke(args=["covers", "convert"])
+        self.assertIn("0 couvertures converties, 1 ignorées", result.output)
+        result = self.app.test_cli_runner().invoke(args=["covers", "convert", "--all"])
+        self.assertIn("1 couvertures converties", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from flask import g
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from extensions.database import PoolMonitor, engine_options
+from models import db
+
+BASE = dict(
+    DB_POOL_SIZE=5,
+    DB_MAX_OVERFLOW=5,
+    DB_POOL_TIMEOUT=5,
+    DB_POOL_RECYCLE=1800,
+    DB_POOL_PRE_PING=True,
+    DB_CONNECT_TIMEOUT=3,
+    DB_STATEMENT_TIMEOUT_MS=30000,
+    DB_PGBOUNCER=False,
+)
+
+
+def config(uri, **overrides):
+    return dict(BASE, SQLALCHEMY_DATABASE_URI=uri, **overrides)
+
+
+class FakePool:
+    def __init__(self, size, overflow, in_use):
+        self._size, self._max_overflow, self.in_use = size, overflow, in_use
+
+    def size(self):
+        return self._size
+
+    def checkedout(self):
+        return self.in_use
+
+    def status(self):
+        return f"{self.in_use} checked out"
+
+
+class TestEngineOptions(unittest.TestCase):
+    def test_postgres_pool_settings(self):
+        options = engine_options(config("postgresql+psycopg2://u:p@db/plume"))
+        self.assertEqual(options["pool_size"], 5)
+        self.assertEqual(options["max_overflow"], 5)
+        self.assertTrue(options["pool_pre_ping"])
+        self.assertTrue(options["pool_use_lifo"])
+        self.assertEqual(options["connect_args"], {"connect_timeout": 3, "options": "-c statement_timeout=30000"})
+
+    def test_pgbouncer_mode(self):
+        options = engine_options(config("postgresql+psycopg://u:p@bouncer/plume", DB_PGBOUNCER=True))
+        self.assertIsNone(options["connect_args"]["prepare_threshold"])
+        self.assertNotIn("options", options["connect_args"])
+
+    def test_in_memory_sqlite_keeps_defaults(self):
+        self.assertEqual(engine_options(config("sqlite://")), {})
+        self.assertNotIn("connect_args", engine_options(config("sqlite:////tmp/plume.db")))
+
+
+class TestPoolMonitor(unittest.TestCase):
+    def test_alerts_once_per_interval_near_capacity(self):
+        monitor = PoolMonitor(ratio=0.8, interval=60)
+        monitor.on_checkout(FakePool(5, 5, in_use=7))
+        self.assertEqual(monitor.alerts, 0)
+
+        with self.assertLogs("extensions.database", "WARNING"):
+            monitor.on_checkout(FakePool(5, 5, in_use=8))
+        monitor.on_checkout(FakePool(5, 5, in_use=9))
+        self.assertEqual((monitor.alerts, monitor.peak), (1, 9))
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.app.config.update(DB_SERVER_TIMING=True, DB_MAX_QUERIES_PER_REQUEST=0)
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_queries_are_counted_per_request(self):
+        with self.assertLogs("extensions.database", "WARNING") as logs:
+            response = self.app.test_client().get("/books")
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response.headers["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries"$')
+        self.assertIn("GET /books", logs.output[0])
+
+    def test_failing_statement_does_not_leak_its_start_time(self):
+        with self.app.test_request_context():
+            with db.engine.connect() as conn:
+                with self.assertRaises(OperationalError):
+                    conn.exec_driver_sql("SELECT * FROM table_absente")
+                self.assertEqual(conn.info["query_start"], [])
+                conn.exec_driver_sql("SELECT 1")
+                self.assertEqual(conn.info["query_start"], [])
+            self.assertEqual(g.db_queries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import runpy
+import unittest
+from unittest import mock
+
+from app import create_app, reset_after_fork
+from models import db
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+
+
+def load_conf(**env) -> dict:
+    cleared = {k: v for k, v in os.environ.items() if not k.startswith("GUNICORN_")}
+    with mock.patch.dict(os.environ, dict(cleared, **env), clear=True):
+        return runpy.run_path(CONF)
+
+
+class TestGunicornConf(unittest.TestCase):
+    def test_defaults_to_threaded_preloaded_workers(self):
+        conf = load_conf()
+        self.assertEqual(conf["worker_class"], "gthread")
+        self.assertTrue(conf["preload_app"])
+        self.assertEqual(conf["threads"], 4)
+        self.assertEqual(conf["max_requests_jitter"], conf["max_requests"] // 10)
+
+    def test_gevent_is_not_preloaded(self):
+        conf = load_conf(GUNICORN_WORKER_CLASS="gevent")
+        self.assertFalse(conf["preload_app"])
+        self.assertIn("worker_connections", conf)
+
+    def test_explicit_worker_count(self):
+        self.assertEqual(load_conf(GUNICORN_WORKER_CLASS="sync", GUNICORN_WORKERS="3")["workers"], 3)
+
+    def test_unknown_worker_class(self):
+        with self.assertRaises(ValueError):
+            load_conf(GUNICORN_WORKER_CLASS="eventlet")
+
+
+class TestResetAfterFork(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+
+    def test_engine_pool_and_mongo_client_are_reset(self):
+        mongo_logger = mock.Mock()
+        self.app.extensions["mongo_logger"] = mongo_logger
+        with self.app.app_context():
+            pool = db.engine.pool
+            with db.engine.connect():
+                pass
+
+        reset_after_fork(self.app)
+
+        with self.app.app_context():
+            self.assertIsNot(db.engine.pool, pool)
+        mongo_logger.reset_after_fork.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
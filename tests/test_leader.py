@@ -0,0 +1,23 @@
+import os
+import tempfile
+import unittest
+
+from extensions.leader import FileLeaderLock
+
+
+class TestFileLeaderLock(unittest.TestCase):
+    def test_single_leader_until_release(self):
+        path = os.path.join(tempfile.mkdtemp(), "scheduler.lock")
+        leader, follower = FileLeaderLock(path), FileLeaderLock(path)
+
+        self.assertTrue(leader.acquire())
+        self.assertTrue(leader.renew())
+        self.assertFalse(follower.acquire())
+
+        leader.release()
+        self.assertTrue(follower.acquire())
+        follower.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
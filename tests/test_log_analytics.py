@@ -0,0 +1,129 @@
+import unittest
+from datetime import datetime, timedelta
+
+from extensions.cache import LRUCache
+from services.log_analytics import LogAnalytics
+
+try:
+    import mongomock
+except ImportError:  # dépendance de test facultative (requirements-dev.txt)
+    mongomock = None
+
+NOW = datetime(2026, 10, 18, 15, 0)
+
+
+class CountingCollection:
+    """Compte les pipelines exécutés sur une collection mongomock."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.pipelines = []
+
+    def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        return self.collection.aggregate(pipeline, **kwargs)
+
+
+@unittest.skipUnless(mongomock, "mongomock non installé")
+class TestLogAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.db = mongomock.MongoClient().plume_logs
+        self.analytics = LogAnalytics(self.db, LRUCache(), batch_size=2)
+
+    def _login(self, when, status, user_id=None, ip="10.0.0.1", email="a@x.fr"):
+        self.db.users_loggings.insert_one({
+            "user_id": user_id, "email": email, "event_type": "login", "timestamp": when,
+            "details": {"status": status, "ip": ip},
+        })
+
+    def test_daily_logins_buckets(self):
+        yesterday = NOW - timedelta(days=1)
+        self._login(yesterday, "success", user_id=1)
+        self._login(yesterday, "success", user_id=1)
+        self._login(yesterday, "fail")
+        self._login(NOW, "success", user_id=2)
+        self._login(NOW, "locked")
+
+        rows = list(self.analytics.daily_logins(days=3, now=NOW))
+        self.assertEqual([r["day"] for r in rows], ["2026-10-16", "2026-10-17", "2026-10-18"])
+        self.assertEqual(rows[0]["success_rate"], None)
+        self.assertEqual(
+            (rows[1]["success"], rows[1]["fail"], rows[1]["active_users"], rows[1]["success_rate"]),
+            (2, 1, 1, 0.6667),
+        )
+        self.assertEqual((rows[2]["success"], rows[2]["locked"]), (1, 1))
+
+    def test_finished_days_come_from_cache(self):
+        self._login(NOW - timedelta(days=1), "success", user_id=1)
+        list(self.analytics.daily_logins(days=3, now=NOW))
+
+        # Écriture tardive sur une journée close : ignorée, seul « aujourd'hui » est recalculé
+        self._login(NOW - timedelta(days=1), "fail")
+        self._login(NOW, "fail")
+        spy = CountingCollection(self.db.users_loggings)
+        self.analytics.db = {"users_loggings": spy}
+        rows = list(self.analytics.daily_logins(days=3, now=NOW))
+
+        self.assertEqual(rows[1]["fail"], 0)
+        self.assertEqual(rows[2]["fail"], 1)
+        self.assertEqual(len(spy.pipelines), 1)
+        self.assertEqual(spy.pipelines[0][0]["$match"]["timestamp"]["$gte"], datetime(2026, 10, 18))
+
+    def test_top_failing_ips(self):
+        for _ in range(3):
+            self._login(NOW - timedelta(hours=1), "fail", ip="1.1.1.1", email="a@x.fr")
+        self._login(NOW - timedelta(hours=2), "locked", ip="1.1.1.1", email="b@x.fr")
+        self._login(NOW - timedelta(hours=2), "fail", ip="2.2.2.2")
+        self._login(NOW - timedelta(days=2), "fail", ip="3.3.3.3")  # hors fenêtre
+
+        rows = list(self.analytics.top_failing_ips(hours=24, limit=5, now=NOW))
+        self.assertEqual([(r["ip"], r["failures"]) for r in rows], [("1.1.1.1", 4), ("2.2.2.2", 1)])
+        self.assertEqual(rows[0]["distinct_emails"], 2)
+
+    def test_daily_actions(self):
+        for event_type, when in (("add_book", NOW), ("add_book", NOW), ("delete_book", NOW - timedelta(days=1))):
+            self.db.user_actions.insert_one({"event_type": event_type, "timestamp": when, "user_id": 1})
+
+        rows = list(self.analytics.daily_actions(days=2, now=NOW))
+        self.assertEqual(rows[0], {"day": "2026-10-17", "total": 1, "by_type": {"delete_book": 1}})
+        self.assertEqual(rows[1], {"day": "2026-10-18", "total": 2, "by_type": {"add_book": 2}})
+
+    def test_windows_are_bounded(self):
+        self._login(NOW, "fail")
+        for days in (0, -5):
+            self.assertEqual([r["day"] for r in self.analytics.daily_actions(days=days, now=NOW)], ["2026-10-18"])
+        self.assertEqual(len(list(self.analytics.daily_logins(days=10_000, now=NOW))), 100)
+        self.assertEqual(len(list(self.analytics.top_failing_ips(hours=-1, limit=0, now=NOW + timedelta(minutes=1)))), 1)
+
+
+class TestAnalyticsRoutes(unittest.TestCase):
+    def test_without_mongo_is_503(self):
+        from app import create_app
+        from models import db, User
+
+        app = create_app()
+        app.testing = True
+        app.extensions.pop("mongo_logger", None)
+        with app.app_context():
+            db.create_all()
+            admin = User(user_firstname="Ada", user_lastname="Admin", user_email="admin@example.com",
+                         user_password="x", user_role="admin")
+            db.session.add(admin)
+            db.session.commit()
+            admin_id = admin.user_id
+        try:
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess["_user_id"] = str(admin_id)
+                sess["_fresh"] = True
+            response = client.get("/admin/analytics/logins?days=0")
+            self.assertEqual(response.status_code, 503)
+            self.assertIn("error", response.get_json())
+        finally:
+            with app.app_context():
+                db.session.remove()
+                db.drop_all()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+
+from pymongo.errors import AutoReconnect
+
+from extensions.mongo_writer import BatchWriter, SPILL
+
+
+class FakeCollection:
+    def __init__(self, database):
+        self.database = database
+        self.docs = []
+
+    def insert_many(self, docs, ordered=True):
+        if self.database.down:
+            raise AutoReconnect("mongo down")
+        self.database.calls += 1
+        self.docs.extend(docs)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+        self.calls = 0
+        self.down = False
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection(self))
+
+
+class TestBatchWriter(unittest.TestCase):
+    def test_batches_by_size_and_drains_on_close(self):
+        db = FakeDatabase()
+        writer = BatchWriter(lambda: db, batch_size=10, flush_interval=60)
+        for i in range(25):
+            writer.enqueue("users_loggings", {"i": i})
+        deadline = time.monotonic() + 2
+        while db.calls < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.close()
+        self.assertEqual(len(db["users_loggings"].docs), 25)
+        self.assertEqual(writer.stats()["flushed"], 25)
+        self.assertEqual(writer.stats()["pending"], 0)
+
+    def test_flushes_on_interval(self):
+        db = FakeDatabase()
+        writer = BatchWriter(lambda: db, batch_size=100, flush_interval=0.05)
+        writer.enqueue("user_actions", {"event_type": "logout"})
+        deadline = time.monotonic() + 2
+        while not db["user_actions"].docs and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(db["user_actions"].docs), 1)
+        writer.close()
+
+    def test_drop_oldest_when_full(self):
+        db = FakeDatabase()
+        writer = BatchWriter(lambda: db, max_queue=3, batch_size=100, flush_interval=60)
+        writer._ensure_started = lambda: None  # pas de thread : file figée
+        for i in range(5):
+            writer.enqueue("c", {"i": i})
+        self.assertEqual(writer.stats()["dropped"], 2)
+        writer.flush()
+        self.assertEqual([d["i"] for d in db["c"].docs], [2, 3, 4])
+
+    def test_spill_and_replay(self):
+        db = FakeDatabase()
+        db.down = True
+        path = os.path.join(tempfile.mkdtemp(), "spill.jsonl")
+        writer = BatchWriter(lambda: db, max_queue=2, batch_size=100, flush_interval=60, overflow=SPILL, spill_path=path)
+        writer._ensure_started = lambda: None
+        for i in range(3):
+            writer.enqueue("c", {"i": i, "timestamp": datetime(2026, 1, 1)})
+        writer.flush()  # Mongo indisponible → tout part dans le fichier
+        self.assertEqual(writer.stats()["spilled"], 3)
+
+        db.down = False
+        self.assertEqual(writer.replay_spill(), 3)
+        self.assertEqual(writer.stats()["pending"], 2)  # file bornée : le surplus retourne au fichier
+        writer.flush()
+        self.assertEqual(writer.replay_spill(), 1)
+        writer.flush()
+        self.assertEqual(sorted(d["i"] for d in db["c"].docs), [0, 1, 2])
+        self.assertIsInstance(db["c"].docs[0]["timestamp"], datetime)
+        self.assertFalse(os.path.exists(path))
+
+    def test_concurrent_spill_and_replay_share_one_file(self):
+        db = FakeDatabase()
+        db.down = True
+        path = os.path.join(tempfile.mkdtemp(), "spill.jsonl")
+        writers = [
+            BatchWriter(lambda: db, max_queue=5, batch_size=100, flush_interval=60, overflow=SPILL, spill_path=path)
+            for _ in range(2)
+        ]
+        for writer in writers:
+            writer._ensure_started = lambda: None
+
+        def produce(name, writer):
+            for i in range(300):
+                writer.enqueue("c", {"w": name, "i": i})
+
+        done = threading.Event()
+
+        def replay():
+            while not done.is_set():
+                for writer in writers:
+                    writer.replay_spill()
+
+        threads = [threading.Thread(target=produce, args=(n, w)) for n, w in enumerate(writers)]
+        replayer = threading.Thread(target=replay)
+        replayer.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        replayer.join()
+
+        db.down = False
+        while True:
+            for writer in writers:
+                writer.flush()
+            if not sum(writer.replay_spill() for writer in writers):
+                break
+        for writer in writers:
+            writer.flush()
+        seen = [(d["w"], d["i"]) for d in db["c"].docs]
+        self.assertEqual(len(seen), 600)
+        self.assertEqual(set(seen), {(w, i) for w in range(2) for i in range(300)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from flask import render_template
+from sqlalchemy import event
+
+from app import create_app
+from models import db, Author, Category, Book, User, Order, OrderDetail
+from services.orders import get_user_order, order_history
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+
+class TestOrderHistory(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        with self.app.app_context():
+            db.create_all()
+            category = Category(category_name="Roman")
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            other = User(user_firstname="John", user_lastname="Doe", user_email="john@example.com", user_password="x")
+            db.session.add_all([category, user, other])
+            db.session.flush()
+            books = []
+            for i in range(4):
+                author = Author(author_firstname=f"Auteur{i}", author_lastname="X", author_birthday=date(1900, 1, 1))
+                db.session.add(author)
+                db.session.flush()
+                books.append(Book(book_title=f"Livre {i}", publication_date=date(2000, 1, 1), book_price=10.0,
+                                  author_id=author.author_id, category_id=category.category_id))
+            db.session.add_all(books)
+            db.session.flush()
+
+            start = datetime(2026, 1, 1)
+            for i in range(12):
+                order = Order(user_id=user.user_id, total_price=20.0, payment_status="paid",
+                              order_date=start + timedelta(days=i // 2))  # dates en double
+                order.details = [OrderDetail(book_id=b.book_id, quantity=1, unit_price=10.0) for b in books[:2 + i % 3]]
+                db.session.add(order)
+            db.session.add(Order(user_id=user.user_id, total_price=5.0, payment_status="pending", order_date=start))
+            db.session.add(Order(user_id=other.user_id, total_price=5.0, payment_status="paid", order_date=start))
+            db.session.commit()
+            self.user_id, self.other_id = user.user_id, other.user_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_keyset_walk_newest_first(self):
+        with self.app.app_context():
+            seen, after = [], None
+            while True:
+                page = order_history(self.user_id, after=after, per_page=5)
+                seen.extend((o.order_date, o.order_id) for o in page.items)
+                if not page.has_next:
+                    break
+                after = page.next_cursor
+            self.assertEqual(len(seen), 12)
+            self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_history_page_query_count_is_constant(self):
+        with self.app.test_request_context():
+            with QueryCounter(db.engine) as counter:
+                page = order_history(self.user_id, per_page=10)
+                render_template("account.html", user=None, orders=page.items, page=page)
+            # commandes + lignes/livres/auteurs (selectinload), sans N+1
+            self.assertEqual(counter.count, 2)
+
+    def test_order_detail_single_query_and_ownership(self):
+        with self.app.test_request_context():
+            order_id = order_history(self.user_id, per_page=1).items[0].order_id
+            db.session.expire_all()
+            with QueryCounter(db.engine) as counter:
+                order = get_user_order(self.user_id, order_id)
+                render_template("order_details.html", order=order)
+            self.assertEqual(counter.count, 1)
+            self.assertIsNone(get_user_order(self.other_id, order_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import date
+
+from app import create_app
+from extensions.cache import FileSystemCache, build_cache, get_cache
+from models import db, Author, Category, Book, User, CartItem
+from services.catalogue import catalogue_version, invalidate_catalogue
+from tests.test_orders import QueryCounter
+
+
+class TestFileSystemCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="page-cache-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_shared_between_instances(self):
+        first, second = FileSystemCache(self.directory), FileSystemCache(self.directory)
+        first.set("page:1", {"body": "<p>é</p>"})
+        self.assertEqual(second.get("page:1"), {"body": "<p>é</p>"})
+        self.assertEqual(first.incr("catalogue:version", ttl=0), 1)
+        self.assertEqual(second.incr("catalogue:version", ttl=0), 2)
+        second.delete("page:1")
+        self.assertIsNone(first.get("page:1"))
+        first.clear()
+        self.assertEqual(len(second), 0)
+
+    def test_expiry_and_pruning(self):
+        cache = FileSystemCache(self.directory, maxsize=8, default_ttl=1)
+        cache.set("short", 1, ttl=1)
+        cache.set("forever", 2, ttl=0)
+        time.sleep(1.05)
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("forever"), 2)
+        for i in range(30):
+            cache.set(f"k{i}", i, ttl=60)
+        self.assertLessEqual(len(cache), 8)
+
+    def test_version_key_survives_pruning(self):
+        cache = FileSystemCache(self.directory, maxsize=8)
+        cache.incr("catalogue:version", ttl=0)
+        for i in range(40):
+            cache.set(f"page:{i}", i, ttl=60)
+        self.assertEqual(cache.get("catalogue:version"), 1)
+        self.assertLessEqual(len(cache), 8)
+
+    def test_build_from_url(self):
+        self.assertIsInstance(build_cache(f"file://{self.directory}"), FileSystemCache)
+        shared = build_cache(f"file://{self.directory}", maxsize=8)
+        pages = build_cache(f"file://{self.directory}", maxsize=8, prefix="plume:page:")
+        shared.incr("catalogue:version", ttl=0)
+        for i in range(40):
+            pages.set(f"page:{i}", i, ttl=60)
+        pages.clear()
+        self.assertEqual(shared.get("catalogue:version"), 1)
+        self.assertEqual(len(shared), 1)
+        with self.assertRaises(ValueError):
+            build_cache("file://")
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Albert", author_lastname="Camus", author_birthday=date(1913, 11, 7))
+            category = Category(category_name="Roman")
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            db.session.add_all([author, category, user])
+            db.session.flush()
+            book = Book(book_title="L'Étranger", publication_date=date(1942, 1, 1), book_price=8.0,
+                        author_id=author.author_id, category_id=category.category_id)
+            db.session.add(book)
+            db.session.flush()
+            db.session.add(CartItem(user_id=user.user_id, book_id=book.book_id))
+            db.session.commit()
+            self.book_id, self.user_id = book.book_id, user.user_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_second_anonymous_hit_skips_database(self):
+        for url in ("/", "/books?sort=price-asc", f"/books/{self.book_id}"):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.headers["X-Page-Cache"], "MISS")
+            with self.app.app_context(), QueryCounter(db.engine) as counter:
+                second = self.client.get(url)
+            self.assertEqual(second.headers["X-Page-Cache"], "HIT")
+            self.assertEqual(second.data, first.data)
+            self.assertEqual(counter.count, 0, url)
+
+    def test_query_args_are_part_of_the_key(self):
+        self.client.get("/books?sort=price-asc")
+        self.assertEqual(self.client.get("/books?sort=price-desc").headers["X-Page-Cache"], "MISS")
+        self.assertEqual(self.client.get("/books?sort=price-asc").headers["X-Page-Cache"], "HIT")
+
+    def test_catalogue_write_invalidates_pages(self):
+        self.client.get("/books")
+        with self.app.app_context():
+            db.session.get(Book, self.book_id).book_title = "La Peste"
+            db.session.commit()
+        self.assertIn("L&#39;Étranger", self.client.get("/books").get_data(as_text=True))
+        with self.app.test_request_context():
+            invalidate_catalogue()
+        response = self.client.get("/books")
+        self.assertEqual(response.headers["X-Page-Cache"], "MISS")
+        self.assertIn("La Peste", response.get_data(as_text=True))
+
+    def test_new_etag_never_comes_with_a_stale_page(self):
+        first = self.client.get("/books")
+        with self.app.test_request_context():
+            db.session.get(Book, self.book_id).book_title = "La Peste"
+            db.session.commit()
+            # Écriture faite par un autre worker (memory://) : version inchangée
+            # ici, seule l'empreinte du catalogue expire
+            get_cache().delete(f"catalogue:v{catalogue_version()}:stamp")
+        response = self.client.get("/books")
+        self.assertNotEqual(response.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(response.headers["X-Page-Cache"], "MISS")
+        self.assertIn("La Peste", response.get_data(as_text=True))
+
+    def test_cart_fragment_is_personal(self):
+        anonymous = self.client.get("/books").get_data(as_text=True)
+        self.assertIn("Se connecter", anonymous)
+        self.assertNotIn("<!--fragment:", anonymous)
+
+        with self.client.session_transaction() as sess:
+            sess["user_id"] = self.user_id
+        response = self.client.get("/books")
+        html = response.get_data(as_text=True)
+        self.assertEqual(response.headers["X-Page-Cache"], "HIT")
+        self.assertIn('<span class="cart-count">1</span>', html)
+        self.assertIn("Se déconnecter", html)
+        self.assertNotIn('<span class="cart-count">', anonymous)
+
+    def test_errors_and_flashes_are_not_cached(self):
+        self.assertEqual(self.client.get("/books/9999").status_code, 404)
+        self.assertNotIn("X-Page-Cache", self.client.get("/books/9999").headers)
+        self.client.get("/books")
+        with self.client.session_transaction() as sess:
+            sess["_flashes"] = [("success", "Livre ajouté au panier")]
+        response = self.client.get("/books")
+        self.assertNotIn("X-Page-Cache", response.headers)
+        self.assertIn("Livre ajouté au panier", response.get_data(as_text=True))
+
+    def test_disabled_with_zero_ttl(self):
+        self.app.config["PAGE_CACHE_TTL"] = 0
+        self.client.get("/books")
+        self.assertNotIn("X-Page-Cache", self.client.get("/books").headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest import mock
+
+import zxcvbn
+
+from app import create_app
+from services import password_strength
+from services.password_strength import MAX_ANALYZED_LENGTH, analyze, analyze_many
+
+STRONG = "Plume-des-Etoiles-1987!"
+
+
+class TestPasswordStrength(unittest.TestCase):
+    def setUp(self):
+        password_strength._results.clear()
+
+    def test_single_pass_and_cached_by_hmac(self):
+        with mock.patch.object(zxcvbn, "zxcvbn", wraps=zxcvbn.zxcvbn) as spy:
+            first = analyze(STRONG)
+            second = analyze(STRONG)
+        self.assertEqual(spy.call_count, 1)
+        self.assertIs(first, second)
+        self.assertTrue(first["valid"], first["errors"])
+        # Clés opaques : le mot de passe n'apparaît jamais dans le cache
+        self.assertFalse(any(STRONG in key for key in password_strength._results._data))
+
+    def test_weak_password_errors(self):
+        result = analyze("password")
+        self.assertFalse(result["valid"])
+        self.assertFalse(result["requirements"]["length"])
+        self.assertFalse(result["requirements"]["common"])
+        self.assertEqual(analyze("")["score"], 0)
+
+    def test_long_input_is_capped(self):
+        with mock.patch.object(zxcvbn, "zxcvbn", wraps=zxcvbn.zxcvbn) as spy:
+            result = analyze("aB3$xy" * 200)
+        self.assertEqual(len(spy.call_args.args[0]), MAX_ANALYZED_LENGTH)
+        self.assertIn(result["score"], range(5))
+
+    def test_batch(self):
+        results = analyze_many(["password", STRONG])
+        self.assertEqual([r["valid"] for r in results], [False, True])
+
+
+class TestCheckPasswordEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = create_app().test_client()
+
+    def test_sequence_number_is_echoed(self):
+        response = self.client.post("/register/check_password", json={"password": STRONG, "seq": 7})
+        self.assertEqual(response.get_json()["seq"], 7)
+        self.assertTrue(response.get_json()["valid"])
+
+        legacy = self.client.post("/register/check_password", data={"password": "abc"})
+        self.assertEqual(legacy.get_json()["seq"], None)
+        self.assertFalse(legacy.get_json()["valid"])
+
+    def test_batch_endpoint(self):
+        response = self.client.post("/register/check_password", json={"passwords": ["abc", STRONG], "seq": 2})
+        self.assertEqual([r["valid"] for r in response.get_json()["results"]], [False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
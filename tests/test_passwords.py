@@ -0,0 +1,72 @@
+import os
+import time
+import unittest
+from types import SimpleNamespace
+
+from werkzeug.security import generate_password_hash
+
+from services.passwords import HasherBusy, PasswordHasher
+
+FAST = "pbkdf2:sha256:1000"  # coût réduit : les tests vérifient la mécanique, pas la robustesse
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def test_hash_and_verify_inline(self):
+        hasher = PasswordHasher(FAST)
+        stored = hasher.hash("s3cret")
+        self.assertTrue(stored.startswith("pbkdf2:sha256:1000$"))
+        self.assertTrue(hasher.verify(stored, "s3cret"))
+        self.assertFalse(hasher.verify(stored, "wrong"))
+        self.assertFalse(hasher.verify("", "s3cret"))
+
+    def test_canonical_method_and_rehash(self):
+        hasher = PasswordHasher("pbkdf2:sha256")
+        self.assertEqual(hasher.canonical_method, "pbkdf2:sha256:1000000")
+        self.assertFalse(hasher.needs_rehash(generate_password_hash("x", "pbkdf2:sha256:1000000")))
+        self.assertTrue(hasher.needs_rehash(generate_password_hash("x", FAST)))
+
+    def test_verify_and_update_rehashes_on_login(self):
+        user = SimpleNamespace(user_password=generate_password_hash("s3cret", "pbkdf2:sha256:500"))
+        hasher = PasswordHasher(FAST)
+
+        self.assertFalse(hasher.verify_and_update(user, "wrong"))
+        self.assertTrue(user.user_password.startswith("pbkdf2:sha256:500$"))
+
+        self.assertTrue(hasher.verify_and_update(user, "s3cret"))
+        self.assertTrue(user.user_password.startswith("pbkdf2:sha256:1000$"))
+        self.assertTrue(hasher.verify(user.user_password, "s3cret"))
+
+    def test_process_pool_and_backpressure(self):
+        hasher = PasswordHasher(FAST, workers=1, max_pending=1, timeout=5)
+        try:
+            stored = hasher.hash("s3cret")
+            self.assertTrue(hasher.verify(stored, "s3cret"))
+            self.assertFalse(hasher.verify(stored, "nope"))
+
+            hasher._slots.acquire()  # file pleine : refus immédiat, sans attendre timeout
+            started = time.monotonic()
+            with self.assertRaises(HasherBusy):
+                hasher.verify(stored, "s3cret")
+            self.assertLess(time.monotonic() - started, 1)
+            hasher._slots.release()
+        finally:
+            hasher.shutdown()
+
+    def test_timeout_and_broken_pool_are_busy(self):
+        hasher = PasswordHasher(FAST, workers=1, max_pending=2, timeout=0.2)
+        try:
+            with self.assertRaises(HasherBusy):
+                hasher._run(time.sleep, 2)
+
+            hasher.timeout = 10
+            broken = hasher._executor()
+            with self.assertRaises(HasherBusy):
+                hasher._run(os._exit, 1)
+            self.assertIsNot(hasher._executor(), broken)
+            self.assertTrue(hasher.verify(hasher.hash("s3cret"), "s3cret"))
+        finally:
+            hasher.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app import create_app
+from models import db, User, Order
+from services.payments import SESSION_SLOT, checkout_session_url, init_payments
+
+
+class FakeCheckoutClient:
+    """Remplace l'API Stripe : enregistre les appels, rejoue les clés d'idempotence."""
+
+    def __init__(self):
+        self.calls = []
+        self.sessions = {}
+
+    def create_session(self, params, idempotency_key):
+        self.calls.append((params, idempotency_key))
+        if idempotency_key not in self.sessions:
+            n = len(self.sessions) + 1
+            self.sessions[idempotency_key] = {
+                "id": f"cs_test_{n}",
+                "url": f"https://checkout.stripe.test/c/{n}",
+                "expires_at": params["expires_at"],
+            }
+        return self.sessions[idempotency_key]
+
+
+class TestCheckoutSessionReuse(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.fake = FakeCheckoutClient()
+        init_payments(self.app, client=self.fake)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            db.session.add(user)
+            db.session.flush()
+            order = Order(user_id=user.user_id, total_price=19.99, payment_status="pending")
+            db.session.add(order)
+            db.session.commit()
+            self.order_id = order.order_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _pay(self):
+        return self.client.post(f"/payement/create-checkout-session/{self.order_id}",
+                                headers={"X-Requested-With": "XMLHttpRequest"})
+
+    def test_repeat_clicks_reuse_open_session(self):
+        urls = [self._pay().get_json()["url"] for _ in range(3)]
+        self.assertEqual(urls, ["https://checkout.stripe.test/c/1"] * 3)
+        self.assertEqual(len(self.fake.calls), 1)
+
+        params, key = self.fake.calls[0]
+        self.assertRegex(key, rf"^checkout-{self.order_id}-1999-new-\d+$")
+        self.assertEqual(params["line_items"][0]["price_data"]["unit_amount"], 1999)
+        self.assertEqual(params["client_reference_id"], str(self.order_id))
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Order, self.order_id).stripe_session_id, "cs_test_1")
+
+    def test_expired_session_is_renewed(self):
+        self._pay()
+        with self.app.app_context():
+            order = db.session.get(Order, self.order_id)
+            order.stripe_session_expires_at = datetime.utcnow() - timedelta(minutes=1)
+            db.session.commit()
+
+        self.assertEqual(self._pay().get_json()["url"], "https://checkout.stripe.test/c/2")
+        self.assertRegex(self.fake.calls[1][1], rf"^checkout-{self.order_id}-1999-cs_test_1-\d+$")
+
+    def test_retry_sends_same_key_and_params(self):
+        slot = 1_800_000_000 - 1_800_000_000 % SESSION_SLOT
+        with self.app.test_request_context(), mock.patch("services.payments.time.time") as clock:
+            for now in (slot + 10, slot + 11):  # 2e tentative une seconde plus tard, 1re réponse perdue
+                clock.return_value = now
+                order = db.session.get(Order, self.order_id)
+                checkout_session_url(order, "https://ok.test", "https://ko.test")
+                db.session.rollback()
+        (first, first_key), (second, second_key) = self.fake.calls
+        self.assertEqual(first_key, second_key)
+        self.assertEqual(first, second)
+        self.assertGreaterEqual(first["expires_at"] - (slot + 11), 3600)
+        self.assertEqual(len(self.fake.sessions), 1)
+
+    def test_paid_order_never_calls_stripe(self):
+        with self.app.app_context():
+            db.session.get(Order, self.order_id).payment_status = "paid"
+            db.session.commit()
+        self.assertEqual(self._pay().status_code, 302)
+        self.assertEqual(self.fake.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
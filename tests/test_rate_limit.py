@@ -0,0 +1,84 @@
+import unittest
+from sqlalchemy import event
+
+from app import create_app
+from extensions.cache import LRUCache
+from models import db, User
+from services.rate_limit import LoginRateLimiter, SlidingWindowLimiter, init_rate_limits
+
+
+class TestSlidingWindow(unittest.TestCase):
+    def test_limit_then_decay(self):
+        limiter = SlidingWindowLimiter(LRUCache(), "t", limit=3, window=60)
+        t0 = 6000.0  # début de fenêtre
+        for _ in range(3):
+            self.assertEqual(limiter.retry_after("a", now=t0), 0)
+            limiter.hit("a", now=t0)
+        self.assertEqual(limiter.retry_after("a", now=t0 + 10), 50)
+        self.assertEqual(limiter.retry_after("b", now=t0 + 10), 0)
+
+        # Fenêtre suivante : les 3 échecs précédents pèsent encore (≈ 3 × 59/60)
+        self.assertEqual(limiter.retry_after("a", now=t0 + 61), 0)
+        limiter.hit("a", now=t0 + 61)
+        self.assertGreater(limiter.retry_after("a", now=t0 + 62), 0)
+        # … puis s'effacent progressivement (3 × 0.25 + 1 < 3)
+        self.assertEqual(limiter.retry_after("a", now=t0 + 105), 0)
+
+    def test_success_resets_email(self):
+        limiter = LoginRateLimiter(LRUCache(), ip_limit=100, email_limit=2, window=60)
+        limiter.failure("1.2.3.4", "Jane@Example.com")
+        limiter.failure("5.6.7.8", "jane@example.com")
+        self.assertGreater(limiter.blocked_for("9.9.9.9", "jane@example.com"), 0)
+        limiter.success("jane@example.com")
+        self.assertEqual(limiter.blocked_for("9.9.9.9", "jane@example.com"), 0)
+
+
+class TestLoginRateLimit(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.app.config.update(LOGIN_EMAIL_LIMIT=3, LOGIN_IP_LIMIT=5)
+        init_rate_limits(self.app)  # limites réduites pour le test
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com")
+            user.set_password("s3cret")
+            db.session.add(user)
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _login(self, password, email="jane@example.com", ip="10.0.0.1", client=None):
+        return (client or self.client).post("/auth/login", data={"user_email": email, "user_password": password},
+                                            environ_base={"REMOTE_ADDR": ip})
+
+    def test_blocked_before_any_query_even_without_cookie(self):
+        for _ in range(3):
+            self.assertEqual(self._login("wrong").status_code, 302)
+
+        statements = []
+        with self.app.app_context():
+            listener = lambda *a: statements.append(a[2])
+            event.listen(db.engine, "before_cursor_execute", listener)
+            try:
+                # Nouveau client = cookie de session vierge : le compteur est côté serveur
+                response = self._login("s3cret", client=self.app.test_client())
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listener)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response.headers)
+        self.assertEqual(statements, [])
+
+    def test_ip_limit_across_emails(self):
+        for i in range(5):
+            self._login("wrong", email=f"user{i}@example.com", ip="10.0.0.2")
+        self.assertEqual(self._login("s3cret", ip="10.0.0.2").status_code, 429)
+        self.assertEqual(self._login("s3cret", ip="10.0.0.3").status_code, 302)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from datetime import date, datetime
+
+from app import create_app
+from models import db, Author, Category, Book, User, Order, OrderDetail, BookSalesStats, CategoryDailyRevenue
+from services.sales import _locked_upsert_add, backfill, mark_order_paid, revenue_by_category, top_sellers
+
+
+class TestSalesRollup(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Jules", author_lastname="Verne", author_birthday=date(1828, 2, 8))
+            roman, sf = Category(category_name="Roman"), Category(category_name="SF")
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            db.session.add_all([author, roman, sf, user])
+            db.session.flush()
+            self.books = []
+            for title, category in (("Vingt mille lieues", sf), ("Le Tour du monde", roman)):
+                book = Book(book_title=title, publication_date=date(1870, 1, 1), book_price=10.0,
+                            author_id=author.author_id, category_id=category.category_id)
+                db.session.add(book)
+                self.books.append(book)
+            db.session.flush()
+            self.book_ids = [b.book_id for b in self.books]
+            self.user_id = user.user_id
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _order(self, lines, when):
+        order = Order(user_id=self.user_id, order_date=when, total_price=0, payment_status="pending")
+        order.details = [OrderDetail(book_id=b, quantity=q, unit_price=p) for b, q, p in lines]
+        db.session.add(order)
+        db.session.commit()
+        return order
+
+    def _snapshot(self):
+        stats = {s.book_id: (s.units_sold, s.revenue, s.last_sold_at) for s in BookSalesStats.query}
+        daily = {(d.category_id, d.day): (d.units_sold, d.revenue) for d in CategoryDailyRevenue.query}
+        counts = {b.book_id: b.sales_count for b in Book.query}
+        return stats, daily, counts
+
+    def test_incremental_rollup_matches_backfill(self):
+        with self.app.app_context():
+            first = self._order([(self.book_ids[0], 2, 10.0), (self.book_ids[1], 1, 8.0)], datetime(2026, 10, 1, 9))
+            second = self._order([(self.book_ids[0], 1, 9.0)], datetime(2026, 10, 2, 18))
+            self._order([(self.book_ids[1], 5, 8.0)], datetime(2026, 10, 2, 19))  # jamais payée
+            for order in (first, second):
+                self.assertTrue(mark_order_paid(order))
+                db.session.commit()
+
+            stats, daily, counts = self._snapshot()
+            self.assertEqual(stats[self.book_ids[0]], (3, 29.0, datetime(2026, 10, 2, 18)))
+            self.assertEqual(counts, {self.book_ids[0]: 3, self.book_ids[1]: 1})
+            self.assertEqual(len(daily), 3)  # (SF, 1/10), (Roman, 1/10), (SF, 2/10)
+
+            result = self.app.test_cli_runner().invoke(args=["sales", "backfill", "--chunk-size", "1"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            db.session.expire_all()
+            self.assertEqual(self._snapshot(), (stats, daily, counts))
+
+    def test_backfill_replaces_aggregates_in_one_transaction(self):
+        with self.app.app_context():
+            for when in (datetime(2026, 10, 1, 9), datetime(2026, 10, 3, 9)):
+                mark_order_paid(self._order([(self.book_ids[0], 2, 10.0)], when))
+                db.session.commit()
+            before = self._snapshot()
+
+            def interrupted(_):
+                raise RuntimeError("arrêt au milieu du parcours")
+
+            with self.assertRaises(RuntimeError):
+                backfill(chunk_size=1, echo=interrupted)
+            db.session.rollback()
+            self.assertEqual(self._snapshot(), before)
+
+    def test_locked_upsert_adds_without_on_conflict(self):
+        with self.app.app_context():
+            book_id = self.book_ids[0]
+            for units, when in ((2, datetime(2026, 10, 2)), (3, datetime(2026, 10, 1))):
+                _locked_upsert_add(
+                    BookSalesStats,
+                    [{"book_id": book_id, "units_sold": units, "revenue": units * 10.0, "last_sold_at": when}],
+                    keys=["book_id"],
+                    latest="last_sold_at",
+                )
+            db.session.commit()
+            stats = db.session.get(BookSalesStats, book_id)
+            self.assertEqual((stats.units_sold, stats.revenue, stats.last_sold_at), (5, 50.0, datetime(2026, 10, 2)))
+
+    def test_dashboard_reads(self):
+        with self.app.app_context():
+            order = self._order([(self.book_ids[1], 4, 10.0)], datetime.utcnow())
+            mark_order_paid(order)
+            db.session.commit()
+            self.assertEqual(top_sellers(1)[0].book_title, "Le Tour du monde")
+            self.assertEqual([(r.category_name, r.revenue) for r in revenue_by_category(30)], [("Roman", 40.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
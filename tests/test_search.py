@@ -0,0 +1,105 @@
+import unittest
+from datetime import date
+
+from app import create_app
+from models import db, Author, Category, Book
+from services.catalogue import browse_books
+from services.search import (
+    InvertedIndex, build_document, fold, index_book, refresh_index, search_book_ids, unindex_book,
+)
+
+
+class TestNormalisation(unittest.TestCase):
+    def test_fold_accents_ligatures_and_elisions(self):
+        self.assertEqual(fold("Œuvres Complètes"), "oeuvres completes")
+        self.assertEqual(build_document("L'Étranger", "Albert", "Camus"), "etranger albert camus")
+        self.assertEqual(build_document("Jusqu’à l'aube"), "a aube")
+
+
+class TestInvertedIndex(unittest.TestCase):
+    def test_prefix_and_conjunction(self):
+        index = InvertedIndex()
+        index.add(1, build_document("Les Misérables", "Victor", "Hugo"))
+        index.add(2, build_document("Notre-Dame de Paris", "Victor", "Hugo"))
+        index.add(3, build_document("La Peste", "Albert", "Camus"))
+        self.assertEqual(index.search("hug"), [2, 1])
+        self.assertEqual(index.search("miserab hugo"), [1])
+        self.assertEqual(index.search("MISÉR"), [1])
+        index.remove(1)
+        self.assertEqual(index.search("miser"), [])
+        index.add(3, build_document("La Chute", "Albert", "Camus"))
+        self.assertEqual(index.search("peste"), [])
+        self.assertEqual(index.search("chu"), [3])
+
+
+class TestGallerySearch(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Émile", author_lastname="Zola", author_birthday=date(1840, 4, 2))
+            category = Category(category_name="Roman")
+            db.session.add_all([author, category])
+            db.session.flush()
+            for title in ("Germinal", "L'Assommoir", "La Bête humaine"):
+                book = Book(book_title=title, publication_date=date(1885, 1, 1), book_price=9.0,
+                            author_id=author.author_id, category_id=category.category_id)
+                db.session.add(book)
+                index_book(book)
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_search_then_incremental_updates(self):
+        with self.app.test_request_context():
+            self.assertEqual(len(search_book_ids("emile")), 3)
+            self.assertEqual(len(search_book_ids("bete")), 1)
+
+            book = Book.query.filter_by(book_title="Germinal").one()
+            book.book_title = "Nana"
+            index_book(book)
+            db.session.commit()
+            refresh_index(book)
+            self.assertEqual(search_book_ids("germ"), [])
+            self.assertEqual(search_book_ids("nan"), [book.book_id])
+
+            unindex_book(book.book_id)
+            self.assertEqual(search_book_ids("nana"), [])
+
+    def test_rolled_back_write_never_reaches_the_index(self):
+        with self.app.test_request_context():
+            self.assertEqual(len(search_book_ids("zola")), 3)  # index construit
+            book = Book(book_title="Nana", publication_date=date(1880, 1, 1), book_price=9.0,
+                        author_id=Author.query.one().author_id, category_id=Category.query.one().category_id)
+            db.session.add(book)
+            index_book(book)
+            db.session.flush()
+            db.session.rollback()
+            self.assertEqual(search_book_ids("nana"), [])
+
+    def test_search_is_filtered_and_sorted_in_one_query(self):
+        self.app.config["SEARCH_MAX_RESULTS"] = 1  # ne borne plus la galerie
+        with self.app.test_request_context():
+            for book, price in zip(Book.query.order_by(Book.book_id), (4.0, 12.0, 20.0)):
+                book.book_price = price
+            db.session.commit()
+            page = browse_books(search="zola", sort="price-asc", per_page=2)
+            self.assertEqual([b.book_price for b in page.items], [4.0, 12.0])
+            self.assertEqual(page.total, 3)
+            self.assertEqual(browse_books(search="zola", max_price=15).total, 2)
+            self.assertEqual(browse_books(search="!!").total, 0)
+
+    def test_gallery_q_parameter(self):
+        response = self.client.get("/books?q=assom")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"1 livre", response.data)
+        self.assertIn("L'Assommoir".encode(), response.data.replace(b"&#39;", b"'"))
+
+
+if __name__ == '__main__':
+    unittest.main()
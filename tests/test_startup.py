@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys
+import app
+app.create_app()
+print(json.dumps(sorted(m for m in sys.modules if m.split(".")[0] in %r)))
+"""
+
+HEAVY = ("stripe", "pymongo", "apscheduler", "flask_mail", "flask_migrate", "alembic", "zxcvbn", "PIL", "brotli")
+
+
+def loaded_after_create_app(**env) -> list:
+    environ = dict(os.environ, SECRET_KEY="test-secret", SQLALCHEMY_DATABASE_URI="sqlite://", **env)
+    for name in ("MONGODB_URI", "MAIL_SERVER"):
+        if name not in env:
+            environ.pop(name, None)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % (HEAVY,)], cwd=ROOT, env=environ, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+class ColdStartTest(unittest.TestCase):
+    def test_optional_subsystems_are_not_imported(self):
+        self.assertEqual(loaded_after_create_app(), [])
+
+    def test_mail_is_loaded_when_configured(self):
+        loaded = loaded_after_create_app(MAIL_SERVER="localhost")
+        self.assertIn("flask_mail", loaded)
+        self.assertNotIn("stripe", loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
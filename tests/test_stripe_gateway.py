@@ -0,0 +1,80 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import stripe
+
+from extensions.stripe_gateway import StripeGateway
+
+
+class FakeStripeAPI(BaseHTTPRequestHandler):
+    """API Stripe locale : 500 « retry » au premier appel, puis une session."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    calls = []
+    connections = set()
+    fail_first = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        type(self).calls.append(self.headers.get("Idempotency-Key"))
+        type(self).connections.add(self.client_address)
+        if type(self).fail_first and len(type(self).calls) == 1:
+            return self._reply(500, {"error": {"message": "boom"}}, {"Stripe-Should-Retry": "true"})
+        self._reply(200, {"id": "cs_test_1", "object": "checkout.session", "url": "https://checkout.test/1"})
+
+    def _reply(self, status, body, headers=None):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestStripeGateway(unittest.TestCase):
+    def setUp(self):
+        FakeStripeAPI.calls, FakeStripeAPI.connections, FakeStripeAPI.fail_first = [], set(), True
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeStripeAPI)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.gateway = StripeGateway(
+            "sk_test_local",
+            timeout=(1, 2),
+            max_retries=1,
+            base_url=f"http://127.0.0.1:{self.server.server_port}",
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retry_keeps_idempotency_key_and_records_latency(self):
+        session = self.gateway.create_session({"mode": "payment"}, idempotency_key="checkout-1-1000-new")
+        self.assertEqual(session.url, "https://checkout.test/1")
+        self.assertEqual(FakeStripeAPI.calls, ["checkout-1-1000-new"] * 2)
+
+        stats = self.gateway.stats()["checkout.sessions.create"]
+        self.assertEqual((stats["calls"], stats["errors"]), (1, 0))
+
+    def test_connections_are_reused(self):
+        FakeStripeAPI.fail_first = False
+        for i in range(3):
+            self.gateway.create_session({"mode": "payment"}, idempotency_key=f"k{i}")
+        self.assertEqual(len(FakeStripeAPI.connections), 1)
+
+    def test_errors_are_counted(self):
+        gateway = StripeGateway("sk_test_local", timeout=(0.5, 0.5), max_retries=0, base_url="http://127.0.0.1:9")
+        with self.assertRaises(stripe.error.APIConnectionError):
+            gateway.create_session({}, idempotency_key="k")
+        self.assertEqual(gateway.stats()["checkout.sessions.create"]["errors"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import hashlib
+import hmac
+import json
+import threading
+import time
+import unittest
+from datetime import date
+
+from app import create_app
+from models import db, Author, Category, Book, User, Order, OrderDetail, ProcessedEvent
+from services.webhooks import process_pending
+
+SECRET = "whsec_test"
+
+
+def signed(event: dict, secret: str = SECRET, timestamp: int | None = None):
+    """Payload + en-tête Stripe-Signature construits localement (t=…,v1=HMAC)."""
+    payload = json.dumps(event)
+    timestamp = timestamp or int(time.time())
+    digest = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return payload, f"t={timestamp},v1={digest}"
+
+
+def checkout_event(event_id, order_id, event_type="checkout.session.completed", payment_status="paid"):
+    return {
+        "id": event_id,
+        "object": "event",
+        "type": event_type,
+        "data": {"object": {
+            "id": f"cs_{event_id}",
+            "object": "checkout.session",
+            "client_reference_id": str(order_id),
+            "payment_status": payment_status,
+        }},
+    }
+
+
+class TestStripeWebhooks(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.app.config.update(STRIPE_WEBHOOK_SECRET=SECRET, STRIPE_WEBHOOK_WORKER="off")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            author = Author(author_firstname="Jules", author_lastname="Verne", author_birthday=date(1828, 2, 8))
+            category = Category(category_name="SF")
+            user = User(user_firstname="Jane", user_lastname="Doe", user_email="jane@example.com", user_password="x")
+            db.session.add_all([author, category, user])
+            db.session.flush()
+            book = Book(book_title="Vingt mille lieues", publication_date=date(1870, 1, 1), book_price=10.0,
+                        author_id=author.author_id, category_id=category.category_id)
+            db.session.add(book)
+            db.session.flush()
+            self.order_ids = []
+            for _ in range(3):
+                order = Order(user_id=user.user_id, total_price=10.0, payment_status="pending")
+                order.details = [OrderDetail(book_id=book.book_id, quantity=1, unit_price=10.0)]
+                db.session.add(order)
+                db.session.flush()
+                self.order_ids.append(order.order_id)
+            db.session.commit()
+            self.book_id = book.book_id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _post(self, event, **kwargs):
+        payload, header = signed(event, **kwargs)
+        return self.client.post("/webhook/stripe", data=payload, headers={"Stripe-Signature": header},
+                                content_type="application/json")
+
+    def test_bad_signature_rejected(self):
+        response = self._post(checkout_event("evt_bad", self.order_ids[0]), secret="whsec_other")
+        self.assertEqual(response.status_code, 400)
+        stale = self._post(checkout_event("evt_old", self.order_ids[0]), timestamp=int(time.time()) - 3600)
+        self.assertEqual(stale.status_code, 400)
+        with self.app.app_context():
+            self.assertEqual(ProcessedEvent.query.count(), 0)
+
+    def test_retries_are_processed_once(self):
+        event = checkout_event("evt_1", self.order_ids[0])
+        for _ in range(3):  # retries Stripe
+            self.assertEqual(self._post(event).status_code, 200)
+
+        with self.app.app_context():
+            # Réponse rapide : rien n'est appliqué avant le worker
+            self.assertEqual(db.session.get(Order, self.order_ids[0]).payment_status, "pending")
+            self.assertEqual(process_pending(), 1)
+            self.assertEqual(process_pending(), 0)
+            self.assertEqual(db.session.get(Order, self.order_ids[0]).payment_status, "paid")
+            self.assertEqual(db.session.get(Book, self.book_id).sales_count, 1)
+            self.assertEqual(db.session.get(ProcessedEvent, "evt_1").status, "done")
+
+    def test_batch_transitions(self):
+        first, second, third = self.order_ids
+        self._post(checkout_event("evt_a", first))
+        self._post(checkout_event("evt_b", second, event_type="checkout.session.expired"))
+        self._post(checkout_event("evt_c", third, payment_status="unpaid"))  # paiement différé
+        self._post(checkout_event("evt_d", first, event_type="checkout.session.expired"))  # hors ordre
+        self._post(checkout_event("evt_e", 9999))
+        self._post({"id": "evt_f", "type": "customer.created", "data": {"object": {}}})
+
+        with self.app.app_context():
+            self.assertEqual(process_pending(batch_size=10), 4)
+            statuses = {o.order_id: o.payment_status for o in Order.query}
+            self.assertEqual(statuses, {first: "paid", second: "failed", third: "pending"})
+            events = {e.event_id: e.status for e in ProcessedEvent.query}
+            self.assertEqual(events, {"evt_a": "done", "evt_b": "done", "evt_c": "ignored",
+                                      "evt_d": "done", "evt_e": "error", "evt_f": "ignored"})
+
+        self._post(checkout_event("evt_g", third, event_type="checkout.session.async_payment_succeeded"))
+        result = self.app.test_cli_runner().invoke(args=["webhooks", "process"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Order, third).payment_status, "paid")
+
+    def test_expiry_of_a_replaced_session_keeps_the_order(self):
+        order_id = self.order_ids[0]
+        with self.app.app_context():
+            # Session cs_old expirée côté client, cs_new créée (services.payments)
+            db.session.get(Order, order_id).stripe_session_id = "cs_new"
+            db.session.commit()
+
+        old = checkout_event("evt_old", order_id, event_type="checkout.session.expired")
+        old["data"]["object"]["id"] = "cs_old"
+        self._post(old)
+        with self.app.app_context():
+            process_pending()
+            self.assertEqual(db.session.get(Order, order_id).payment_status, "pending")
+            self.assertEqual(db.session.get(ProcessedEvent, "evt_old").status, "ignored")
+
+        new = checkout_event("evt_new", order_id, event_type="checkout.session.expired")
+        new["data"]["object"]["id"] = "cs_new"
+        self._post(new)
+        with self.app.app_context():
+            process_pending()
+            self.assertEqual(db.session.get(Order, order_id).payment_status, "failed")
+
+    def test_worker_starts_with_the_first_request(self):
+        worker = self.app.extensions["webhook_worker"]
+        release, runs = threading.Event(), []
+        worker._run = lambda: (runs.append(1), release.wait(5))
+
+        self.client.get("/books")
+        self.assertIsNone(worker._thread)  # STRIPE_WEBHOOK_WORKER=off
+
+        self.app.config["STRIPE_WEBHOOK_WORKER"] = "thread"
+        self.client.get("/books")
+        self.client.get("/books")
+        release.set()
+        worker._thread.join(5)
+        self.assertEqual(runs, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()